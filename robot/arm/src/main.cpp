@@ -41,32 +41,32 @@ void loop(){
         Serial.print("Recieved command: '");
         Serial.print(data);
         Serial.println("'");
-        // if (data == "stack1") {
-        //     Serial.println("Moving card to stack1");
-        //     source.pick();
-        //     stack1.place();
-        // }
-        // if (data == "stack2") {
-        //     Serial.println("Moving card to stack2");
-        //     source.pick();
-        //     stack2.place();
-        // }
-        // if (data == "stack3") {
-        //     Serial.println("Moving card to stack3");
-        //     source.pick();
-        //     stack3.place();
-        // }
-        // if (data == "stack4") {
-        //     Serial.println("Moving card to stack4");
-        //     source.pick();
-        //     stack4.place();
-        // }
-
-        source.pick();
-        stack1.place();
-        go_home(2000);
-
+        data.trim();
+        Position* target = nullptr;
+        if (data == "stack1") {
+            target = &stack1;
+        } else if (data == "stack2") {
+            target = &stack2;
+        } else if (data == "stack3") {
+            target = &stack3;
+        } else if (data == "stack4") {
+            target = &stack4;
+        }
 
+        if (target == nullptr) {
+            Serial.print("Unknown command: '");
+            Serial.print(data);
+            Serial.println("'");
+        } else {
+            Serial.print("Moving card to ");
+            Serial.println(data);
+            source.pick();
+            target->place();
+            go_home(2000);
+            // The host waits for this line before sending the next card
+            Serial.print("Done: ");
+            Serial.println(data);
+        }
     } else {
         delay(500); // 延时500毫秒
     }
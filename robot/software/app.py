@@ -1,59 +1,241 @@
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.screenmanager import ScreenManager
 from dotenv import load_dotenv
 import os
+import threading
+import startup
+import tracing
 from menu_screen import MenuScreen
-from sort_screen import SortScreen
-from login_screen import LoginScreen
-from library_select_screen import LibrarySelectScreen
-from catalog_screen import CatalogScreen
-from card_result_screen import CardResultScreen
-from magic_client import MagicClient
 from token_manager import TokenManager
+from scanner.service import shared_service
+
+# Screens other than the menu are imported and built the first time they are shown
+LAZY_SCREENS = {
+    "sort": ("sort_screen", "SortScreen"),
+    "login": ("login_screen", "LoginScreen"),
+    "library_select": ("library_select_screen", "LibrarySelectScreen"),
+    "catalog": ("catalog_screen", "CatalogScreen"),
+    "card_result": ("card_result_screen", "CardResultScreen"),
+}
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds registered screens on first use.
+
+    Switching to a registered name, or get_screen on it, imports the screen's
+    module and adds the screen then, so screens the operator never opens cost
+    nothing at startup.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._factories = {}
+
+    def register(self, name, factory):
+        self._factories[name] = factory
+
+    def get_screen(self, name):
+        factory = self._factories.pop(name, None)
+        if factory is not None:
+            with startup.profiler().phase(f"screen {name}"):
+                self.add_widget(factory(name=name))
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+
+
+class _Service:
+    """App attribute set up by the background service loader. Reading it waits for the loader."""
+
+    def __set_name__(self, owner, name):
+        self.attribute = '_' + name
+
+    def __get__(self, app, owner=None):
+        if app is None:
+            return self
+        app.wait_for_services()
+        return getattr(app, self.attribute)
+
 
 class CardSorterApp(App):
+    magic_client = _Service()
+    async_client = _Service()
+    bridge = _Service()
+    outbox = _Service()
+    library_cache = _Service()
+    card_archiver = _Service()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.auth_token = None
         self.selected_library = None
-        
+        # CARDSORTER_TRACE=path records per-card spans and writes them there on exit
+        self.trace_path = tracing.start_from_env()
+
+        # Load the card database and OCR setup while the operator logs in.
+        # main.py starts this before importing the app; this is a no-op then.
+        self.scanner_service = shared_service()
+
         # Load environment variables
         load_dotenv()
-        
-        # Get configuration with fallbacks
-        host = os.getenv('CARDSORTER_BACKEND_HOST', 'localhost')
-        try:
-            port = int(os.getenv('CARDSORTER_BACKEND_PORT', '9090'))
-        except ValueError:
-            print("Invalid port in environment variables, using default 9090")
-            port = 9090
-            
-        self.magic_client = MagicClient(host=host, port=port)
         self.token_manager = TokenManager()
-        
+
+        # The gRPC stubs, OpenCV and the backend connections load off the UI thread,
+        # so the first screen doesn't wait on them
+        self._token_lock = threading.Lock()
+        self._services_ready = threading.Event()
+        self._services_error = None
+        self._services_thread = threading.Thread(target=self._load_services, name="service-loader", daemon=True)
+        self._services_thread.start()
+
+    def _load_services(self):
+        profiler = startup.profiler()
+        try:
+            with profiler.phase("import backend clients"):
+                from magic_client import MagicClient
+                from magic_client.aio import AsyncMagicClient
+                from magic_client.bridge import AsyncBridge
+                from magic_client.outbox import LibraryOutbox
+                from magic_client.library_cache import LibraryCache
+                from vision.archive import CardArchiver
+
+            # Get configuration with fallbacks
+            host = os.getenv('CARDSORTER_BACKEND_HOST', 'localhost')
+            try:
+                port = int(os.getenv('CARDSORTER_BACKEND_PORT', '9090'))
+            except ValueError:
+                print("Invalid port in environment variables, using default 9090")
+                port = 9090
+
+            with profiler.phase("connect backend"):
+                self._magic_client = MagicClient(host=host, port=port)
+
+                # Non-blocking client for calls made from the UI thread
+                self._async_client = AsyncMagicClient(host=host, port=port)
+                self._bridge = AsyncBridge()
+                self._bridge.start()
+                # Connect while the login screen is showing, so the first library fetch doesn't wait on it
+                self._bridge.submit(self._async_client.warm_up(), on_error=self.on_warm_up_error)
+                self._magic_client.warm_up()
+
+            with profiler.phase("open outbox and library cache"):
+                # Identified cards are queued locally and synced to the backend in the background
+                self._outbox = LibraryOutbox(self._magic_client)
+                self._outbox.start()
+                self._library_cache = LibraryCache(self._magic_client, outbox=self._outbox)
+
+            # Cropped cards are encoded and written off the UI thread
+            archive_quality = os.getenv('CARDSORTER_ARCHIVE_QUALITY')
+            try:
+                archive_quality = int(archive_quality) if archive_quality else None
+            except ValueError:
+                print("Invalid archive quality in environment variables, using the format default")
+                archive_quality = None
+            self._card_archiver = CardArchiver(
+                os.getenv('CARDSORTER_ARCHIVE_DIR', 'captured_cards'),
+                image_format=os.getenv('CARDSORTER_ARCHIVE_FORMAT', 'png').lower(),
+                quality=archive_quality,
+            )
+            self._card_archiver.start()
+
+            with self._token_lock:
+                if self.auth_token:
+                    self._magic_client._auth_token = self.auth_token
+                    self._async_client._auth_token = self.auth_token
+        except Exception as e:
+            print(f"Error initializing backend services: {e}")
+            self._services_error = e
+        finally:
+            self._services_ready.set()
+
+    def wait_for_services(self):
+        """Block until the backend clients, outbox and archiver are set up.
+
+        Raises:
+            Exception: The error setting them up failed with, if any
+        """
+        self._services_ready.wait()
+        if self._services_error is not None:
+            raise self._services_error
+
+    def on_warm_up_error(self, error):
+        print(f"Backend not reachable yet: {error!r}")
+
+    def set_auth_token(self, token):
+        """Share the auth token with both the blocking and async clients."""
+        with self._token_lock:
+            self.auth_token = token
+            # Before the clients exist, the loader applies the token when it creates them
+            if self._services_ready.is_set() and self._services_error is None:
+                self._magic_client._auth_token = token
+                self._async_client._auth_token = token
+
+    def add_to_library(self, card_info):
+        """Queue an identified card for the selected library and count it in the local mirror.
+
+        Does nothing when no card was identified or no library is selected.
+        """
+        if not card_info or not self.selected_library:
+            return
+        library_id = self.selected_library.id
+        self.outbox.add(library_id, card_info)
+        self.library_cache.record_added(library_id, card_info['set'], card_info['collector_number'])
+
     def build(self):
         try:
             print("Initializing Screens...")
             # Request fullscreen mode
             from kivy.core.window import Window
             Window.fullscreen = 'auto'
-            
-            sm = ScreenManager()
-            
+
+            sm = LazyScreenManager()
+
             # Try to load a saved token
             saved_token = self.token_manager.load_token()
             if saved_token:
-                self.auth_token = saved_token
-                self.magic_client._auth_token = saved_token
-                
+                self.set_auth_token(saved_token)
+
             sm.add_widget(MenuScreen(name="menu"))
-            sm.add_widget(SortScreen(name="sort"))
-            sm.add_widget(LoginScreen(name="login"))
-            sm.add_widget(LibrarySelectScreen(name="library_select"))
-            sm.add_widget(CatalogScreen(name="catalog"))
-            sm.add_widget(CardResultScreen(name="card_result"))
-            
+            for name, (module, cls) in LAZY_SCREENS.items():
+                sm.register(name, startup.lazy_class(module, cls))
+
             return sm
         except Exception as e:
             print(f"Error initializing app: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def on_start(self):
+        # Runs on the next clock tick, once the menu has been drawn
+        Clock.schedule_once(self.on_first_frame, 0)
+
+    def on_first_frame(self, dt):
+        startup.first_frame_shown()
+        # Import the other screens' modules now, so opening them only has to build the widgets,
+        # then build the catalog screen's widgets. Its camera and vision worker start when it is entered,
+        # so they don't compete with the catalogue load while the operator is still logging in
+        startup.preload((module for module, _ in LAZY_SCREENS.values()),
+                        on_done=lambda: Clock.schedule_once(self.prepare_catalog))
+
+    def prepare_catalog(self, dt=None):
+        with startup.profiler().phase("prepare catalog screen"):
+            self.root.get_screen("catalog")
+
+    def on_stop(self):
+        if self.trace_path and tracing.enabled():
+            tracing.stop()
+            print(f"Wrote {tracing.save(self.trace_path)} trace events to {self.trace_path}")
+
+        self._services_ready.wait(5)
+        if not self._services_ready.is_set() or self._services_error is not None:
+            return
+        try:
+            self._bridge.submit(self._async_client.close()).result(timeout=2)
+        except Exception as e:
+            print(f"Error closing async client: {e}")
+        self._bridge.stop()
+        self._outbox.close()
+        self._card_archiver.stop()
+        self._library_cache.close()
+        self._magic_client.close()
@@ -0,0 +1,3 @@
+from .controller import ArmController, ArmError, ArmTimeout, Stack, default_stack
+
+__all__ = ["ArmController", "ArmError", "ArmTimeout", "Stack", "default_stack"]
@@ -0,0 +1,223 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Callable, Optional
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+ACK_PREFIX = "Recieved command: '"  # sic, as printed by the firmware
+DONE_PREFIX = "Done: "
+UNKNOWN_PREFIX = "Unknown command: '"
+READY_LINE = "start..."
+
+
+class Stack(IntEnum):
+    """Output stacks defined in robot/arm/src/main.cpp."""
+    RARES = 1
+    BULK = 2
+    UNIDENTIFIED = 3  # also tokens
+    BASIC_LANDS = 4
+
+    @property
+    def command(self) -> str:
+        return f"stack{self.value}"
+
+
+def default_stack(card: Optional[dict]) -> Stack:
+    """Route a recognized card (a Scryfall card dict, or None) to an output stack."""
+    if not card:
+        return Stack.UNIDENTIFIED
+    type_line = card.get('type_line') or ''
+    if type_line.startswith('Basic Land'):
+        return Stack.BASIC_LANDS
+    if type_line.startswith('Token') or card.get('layout') == 'token':
+        return Stack.UNIDENTIFIED
+    if card.get('rarity') in ('rare', 'mythic'):
+        return Stack.RARES
+    return Stack.BULK
+
+
+class ArmError(Exception):
+    pass
+
+
+class ArmTimeout(ArmError):
+    pass
+
+
+class ArmController:
+    """Drives the ESPMax sorting arm over its serial link without blocking the caller.
+
+    Commands are queued and sent one at a time by a background thread. Each
+    returns a Future that completes with the move duration in seconds once the
+    firmware reports "Done", or fails with ArmTimeout if the firmware does not
+    acknowledge the command within `ack_timeout` or finish within
+    `move_timeout`, or with ArmError if it rejects it.
+
+    The firmware reads a command only once more than six bytes are waiting, so
+    every command plus its newline must be at least seven bytes long; the
+    stack commands ("stack1\\n") are exactly that.
+
+    Args:
+        port: Serial device, e.g. /dev/ttyUSB0, or a simulator's pty
+        baudrate: Must match Serial.begin in the firmware
+        ack_timeout: Seconds to wait for the "Recieved command" echo
+        move_timeout: Seconds to wait for "Done" after the echo
+        max_queue: Commands allowed to wait behind the one in flight
+        serial_factory: Callable(port, baudrate, timeout) returning a serial-like
+            object. Defaults to pyserial's serial.Serial.
+    """
+
+    def __init__(self, port: str, baudrate: int = 9600, ack_timeout: float = 2.0,
+                 move_timeout: float = 30.0, max_queue: int = 8,
+                 serial_factory: Optional[Callable] = None):
+        self.port = port
+        self.baudrate = baudrate
+        self.ack_timeout = ack_timeout
+        self.move_timeout = move_timeout
+        self.serial_factory = serial_factory
+        self.serial = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._buffer = b""
+        self.commands_sent = 0
+        self.commands_completed = 0
+        self.commands_failed = 0
+        self.busy_time = 0.0
+        self.last_move_time = 0.0
+
+    def open(self, wait_ready: bool = True, ready_timeout: float = 15.0):
+        """Open the serial link and start the command thread.
+
+        Opening the port resets the ESP32, which homes the arm before it reads
+        commands. With `wait_ready`, block until the firmware prints "start...".
+        """
+        if self.serial_factory is None:
+            import serial
+            self.serial_factory = serial.Serial
+        self.serial = self.serial_factory(self.port, self.baudrate, timeout=0.1)
+        if wait_ready:
+            self._wait_for(lambda line: line == READY_LINE, ready_timeout, "firmware start")
+        self._thread = threading.Thread(target=self._run, name="arm-controller", daemon=True)
+        self._thread.start()
+
+    def send(self, command: str) -> Future:
+        """Queue a raw firmware command.
+
+        Raises:
+            ArmError: if the controller is not open or the queue is full. Never blocks.
+        """
+        if self._thread is None:
+            raise ArmError("Arm controller is not open")
+        future = Future()
+        try:
+            # The command thread tags its span with the card being moved
+            self._queue.put_nowait((command, future, tracing.current_card()))
+        except queue.Full:
+            raise ArmError(f"Arm command queue full, cannot send {command!r}")
+        return future
+
+    def move_to_stack(self, stack: Stack) -> Future:
+        """Pick the next card from the input stack and place it on `stack`."""
+        return self.send(Stack(stack).command)
+
+    def pending(self) -> int:
+        """Commands waiting behind the one in flight."""
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            command, future, card = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            start = time.perf_counter()
+            try:
+                with tracing.span("arm.command", card_id=card, command=command):
+                    self._execute(command)
+            except Exception as e:
+                self.commands_failed += 1
+                logger.error(f"Arm command {command!r} failed: {e}")
+                future.set_exception(e)
+            else:
+                self.last_move_time = time.perf_counter() - start
+                self.commands_completed += 1
+                future.set_result(self.last_move_time)
+            finally:
+                self.busy_time += time.perf_counter() - start
+
+    def _execute(self, command: str):
+        # Anything left over from an earlier, timed-out command would confuse the ack matching
+        self._drain()
+        self.serial.write(f"{command}\n".encode("ascii"))
+        self.serial.flush()
+        self.commands_sent += 1
+
+        echo = self._wait_for(lambda line: line.startswith(ACK_PREFIX), self.ack_timeout, f"ack of {command!r}")
+        if echo[len(ACK_PREFIX):].rstrip("'").strip() != command:
+            raise ArmError(f"Firmware acknowledged {echo!r} instead of {command!r}")
+
+        line = self._wait_for(
+            lambda line: line.startswith(DONE_PREFIX) or line.startswith(UNKNOWN_PREFIX),
+            self.move_timeout, f"completion of {command!r}")
+        if line.startswith(UNKNOWN_PREFIX):
+            raise ArmError(f"Firmware rejected command {command!r}")
+
+    def _readline(self) -> Optional[str]:
+        """Return the next complete line, or None if none arrived within the serial timeout."""
+        while b"\n" not in self._buffer:
+            chunk = self.serial.read(self.serial.in_waiting or 1)
+            if not chunk:
+                return None
+            self._buffer += chunk
+        raw, self._buffer = self._buffer.split(b"\n", 1)
+        return raw.decode("ascii", errors="replace").strip()
+
+    def _wait_for(self, match: Callable[[str], bool], timeout: float, what: str) -> str:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            line = self._readline()
+            if line is None:
+                continue
+            logger.debug(f"arm: {line}")
+            if match(line):
+                return line
+        raise ArmTimeout(f"Timed out after {timeout:.1f}s waiting for {what}")
+
+    def _drain(self):
+        self._buffer = b""
+        if self.serial.in_waiting:
+            self.serial.read(self.serial.in_waiting)
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.commands_sent,
+            "completed": self.commands_completed,
+            "failed": self.commands_failed,
+            "pending": self.pending(),
+            "busy_time": self.busy_time,
+            "last_move_time": self.last_move_time,
+        }
+
+    def close(self, timeout: float = 5.0):
+        """Finish the command in flight, cancel queued ones, and close the port."""
+        if self._thread is not None:
+            while True:
+                try:
+                    _, future, _ = self._queue.get_nowait()
+                    future.cancel()
+                except queue.Empty:
+                    break
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        if self.serial is not None:
+            self.serial.close()
+            self.serial = None
@@ -0,0 +1,129 @@
+import fcntl
+import os
+import select
+import struct
+import termios
+import threading
+import time
+import tty
+from typing import Dict, List, Optional
+
+
+class FirmwareSimulator:
+    """Stands in for the ESPMax firmware on a pseudo-terminal.
+
+    Speaks the same protocol as robot/arm/src/main.cpp: prints "Reset to
+    home..." and "start..." at boot, only reads a command once more than six
+    bytes are waiting, echoes "Recieved command: '...'", then after the
+    configured move time reports "Done: stackN" or "Unknown command: '...'".
+    Point an ArmController at `port` to exercise it without the robot.
+
+    Opening the real port toggles DTR, which resets the board, so the boot
+    banner always follows the open. A pty has no DTR; instead the simulator
+    boots whenever the client flushes its input, which pyserial does as it
+    opens the port. Clients that never flush get no banner.
+
+    Args:
+        move_time: Seconds a pick-and-place takes, or a dict of seconds per command
+        boot_time: Seconds between "Reset to home..." and "start..."
+        ack_delay: Seconds before the command echo
+    """
+
+    COMMANDS = ("stack1", "stack2", "stack3", "stack4")
+
+    def __init__(self, move_time=0.0, boot_time: float = 0.0, ack_delay: float = 0.0):
+        self.move_time = move_time
+        self.boot_time = boot_time
+        self.ack_delay = ack_delay
+        self.commands: List[str] = []
+        self._master = None
+        self._slave = None
+        self._running = False
+        self._thread = None
+        self.port: Optional[str] = None
+
+    def start(self) -> str:
+        """Open the pty and boot the firmware. Returns the device path to open."""
+        self._master, self._slave = os.openpty()
+        # No echo or newline translation, like a real USB serial link
+        tty.setraw(self._slave)
+        # Packet mode reports the client's input flushes to us, for booting on open
+        fcntl.ioctl(self._master, termios.TIOCPKT, struct.pack("i", 1))
+        self.port = os.ttyname(self._slave)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="arm-simulator", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def _println(self, text: str):
+        os.write(self._master, f"{text}\r\n".encode("ascii"))
+
+    def _move_time(self, command: str) -> float:
+        if isinstance(self.move_time, dict):
+            return self.move_time.get(command, 0.0)
+        return self.move_time
+
+    def _boot(self):
+        self._println("Reset to home...")
+        time.sleep(self.boot_time)
+        self._println("start...")
+
+    def _run(self):
+        buffer = b""
+        while self._running:
+            ready, _, control = select.select([self._master], [], [self._master], 0.05)
+            if ready or control:
+                try:
+                    packet = os.read(self._master, 1025)
+                except OSError:
+                    return
+                # The first byte says whether the rest is data or a control status change
+                if packet[0] == termios.TIOCPKT_DATA:
+                    buffer += packet[1:]
+                elif packet[0] & termios.TIOCPKT_FLUSHREAD:
+                    buffer = b""
+                    self._boot()
+            # Serial.available() > 6, then Serial.readStringUntil('\n')
+            while len(buffer) > 6 and b"\n" in buffer:
+                raw, buffer = buffer.split(b"\n", 1)
+                self._handle(raw.decode("ascii", errors="replace"))
+
+    def _handle(self, data: str):
+        time.sleep(self.ack_delay)
+        self._println(f"Recieved command: '{data}'")
+        data = data.strip()
+        self.commands.append(data)
+        if data not in self.COMMANDS:
+            self._println(f"Unknown command: '{data}'")
+            return
+        self._println(f"Moving card to {data}")
+        time.sleep(self._move_time(data))
+        self._println(f"Done: {data}")
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+
+def run_simulator(move_times: Dict[str, float] = None):
+    """Run a simulator until interrupted, printing the port to connect to."""
+    simulator = FirmwareSimulator(move_time=move_times or 2.0)
+    port = simulator.start()
+    print(f"Simulated arm on {port}. Press Ctrl+C to exit.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    run_simulator()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Latency and corner accuracy of CardScanner.find_card_contour, full-resolution versus coarse-to-fine.
+
+Frames are synthetic stills at the main stream resolution with a card at a
+known position, so corner error is measured against ground truth.
+
+Run from robot/software:
+    python -m benchmarks.detection --frames 50
+    python -m benchmarks.detection --scales 0.125,0.25 --scales 0.5
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.scene import card_quad, detector_scanner, render
+from vision.geometry import order_points
+
+
+def parse_scales(value: str):
+    return tuple(float(scale) for scale in value.split(','))
+
+
+def measure(scanner, frames, truths):
+    samples, errors, missed = [], [], 0
+    for gray, truth in zip(frames, truths):
+        start = time.perf_counter()
+        corners = scanner.find_card_contour(gray)
+        samples.append(time.perf_counter() - start)
+        if corners is None:
+            missed += 1
+            continue
+        errors.append(np.linalg.norm(order_points(corners) - truth, axis=1))
+    samples.sort()
+    errors = np.concatenate(errors) if errors else np.zeros(1)
+    return (1000 * sum(samples) / len(samples), 1000 * samples[int(len(samples) * 0.95)],
+            float(errors.mean()), float(errors.max()), missed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark coarse-to-fine card detection')
+    parser.add_argument('--frames', type=int, default=50, help='Stills to time per configuration')
+    parser.add_argument('--width', type=int, default=1640, help='Still width')
+    parser.add_argument('--height', type=int, default=1232, help='Still height')
+    parser.add_argument('--scales', type=parse_scales, action='append',
+                        help='Comma-separated detection scales to compare; may be repeated')
+    args = parser.parse_args()
+    configurations = [(1.0,)] + (args.scales or [(0.25, 0.5), (0.5,)])
+
+    rng = np.random.default_rng(0)
+    frames, truths = [], []
+    for i in range(args.frames):
+        shift = rng.uniform(-40, 40, 2)
+        corners = card_quad(args.width, args.height, shift=shift, angle=rng.uniform(-8, 8))
+        frames.append(cv2.cvtColor(render(args.width, args.height, corners, seed=i), cv2.COLOR_RGB2GRAY))
+        truths.append(order_points(corners))
+
+    print(f"{args.frames} stills at {args.width}x{args.height}")
+    for scales in configurations:
+        scanner = detector_scanner(detection_scales=scales)
+        mean_ms, p95_ms, mean_err, max_err, missed = measure(scanner, frames, truths)
+        label = "full" if scales == (1.0,) else ",".join(str(s) for s in scales)
+        print(f"  {label:<10} mean {mean_ms:7.2f} ms   p95 {p95_ms:7.2f} ms   "
+              f"corner error mean {mean_err:5.2f} px  max {max_err:5.2f} px   missed {missed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Frame-time benchmark for the catalog preview path.
+
+Compares the old per-tick conversion chain against the current ndarray path,
+using a synthetic camera frame with a card outline drawn on it. Detection
+itself runs on the vision worker in both cases and is not measured here.
+
+Run from robot/software:
+    python -m benchmarks.preview --frames 300
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+from PIL import Image as PILImage
+
+from vision.frames import orient
+from vision.overlay import draw_detection
+
+
+def legacy_preview(frame: np.ndarray, contour, bounding_rect) -> bytes:
+    """The previous path, as update_picam_texture and draw_card_bounds did it: ndarray -> PIL
+    -> rotate -> ndarray -> flip -> PIL -> ndarray (BGR) -> draw -> RGB -> PIL -> bytes.
+    Seven full-frame buffers per tick. The new texture it also created each tick isn't timed."""
+    pil_img = PILImage.fromarray(frame)
+    # Without expand, like the old code: the frame stays landscape and the corners are cropped
+    pil_img = pil_img.rotate(90)
+    pil_img = PILImage.fromarray(cv2.flip(np.array(pil_img), 1))
+    cv_image = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+    x, y, w, h = bounding_rect
+    cv2.rectangle(cv_image, (x, y), (x + w, y + h), (0, 255, 0), 3)
+    cv2.drawContours(cv_image, [contour], -1, (0, 255, 255), 2)
+    epsilon = 0.02 * cv2.arcLength(contour, True)
+    approx = cv2.approxPolyDP(contour, epsilon, True)
+    if len(approx) == 4:
+        for point in approx:
+            cv2.circle(cv_image, tuple(point[0]), 8, (0, 0, 255), -1)
+    pil_img = PILImage.fromarray(cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB))
+    return pil_img.tobytes()
+
+
+def current_preview(frame: np.ndarray, contour, bounding_rect) -> np.ndarray:
+    """The current path: one oriented copy on the frame bus, one copy to draw on,
+    then a flat view handed to the persistent texture."""
+    image = orient(frame, 1, True)
+    image = draw_detection(image, contour, bounding_rect)
+    return image.reshape(-1)
+
+
+def measure(fn, frame, contour, bounding_rect, frames: int):
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        fn(frame, contour, bounding_rect)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return 1000 * sum(samples) / len(samples), 1000 * samples[int(len(samples) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the catalog preview frame path')
+    parser.add_argument('--frames', type=int, default=300, help='Frames to time per path')
+    parser.add_argument('--width', type=int, default=640, help='Camera frame width')
+    parser.add_argument('--height', type=int, default=480, help='Camera frame height')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+    # A card-shaped quad in the oriented (portrait) frame
+    w, h = args.height // 2, int(args.height // 2 / 0.714)
+    x, y = args.height // 4, (args.width - h) // 2
+    contour = np.array([[[x, y]], [[x + w, y]], [[x + w, y + h]], [[x, y + h]]], dtype=np.int32)
+    bounding_rect = (x, y, w, h)
+
+    print(f"{args.frames} frames at {args.width}x{args.height}")
+    for name, fn in (("legacy", legacy_preview), ("current", current_preview)):
+        mean_ms, p95_ms = measure(fn, frame, contour, bounding_rect, args.frames)
+        print(f"  {name:<8} mean {mean_ms:6.2f} ms   p95 {p95_ms:6.2f} ms   ({1000 / mean_ms:5.0f} fps budget)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Synthetic camera frames of a card on a plain background, for benchmarks that need detectable cards."""
+import cv2
+import numpy as np
+
+
+def card_quad(width: int, height: int, shift=(0.0, 0.0), angle: float = 4.0) -> np.ndarray:
+    """Corners of a slightly rotated landscape card filling about half of a width x height frame."""
+    card_h = height * 0.6
+    card_w = card_h * 88 / 63
+    center = (width / 2 + shift[0], height / 2 + shift[1])
+    box = cv2.boxPoints((center, (card_w, card_h), angle))
+    return box.astype(np.float32)
+
+
+def render(width: int, height: int, corners: np.ndarray, seed: int = 0, noise: int = 6) -> np.ndarray:
+    """Draw a textured card with a dark border at `corners` over a light, noisy table."""
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width, 3), 200, dtype=np.uint8)
+    frame = cv2.add(frame, rng.integers(0, noise + 1, frame.shape, dtype=np.uint8))
+    quad = np.round(corners).astype(np.int32)
+    cv2.fillConvexPoly(frame, quad, (25, 25, 30), lineType=cv2.LINE_AA)
+
+    # Art box and text lines so the card interior has some texture
+    center = corners.mean(axis=0)
+    inner = (center + (corners - center) * 0.85).astype(np.int32)
+    cv2.fillConvexPoly(frame, inner, (150, 120, 90), lineType=cv2.LINE_AA)
+    for i in range(1, 5):
+        a = inner[0] + (inner[3] - inner[0]) * (0.6 + i * 0.07)
+        b = inner[1] + (inner[2] - inner[1]) * (0.6 + i * 0.07)
+        cv2.line(frame, tuple(a.astype(int)), tuple(b.astype(int)), (40, 40, 40), 2, cv2.LINE_AA)
+    return frame
+
+
+def detector_scanner(**kwargs):
+    """A CardScanner with an empty card database, for benchmarking detection without loading cards.json."""
+    import json
+    import os
+    import tempfile
+
+    from scanner.scanner import CardScanner
+
+    # CardScanner reads the file while it is constructed, so it can go straight after
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cards.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([], f)
+        return CardScanner(path, **kwargs)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Sustained sorting throughput of the complete pipeline, without the robot.
+
+Runs sorter.daemon.SortDaemon end to end: a replayed camera session feeds
+CardCamera, recognized cards are routed by the sorting rules, moves go through
+ArmController to the firmware simulator, and the library outbox syncs through
+a MagicClient to the in-process fake backend over gRPC. Reports cards per hour, queue depths between
+stages, per-stage time per card and tail latencies.
+
+Without --session, a synthetic session is generated: each card slides in,
+settles, and is taken away. Without --cards, recognition is a stand-in that
+takes --recognize-time seconds per card; with it, the real CardScanner runs
+(it needs Tesseract, and a --session of real cards to be meaningful).
+
+Run from robot/software:
+    python -m benchmarks.sort --cards-in-session 30 --move-time 2.0
+    python -m benchmarks.sort --session sessions/monday --speed 1 --cards scanner/cards.json
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import tracing
+from arm import ArmController
+from arm.simulator import FirmwareSimulator
+from benchmarks.scene import card_quad, render
+from magic_client import MagicClient
+from magic_client.fake_backend import FakeBackend
+from magic_client.outbox import LibraryOutbox
+from scanner.util import card_key
+from sorter.camera import CardCamera
+from sorter.daemon import SortDaemon
+from sorter.rules import default_rules, load_rules
+from vision.session import SessionRecorder, SessionReplay
+
+RARITIES = ("common", "uncommon", "rare", "common", "mythic", "common", "uncommon")
+
+
+def synthetic_cards(count: int) -> list:
+    """Card dicts with a mix of rarities, prices and basic lands, so every stack gets used."""
+    cards = []
+    for i in range(count):
+        basic = i % 9 == 8
+        cards.append({
+            'id': f"bench-{i:04d}",
+            'name': f"Benchmark Card {i}",
+            'set': 'bch',
+            'collector_number': str(i + 1),
+            'rarity': 'common' if basic else RARITIES[i % len(RARITIES)],
+            'type_line': 'Basic Land — Forest' if basic else 'Creature — Construct',
+            'prices': {'usd': f"{(i * 37 % 500) / 100:.2f}"},
+        })
+    return cards
+
+
+class _Scripted:
+    """A capture that returns whatever frame was last staged, for recording synthetic sessions."""
+
+    def __init__(self, lores_size, main_size):
+        self.lores_size = lores_size
+        self.main_size = main_size
+        self.frame = None
+
+    def read_lores_gray(self):
+        return self.frame[0]
+
+    def capture_pair(self):
+        return self.frame
+
+
+def synthetic_session(path: str, cards: int, fps: float = 30.0, settle_frames: int = 12,
+                      lores_size=(640, 480), main_size=(1280, 960)):
+    """Record a session of cards sliding in, lying still, and being taken away."""
+    import cv2
+
+    scripted = _Scripted(lores_size, main_size)
+    frame_count = [0]
+    recorder = SessionRecorder(scripted, path, clock=lambda: frame_count[0] / fps)
+    lores_w, lores_h = lores_size
+    main_w, main_h = main_size
+    empty = cv2.cvtColor(np.full((lores_h, lores_w, 3), 200, dtype=np.uint8), cv2.COLOR_RGB2GRAY)
+
+    for card in range(cards):
+        angle = 2.0 + card % 5
+        # Slide in from the right, settle, then the arm lifts it away
+        for step in range(6):
+            shift = (40 - 8 * step, 0)
+            lores = render(lores_w, lores_h, card_quad(lores_w, lores_h, shift, angle), seed=card * 100 + step)
+            scripted.frame = (cv2.cvtColor(lores, cv2.COLOR_RGB2GRAY), None)
+            recorder.read_lores_gray()
+            frame_count[0] += 1
+        still = cv2.cvtColor(render(lores_w, lores_h, card_quad(lores_w, lores_h, (0, 0), angle), seed=card),
+                             cv2.COLOR_RGB2GRAY)
+        for step in range(settle_frames):
+            scripted.frame = (still, None)
+            recorder.read_lores_gray()
+            frame_count[0] += 1
+        main = render(main_w, main_h, card_quad(main_w, main_h, (0, 0), angle), seed=card)
+        scripted.frame = (still, main)
+        recorder.capture_pair()
+        frame_count[0] += 1
+        for step in range(8):
+            scripted.frame = (empty, None)
+            recorder.read_lores_gray()
+            frame_count[0] += 1
+    recorder.close()
+
+
+class StandInScanner:
+    """Recognizes captured cards in session order, taking a fixed time per card."""
+
+    def __init__(self, cards: list, recognize_time: float):
+        self.cards = cards
+        self.cards_db = {card_key(card): card for card in cards}
+        self.recognize_time = recognize_time
+        self._next = 0
+
+    def detect_warped_card(self, image):
+        time.sleep(self.recognize_time)
+        card = self.cards[self._next % len(self.cards)]
+        self._next += 1
+        return card, 0.9
+
+    detect_card = detect_warped_card
+
+
+class LoadedService:
+    """Looks like a ScannerService that has already finished loading."""
+
+    def __init__(self, scanner):
+        self.scanner = scanner
+
+    def wait(self, timeout: float = None):
+        return self.scanner
+
+
+class EventLog:
+    """Collects the daemon's progress records instead of printing them."""
+
+    def __init__(self):
+        self.sorted = []
+        self.stats = []
+
+    def __call__(self, event: str, **fields):
+        if event == "sorted":
+            self.sorted.append(fields)
+        elif event == "stats":
+            self.stats.append(fields)
+
+
+def parse_move_times(text: str, default: float):
+    """'stack1=2.5,stack3=1.2' -> per-command move times, defaulting the rest."""
+    times = {command: default for command in FirmwareSimulator.COMMANDS}
+    for part in filter(None, (text or '').split(',')):
+        command, seconds = part.split('=')
+        times[command.strip()] = float(seconds)
+    return times
+
+
+def percentiles(values) -> dict:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(max(values))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark end-to-end sorting throughput')
+    parser.add_argument('--session', metavar='DIR', help='Recorded session to replay (default: synthetic)')
+    parser.add_argument('--cards-in-session', type=int, default=20, help='Cards in the synthetic session')
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help='Replay speed relative to the recording (0 for as fast as possible)')
+    parser.add_argument('--cards', metavar='PATH', help='cards.json for real recognition (needs Tesseract)')
+    parser.add_argument('--recognize-time', type=float, default=0.4,
+                        help='Seconds the stand-in recognizer takes per card')
+    parser.add_argument('--move-time', type=float, default=2.0, help='Seconds per simulated arm move')
+    parser.add_argument('--move-times', metavar='CMD=S,...',
+                        help='Per-stack move times, e.g. stack1=2.5,stack4=1.5')
+    parser.add_argument('--ack-delay', type=float, default=0.01, help='Seconds before the arm echoes a command')
+    parser.add_argument('--backend-latency', type=float, default=0.05, help='Seconds per backend call')
+    parser.add_argument('--rules', metavar='PATH', help='Sorting rules file (default: by rarity)')
+    parser.add_argument('--stable-frames', type=int, default=8, help='Frames a card must be still')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--trace', metavar='PATH', help='Write per-card spans as a Chrome trace')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='sort-benchmark-')
+    simulator = arm = backend = client = outbox = None
+    try:
+        cards = synthetic_cards(args.cards_in_session)
+        session = args.session
+        if session is None:
+            session = os.path.join(workdir, 'session')
+            synthetic_session(session, args.cards_in_session, settle_frames=args.stable_frames + 4)
+
+        if args.cards:
+            from scanner.scanner import CardScanner
+            scanner = CardScanner(args.cards)
+        else:
+            scanner = StandInScanner(cards, args.recognize_time)
+
+        simulator = FirmwareSimulator(move_time=parse_move_times(args.move_times, args.move_time),
+                                      ack_delay=args.ack_delay)
+        arm = ArmController(simulator.start())
+        arm.open()
+
+        backend = FakeBackend(latency=args.backend_latency)
+        client = MagicClient(port=backend.start())
+        client.login(backend.email, backend.password)
+        library_id = client.create_library("Sort benchmark")
+        outbox = LibraryOutbox(client, db_path=os.path.join(workdir, 'outbox.sqlite3'), flush_interval=0.2)
+        outbox.start()
+
+        replay = SessionReplay(session, speed=args.speed)
+        events = EventLog()
+        daemon = SortDaemon(CardCamera(replay, stable_frames=args.stable_frames), LoadedService(scanner), arm,
+                            rules=load_rules(args.rules) if args.rules else default_rules(),
+                            outbox=outbox, library_id=library_id, stats_interval=0.1, events=events)
+        if args.trace:
+            tracing.start()
+        daemon.run()
+        stats = daemon.stats()
+        if args.trace:
+            tracing.stop()
+            tracing.save(args.trace)
+
+        depths = {name: [sample["stages"][name]["queue_depth"] for sample in events.stats]
+                  for name in ("recognize", "move")}
+        report = {
+            "frames": len(replay),
+            "cards": stats["cards"],
+            "elapsed": stats["elapsed"],
+            "cards_per_hour": stats["cards_per_hour"],
+            "error": stats["error"],
+            "latency": percentiles([record["latency"] for record in events.sorted]),
+            "stages": {
+                name: dict(percentiles([record["stages"][name] for record in events.sorted]),
+                           utilization=stage["utilization"])
+                for name, stage in stats["stages"].items()
+            },
+            "queue_depth": {
+                name: {"mean": float(np.mean(values)) if values else 0.0, "max": max(values, default=0)}
+                for name, values in depths.items()
+            },
+            "arm": stats["arm"],
+            "sync": dict(outbox.stats(), backend_calls=backend.calls.get("CreateCard", 0), queued=stats["cards"]),
+        }
+
+        if args.json:
+            print(json.dumps(report, indent=2, default=str))
+            return
+        print(f"Sorted {report['cards']} cards from {report['frames']} frames in {report['elapsed']:.1f}s: "
+              f"{report['cards_per_hour']:.0f} cards/hour")
+        if report["error"]:
+            print(f"  pipeline stopped early: {report['error']}")
+        print(f"  {'stage':<10} {'busy':>6} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  (seconds per card)")
+        for name, stage in report["stages"].items():
+            print(f"  {name:<10} {100 * stage['utilization']:5.1f}% {stage['p50']:7.3f} {stage['p95']:7.3f} "
+                  f"{stage['p99']:7.3f} {stage['max']:7.3f}")
+        latency = report["latency"]
+        print(f"  {'end-to-end':<10} {'':>6} {latency['p50']:7.3f} {latency['p95']:7.3f} "
+              f"{latency['p99']:7.3f} {latency['max']:7.3f}")
+        for name, depth in report["queue_depth"].items():
+            print(f"  queue before {name:<10} mean {depth['mean']:.2f}  max {depth['max']}")
+        sync = report["sync"]
+        print(f"  synced {sync['sent']} of {sync['queued']} cards during the run, {sync['pending']} pending, "
+              f"{sync['failed']} failed")
+    finally:
+        if outbox is not None:
+            outbox.close()
+        if client is not None:
+            client.close()
+        if backend is not None:
+            backend.stop()
+        if arm is not None:
+            arm.close()
+        if simulator is not None:
+            simulator.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Per-frame cost of following a card with CornerTracker versus a full contour search.
+
+A synthetic card drifts a pixel or so per frame while it is being placed, then
+lies still for the rest of the run, the way a card waits for recognition.
+Both paths run on the grayscale lores-sized frame that continuous
+mode detects on.
+
+Run from robot/software:
+    python -m benchmarks.tracking --frames 300
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.scene import card_quad, detector_scanner, render
+from vision.geometry import order_points
+from vision.tracking import CornerTracker
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark corner tracking against full detection')
+    parser.add_argument('--frames', type=int, default=300, help='Frames to time per path')
+    parser.add_argument('--width', type=int, default=640, help='Frame width')
+    parser.add_argument('--height', type=int, default=480, help='Frame height')
+    args = parser.parse_args()
+
+    frames, truths = [], []
+    for i in range(args.frames):
+        t = min(i, args.frames // 3)
+        corners = card_quad(args.width, args.height, shift=(3 * np.sin(t / 20), 2 * np.cos(t / 15)))
+        frames.append(cv2.cvtColor(render(args.width, args.height, corners, seed=i), cv2.COLOR_RGB2GRAY))
+        truths.append(order_points(corners))
+
+    scanner = detector_scanner()
+
+    def detect(gray):
+        contour = scanner.find_card_contour(gray)
+        return order_points(contour) if contour is not None else None
+
+    tracker = CornerTracker(detect)
+    results = {}
+    for name, fn in (("full", detect), ("tracked", tracker.update)):
+        samples, errors = [], []
+        for gray, truth in zip(frames, truths):
+            start = time.perf_counter()
+            corners = fn(gray)
+            samples.append(time.perf_counter() - start)
+            if corners is not None:
+                errors.append(np.max(np.linalg.norm(order_points(corners) - truth, axis=1)))
+        samples.sort()
+        results[name] = 1000 * sum(samples) / len(samples)
+        print(f"  {name:<8} mean {results[name]:6.3f} ms   p95 {1000 * samples[int(len(samples) * 0.95)]:6.3f} ms"
+              f"   found {len(errors)}/{len(frames)}   max corner error {max(errors, default=0):5.2f} px")
+
+    print(f"  {tracker.full_detections} full detections, {tracker.frames_tracked} tracked frames, "
+          f"{tracker.frames_still} still frames, "
+          f"{results['full'] / results['tracked']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
+import os
+
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.image import Image
+from kivy.uix.textinput import TextInput
+from kivy.clock import Clock
 from kivy.app import App
+from scanner.util import card_key
+from scryfall.localdb import DEFAULT_DB_PATH, LocalDB
+
+# Names or printings listed under the search box
+MAX_SEARCH_RESULTS = 6
+
+# Wait for the operator to stop typing before searching
+SEARCH_DELAY = 0.2
 
 
 class CardResultScreen(Screen):
@@ -31,6 +43,20 @@ class CardResultScreen(Screen):
         self.layout.add_widget(self.collector_label)
         self.layout.add_widget(self.price_label)
 
+        # Manual lookup by name, shown when the scanner couldn't identify the card
+        self.search_panel = BoxLayout(orientation='vertical', spacing=5, size_hint=(1, 2))
+        self.search_input = TextInput(
+            multiline=False,
+            hint_text='Search by card name',
+            size_hint=(1, 0.15)
+        )
+        self.search_input.bind(text=self.on_search_text)
+        self.search_panel.add_widget(self.search_input)
+        self.search_results = BoxLayout(orientation='vertical', spacing=5)
+        self.search_panel.add_widget(self.search_results)
+        self.card_db = None
+        self._search_event = None
+
         # Buttons
         button_row = BoxLayout(size_hint=(1, 0.2), spacing=10)
 
@@ -57,12 +83,94 @@ class CardResultScreen(Screen):
             price = card_info.get('prices', {}).get('usd', 'N/A')
             self.price_label.text = f"Price: ${price}"
             self.title.text = f"Card Detected! (Confidence: {confidence:.2f})"
+            self.show_search(False)
         else:
             self.title.text = "No Card Detected"
             self.name_label.text = "Name: Not Found"
             self.set_label.text = "Set: Not Found"
             self.collector_label.text = "Collector Number: Not Found"
             self.price_label.text = "Price: Not Found"
+            self.show_search(True)
+
+    def show_search(self, visible: bool):
+        """Show or hide the manual lookup, starting from an empty search."""
+        if visible and self.search_panel.parent is None:
+            # Just above the button row
+            self.layout.add_widget(self.search_panel, index=1)
+        elif not visible and self.search_panel.parent is not None:
+            self.layout.remove_widget(self.search_panel)
+        self.search_input.text = ""
+        self.search_results.clear_widgets()
+
+    def local_db(self):
+        """Open the cardsync database on first use.
+
+        Returns:
+            LocalDB, or None if the database hasn't been built on this machine
+        """
+        if self.card_db is None:
+            path = os.path.expanduser(os.getenv('CARDSORTER_CARD_DB', DEFAULT_DB_PATH))
+            if not os.path.exists(path):
+                return None
+            self.card_db = LocalDB(path)
+            self.card_db.open()
+        return self.card_db
+
+    def on_search_text(self, instance, text):
+        if self._search_event is not None:
+            self._search_event.cancel()
+        self._search_event = Clock.schedule_once(lambda dt: self.search(text), SEARCH_DELAY)
+
+    def search(self, text):
+        """List the card names matching what the operator has typed."""
+        self.search_results.clear_widgets()
+        if not text.strip():
+            return
+        try:
+            db = self.local_db()
+            if db is None:
+                self.search_results.add_widget(Label(text="Card database not found, run cardsync.py --update"))
+                return
+            names = db.search_cards(text, limit=MAX_SEARCH_RESULTS)
+        except Exception as e:
+            print(f"Error searching card names: {e}")
+            self.search_results.add_widget(Label(text=f"Search failed: {e}"))
+            return
+
+        if not names:
+            self.search_results.add_widget(Label(text="No matching cards"))
+        for name in names:
+            button = Button(text=name)
+            button.bind(on_press=lambda btn, name=name: self.show_printings(name))
+            self.search_results.add_widget(button)
+
+    def show_printings(self, name):
+        """List the printings of a name so the operator can pick the one in hand."""
+        self.search_results.clear_widgets()
+        rows = self.local_db().get_cards_by_name(name)
+        # English printings first, the most common case for this collection
+        rows.sort(key=lambda row: (row[5] != 'en', row[3], row[4]))
+        for _, card_name, scryfall_id, set_code, collector_number, lang in rows[:MAX_SEARCH_RESULTS]:
+            card = {'id': scryfall_id, 'name': card_name, 'set': set_code,
+                    'collector_number': collector_number, 'lang': lang}
+            button = Button(text=f"{set_code.upper()} #{collector_number} ({lang})")
+            button.bind(on_press=lambda btn, card=card: self.select_card(card))
+            self.search_results.add_widget(button)
+
+    def select_card(self, card):
+        """Use a card picked by name in place of the failed scan."""
+        app = App.get_running_app()
+        # The scanner's catalogue has the full card, with set name and prices
+        scanner = app.scanner_service.scanner
+        if scanner is not None:
+            card = scanner.cards_db.get(card_key(card), card)
+
+        try:
+            app.add_to_library(card)
+        except Exception as e:
+            print(f"Error queueing card: {e}")
+        self.display_card(card, 1.0)
+        self.title.text = "Card Selected by Name"
 
     def try_again(self, *args):
         """Return to the catalog screen to try another scan"""
@@ -70,4 +178,4 @@ class CardResultScreen(Screen):
 
     def back_to_menu(self, *args):
         """Return to the main menu"""
-        self.manager.current = 'menu'
\ No newline at end of file
+        self.manager.current = 'menu'
@@ -95,6 +95,9 @@ if __name__ == '__main__':
                     localdb.conn.commit()
                     localdb.cursor.execute("BEGIN TRANSACTION")
 
+                # Prices are kept for every card, even ones we can't identify by image
+                localdb.add_prices(card)
+
                 if card.set_code == 'unk': # set "unknown event" usually has no image. Skip it.
                     continue
                 # Skip cards that have a missing image
@@ -111,6 +114,9 @@ if __name__ == '__main__':
             # Final flush and commit
             localdb.flush_batches()
             localdb.conn.commit()
+
+            logging.info("Rebuilding card name search index...")
+            localdb.rebuild_name_index()
             
         except Exception as e:
             localdb.conn.rollback()
@@ -1,20 +1,25 @@
-import json
-import os
-from datetime import datetime
+import threading
+from typing import NamedTuple, Optional
 
 import numpy as np
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
+from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.label import Label
 from kivy.uix.camera import Camera
 from kivy.uix.image import Image
 from kivy.graphics.texture import Texture
-from PIL import Image as PILImage
 from kivy.clock import Clock
 from kivy.app import App
 import cv2
-from scanner.scanner import CardScanner
+from vision.autocapture import StableCardTrigger
+from vision.frames import FrameBus, PicameraSource
+from vision.detection import CardDetector, corners_to_contour
+from vision.geometry import warp_card
+from vision.tracking import CornerTracker
+from vision.overlay import draw_detection
+from vision.worker import LatestFrameWorker
 
 # Try importing Picamera2 for Raspberry Pi camera support
 try:
@@ -25,14 +30,42 @@ except ImportError as e:
     print(f"Picamera2 not found. Falling back to regular camera. {e}")
     PICAM_AVAILABLE = False
 
+
+# Width of the card crop shown in the preview and archived; the height follows the card's aspect ratio
+PREVIEW_CARD_WIDTH = 400
+
+
+class CardDetection(NamedTuple):
+    """Result of detecting and cropping the card in one camera frame. All None when there is no card."""
+    corners: Optional[np.ndarray] = None
+    contour: Optional[np.ndarray] = None
+    bounding_rect: Optional[tuple] = None
+    card: Optional[np.ndarray] = None
+
+
+class PersistentTexture:
+    """A Kivy texture reused across frames, reallocated only when the frame size changes."""
+
+    def __init__(self):
+        self.texture = None
+
+    def show(self, widget, image: np.ndarray):
+        """Upload an RGB frame straight from its ndarray buffer and display it in `widget`."""
+        height, width = image.shape[:2]
+        if self.texture is None or tuple(self.texture.size) != (width, height):
+            self.texture = Texture.create(size=(width, height), colorfmt='rgb')
+        # blit_buffer wants a flat buffer; for a contiguous frame the reshape is a view
+        self.texture.blit_buffer(np.ascontiguousarray(image).reshape(-1), colorfmt='rgb', bufferfmt='ubyte')
+        if widget.texture is not self.texture:
+            widget.texture = self.texture
+        else:
+            widget.canvas.ask_update()
+
+
 class CatalogScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
-        # Create directory for saved card images if it doesn't exist
-        self.save_directory = "captured_cards"
-        os.makedirs(self.save_directory, exist_ok=True)
-        
         # Main layout
         self.layout = BoxLayout(orientation='horizontal', spacing=10, padding=10)
         
@@ -73,18 +106,43 @@ class CatalogScreen(Screen):
         exit_btn.bind(on_press=App.get_running_app().stop)
         button_row.add_widget(exit_btn)
 
-        submit_btn = Button(text="Submit")
-        submit_btn.bind(on_press=self.submit_action)
-        button_row.add_widget(submit_btn)
+        # Disabled until the shared scanner has finished loading
+        self.submit_btn = Button(text="Loading...", disabled=True)
+        self.submit_btn.bind(on_press=self.submit_action)
+        button_row.add_widget(self.submit_btn)
+
+        # Hands-free mode: recognize each card once it has been held still
+        self.auto_btn = ToggleButton(text="Auto", disabled=True)
+        self.auto_btn.bind(state=self.on_auto_toggle)
+        button_row.add_widget(self.auto_btn)
 
         left_panel.add_widget(button_row)
         
         # Right side - Camera and preview
         right_panel = BoxLayout(orientation='vertical', size_hint=(0.6, 1), spacing=10)
         
-        # Initialize camera
+        # Card-sized, roughly rectangular outlines in the portrait preview frame
+        self.detector = CardDetector(min_area=0.05, vertices=(3, 6), aspect_range=(0.5, 1.0))
+        # Follows the card between frames so the full contour search only runs when tracking is lost
+        self.card_tracker = CornerTracker(self.detector.find_corners)
+
+        # Contour detection and cropping run off the UI thread, on the newest frame only
+        self.vision_worker = LatestFrameWorker(self.process_frame)
+
+        # The camera is opened on first entering the screen, and runs only while it is shown
         self.picam = None
-        self.setup_camera()
+        self.camera = None
+        self.frame_bus = None
+        self._camera_events = []
+        self._shown_frame_index = 0
+        self._shown_detection = None
+        self.auto_trigger = StableCardTrigger()
+        self._triggered_detection = None
+        self._recognizing = False
+        # The trigger fired while a scan was still running; scan once it finishes
+        self._auto_pending = False
+        self.camera_texture = PersistentTexture()
+        self.preview_texture = PersistentTexture()
         
         # Card preview window
         preview_container = BoxLayout(orientation='vertical', size_hint=(1, 0.7))
@@ -100,9 +158,8 @@ class CatalogScreen(Screen):
         camera_label = Label(text="Camera View:", size_hint=(1, 0.1), font_size=14)
         camera_container.add_widget(camera_label)
         
-        camera_view_container = BoxLayout(size_hint=(1, 0.9))
-        camera_view_container.add_widget(self.camera)
-        camera_container.add_widget(camera_view_container)
+        self.camera_view_container = BoxLayout(size_hint=(1, 0.9))
+        camera_container.add_widget(self.camera_view_container)
         right_panel.add_widget(camera_container)
 
         # Add panels to main layout
@@ -111,336 +168,112 @@ class CatalogScreen(Screen):
         
         self.add_widget(self.layout)
         
-        # Schedule the preview update
-        Clock.schedule_interval(self.update_preview, 1.0/30.0)
+        # The card database is loaded once by the app and shared between screens
+        self.scanner_service = App.get_running_app().scanner_service
         
-        # Load card database
-        try:
-            with open("scanner/cards.json", "r", encoding="utf-8") as f:
-                self.cards = json.load(f)
-        except FileNotFoundError:
-            self.cards = []
-        
-        self.card_lookup = {}
-        for card in self.cards:
-            name = card.get("name")
-            if name:
-                self.card_lookup[name.lower()] = card
-        
-        # Store the last detected card contour for cropping
-        self.last_card_contour = None
+        # Store the last detected card corners for cropping
+        self.last_card_corners = None
+
+    def save_cropped_card(self, cropped_image: np.ndarray, card_info=None, confidence=None):
+        """Queue the cropped card image to be saved with timestamp and card info.
 
-    def detect_card_contour(self, pil_image: PILImage.Image):
-        """Detect the largest rectangular contour in the image that could be a card.
+        Encoding and writing happen on the app's archiver thread; if the disk
+        falls behind, the image is dropped rather than blocking the UI.
         
         Args:
-            pil_image: PIL Image to process
+            cropped_image: RGB numpy array of the cropped card
+            card_info: Optional card information from recognition
+            confidence: Optional recognition confidence, stored in the sidecar
             
         Returns:
-            tuple: (contour, bounding_rect) if card detected, (None, None) otherwise
+            str: Path the image will be saved to, or None if it was dropped
         """
-        # Convert PIL to OpenCV format
-        cv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        
-        # Apply adaptive thresholding
-        thresh = cv2.adaptiveThreshold(
-            blurred, 255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY_INV,
-            11, 2
-        )
-        
-        # Find contours
-        contours, _ = cv2.findContours(
-            thresh,
-            cv2.RETR_EXTERNAL,
-            cv2.CHAIN_APPROX_SIMPLE
-        )
-        
-        if not contours:
-            return None, None
-            
-        # Filter contours by area and aspect ratio
-        image_area = gray.shape[0] * gray.shape[1]
-        valid_contours = []
-        
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            
-            # Must be at least 5% of image area
-            if area < (image_area * 0.05):
-                continue
-                
-            # Approximate the contour to a polygon
-            epsilon = 0.02 * cv2.arcLength(contour, True)
-            approx = cv2.approxPolyDP(contour, epsilon, True)
-            
-            # Check if it's roughly rectangular (3-6 corners after approximation)
-            if len(approx) >= 3 and len(approx) <= 6:
-                # Check aspect ratio (cards are roughly 2.5:3.5 ratio)
-                x, y, w, h = cv2.boundingRect(contour)
-                aspect_ratio = w / h
-                
-                # Magic cards are typically 2.5" x 3.5", so ratio should be around 0.71
-                # Allow some tolerance: 0.5 to 1.0
-                if 0.5 <= aspect_ratio <= 1.0:
-                    valid_contours.append((contour, area, (x, y, w, h)))
-        
-        if not valid_contours:
-            return None, None
-            
-        # Return the largest valid contour
-        best_contour = max(valid_contours, key=lambda x: x[1])
-        return best_contour[0], best_contour[2]
+        app = App.get_running_app()
+        metadata = {"library_id": app.selected_library.id} if app.selected_library else None
+        return app.card_archiver.submit(cropped_image, card_info, confidence, metadata)
 
-    def order_points(self, pts):
-        """Order points for perspective transformation: top-left, top-right, bottom-right, bottom-left"""
-        rect = np.zeros((4, 2), dtype="float32")
-        
-        # Sum and difference to find corners
-        s = pts.sum(axis=1)
-        diff = np.diff(pts, axis=1)
-        
-        # Top-left has smallest sum, bottom-right has largest sum
-        rect[0] = pts[np.argmin(s)]
-        rect[2] = pts[np.argmax(s)]
-        
-        # Top-right has smallest difference, bottom-left has largest difference
-        rect[1] = pts[np.argmin(diff)]
-        rect[3] = pts[np.argmax(diff)]
-        
-        return rect
+    def process_frame(self, frame: np.ndarray) -> CardDetection:
+        """Detect and crop the card in a frame. Runs on the vision worker thread.
 
-    def crop_card_from_contour(self, pil_image: PILImage.Image, contour):
-        """Extract the card region from the image using perspective transformation.
-        
         Args:
-            pil_image: PIL Image to crop from
-            contour: OpenCV contour of the detected card
-            
-        Returns:
-            PIL Image of the cropped and perspective-corrected card, or None if cropping fails
-        """
-        if contour is None:
-            return None
-            
-        try:
-            # Convert PIL to OpenCV
-            cv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-            
-            # Approximate the contour to get corner points
-            epsilon = 0.02 * cv2.arcLength(contour, True)
-            approx = cv2.approxPolyDP(contour, epsilon, True)
-            
-            # If we have exactly 4 points, use them for perspective transform
-            if len(approx) == 4:
-                # Reshape and convert to float32
-                src_pts = approx.reshape(4, 2).astype("float32")
-                
-                # Order the points
-                src_pts = self.order_points(src_pts)
-                
-                # Define the dimensions for the output card (much larger)
-                # Magic cards are 2.5" x 3.5" (aspect ratio ~0.714)
-                card_width = 400  # Increased from 250
-                card_height = int(card_width / 0.714)  # ~560
-                
-                # Define destination points for the perspective transform
-                dst_pts = np.array([
-                    [0, 0],                           # top-left
-                    [card_width - 1, 0],              # top-right
-                    [card_width - 1, card_height - 1], # bottom-right
-                    [0, card_height - 1]              # bottom-left
-                ], dtype="float32")
-                
-                # Calculate perspective transform matrix
-                M = cv2.getPerspectiveTransform(src_pts, dst_pts)
-                
-                # Apply perspective transform
-                warped = cv2.warpPerspective(cv_image, M, (card_width, card_height))
-                
-                # Convert back to PIL
-                warped_pil = PILImage.fromarray(cv2.cvtColor(warped, cv2.COLOR_BGR2RGB))
-                
-                return warped_pil
-            
-            else:
-                # Fall back to bounding rectangle if we don't have exactly 4 corners
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Minimal padding (just 2-3 pixels)
-                padding = 3
-                x = max(0, x - padding)
-                y = max(0, y - padding)
-                w = min(pil_image.width - x, w + 2 * padding)
-                h = min(pil_image.height - y, h + 2 * padding)
-                
-                # Crop using bounding rectangle
-                cropped = pil_image.crop((x, y, x + w, y + h))
-                
-                # Resize to larger standard card dimensions while maintaining aspect ratio
-                target_width = 400  # Increased from 250
-                aspect_ratio = cropped.height / cropped.width
-                target_height = int(target_width * aspect_ratio)
-                
-                cropped = cropped.resize((target_width, target_height), PILImage.Resampling.LANCZOS)
-                
-                return cropped
-            
-        except Exception as e:
-            print(f"Error cropping card: {e}")
-            return None
+            frame: RGB numpy array, already rotated and flipped for display
 
-    def save_cropped_card(self, cropped_image: PILImage.Image, card_info=None):
-        """Save the cropped card image to disk with timestamp and card info.
-        
-        Args:
-            cropped_image: PIL Image of the cropped card
-            card_info: Optional card information from recognition
-            
         Returns:
-            str: Path to saved file
+            CardDetection for the frame
         """
-        try:
-            # Create timestamp for unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Create filename based on card info if available
-            if card_info and 'name' in card_info:
-                # Clean up card name for filename (remove invalid characters)
-                card_name = str(card_info['name']).replace('/', '_').replace('\\', '_').replace(':', '_')
-                card_name = ''.join(c for c in card_name if c.isalnum() or c in (' ', '-', '_')).strip()
-                filename = f"{timestamp}_{card_name}.png"
-            else:
-                filename = f"{timestamp}_unknown_card.png"
-            
-            # Full path
-            filepath = os.path.join(self.save_directory, filename)
-            
-            # Save the image as PNG (lossless compression)
-            cropped_image.save(filepath, "PNG", optimize=True)
-            
-            print(f"Cropped card image saved to: {filepath}")
-            return filepath
-            
-        except Exception as e:
-            print(f"Error saving cropped card image: {e}")
-            return None
+        corners = self.card_tracker.update(self.detector.gray(frame))
+        if corners is None:
+            return CardDetection()
+        contour = corners_to_contour(corners)
+        bounding_rect = cv2.boundingRect(contour)
 
-    def draw_card_bounds(self, pil_image: PILImage.Image) -> PILImage.Image:
-        """Draw a rectangle around a detected card in the image.
+        # Texture uploads have to happen on the UI thread, but the warp doesn't
+        card = warp_card(frame, corners, width=PREVIEW_CARD_WIDTH)
+        return CardDetection(corners, contour, bounding_rect, card)
+
+    def draw_card_bounds(self, image: np.ndarray, detection: Optional[CardDetection]) -> np.ndarray:
+        """Draw a rectangle around a detected card in the frame.
         
         Args:
-            pil_image: PIL Image to process
+            image: RGB frame to draw on. It is not modified.
+            detection: Latest detection from the vision worker, if any
             
         Returns:
-            PIL Image with rectangle drawn around detected card
+            RGB frame with rectangle drawn around detected card
         """
-        # Convert PIL to OpenCV format for drawing
-        cv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-        
-        # Detect card contour
-        contour, bounding_rect = self.detect_card_contour(pil_image)
-        
-        if contour is not None:
-            # Store for cropping
-            self.last_card_contour = contour
-            
-            # Draw green rectangle around the detected card
-            x, y, w, h = bounding_rect
-            cv2.rectangle(cv_image, (x, y), (x + w, y + h), (0, 255, 0), 3)
-            
-            # Draw contour outline in yellow
-            cv2.drawContours(cv_image, [contour], -1, (0, 255, 255), 2)
-            
-            # If we can approximate to 4 corners, draw corner points
-            epsilon = 0.02 * cv2.arcLength(contour, True)
-            approx = cv2.approxPolyDP(contour, epsilon, True)
-            
-            if len(approx) == 4:
-                # Draw corner points in red
-                for point in approx:
-                    cv2.circle(cv_image, tuple(point[0]), 8, (0, 0, 255), -1)
-        else:
-            self.last_card_contour = None
-
-        # Convert back to PIL Image
-        return PILImage.fromarray(cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB))
+        if detection is None:
+            return image
+        return draw_detection(image, detection.contour, detection.bounding_rect)
 
     def update_picam_texture(self, dt):
         if self.picam:
-            # Capture frame from Pi camera
-            frame = self.picam.capture_array()
-            # Convert to format Kivy can display
-            pil_img = PILImage.fromarray(frame)
-            # Rotate the image 90 degrees
-            pil_img = pil_img.rotate(90)
-            # Mirror the image horizontally
-            pil_img = PILImage.fromarray(cv2.flip(np.array(pil_img), 1))
+            # Show the newest frame from the bus, if it hasn't been shown yet
+            frame = self.frame_bus.latest()
+            if frame is None or frame.index == self._shown_frame_index:
+                return
+            self._shown_frame_index = frame.index
             
-            # Draw rectangle around detected card
-            pil_img = self.draw_card_bounds(pil_img)
-            
-            # Convert to texture
-            buf = pil_img.tobytes()
-            texture = Texture.create(size=(pil_img.width, pil_img.height), colorfmt='rgb')
-            texture.blit_buffer(buf, colorfmt='rgb', bufferfmt='ubyte')
-            self.camera.texture = texture
+            # Draw the vision worker's latest result over the frame and upload it
+            image = self.draw_card_bounds(frame.image, self.vision_worker.latest())
+            self.camera_texture.show(self.camera, image)
 
     def update_preview(self, dt):
         """Update the card preview window"""
         try:
-            if self.picam:
-                # Capture from Pi camera
-                frame = self.picam.capture_array()
-                pil_img = PILImage.fromarray(frame)
-                # Apply same transformations as main view
-                pil_img = pil_img.rotate(90)
-                pil_img = PILImage.fromarray(cv2.flip(np.array(pil_img), 1))
-            else:
-                # Capture from regular camera
+            if not self.picam:
+                # Capture from regular camera. Pi camera frames are submitted by update_picam_texture.
                 if not self.camera.texture:
                     return
                 texture = self.camera.texture
-                size = texture.size
-                pixels = texture.pixels
-                pil_img = PILImage.frombytes(mode="RGBA", size=size, data=pixels)
+                width, height = texture.size
+                rgba = np.frombuffer(texture.pixels, dtype=np.uint8).reshape(height, width, 4)
+                frame = self.frame_bus.publish(rgba[:, :, :3])
                 
                 # Draw rectangle around detected card for main camera view
-                pil_img_with_bounds = self.draw_card_bounds(pil_img.convert('RGB'))
-                
-                # Update the camera view
-                data = pil_img_with_bounds.tobytes()
-                tex = Texture.create(size=pil_img_with_bounds.size, colorfmt='rgb')
-                tex.blit_buffer(data, colorfmt='rgb', bufferfmt='ubyte')
-                self.camera.texture = tex
-
-            # Update card preview window
-            if self.last_card_contour is not None:
-                # Crop the card for preview
-                cropped_card = self.crop_card_from_contour(pil_img.convert('RGB'), self.last_card_contour)
-                
-                if cropped_card:
-                    # Convert cropped card to Kivy texture
-                    cropped_card = cropped_card.convert("RGBA")
-                    data = cropped_card.tobytes()
-                    tex = Texture.create(size=cropped_card.size, colorfmt='rgba')
-                    tex.blit_buffer(data, colorfmt='rgba', bufferfmt='ubyte')
-                    self.card_preview.texture = tex
+                image = self.draw_card_bounds(frame.image, self.vision_worker.latest())
+                self.camera_texture.show(self.camera, image)
+
+            # Update card preview window from the worker's latest result
+            detection = self.vision_worker.latest()
+            self.last_card_corners = detection.corners if detection else None
+            if self.last_card_corners is not None:
+                # Only upload when the worker has published a new crop
+                if detection.card is not None and detection is not self._shown_detection:
+                    self._shown_detection = detection
+                    self.preview_texture.show(self.card_preview, detection.card)
             else:
                 # Clear preview if no card detected
                 self.card_preview.texture = None
+                self._shown_detection = None
+
+            if self.auto_btn.state == 'down':
+                self.update_auto_capture(detection)
                 
         except Exception as e:
             print(f"Error updating preview: {e}")
 
     def setup_camera(self):
+        """Open and configure the camera, without starting it."""
         if PICAM_AVAILABLE:
             try:
                 self.picam = Picamera2()
@@ -449,11 +282,13 @@ class CatalogScreen(Screen):
                         controls={"FrameDurationLimits": (33333, 33333)}  # ~30fps
                 )
                 self.picam.configure(config)
-                self.picam.start()
+                
+                # Capture each frame once, rotated 90 degrees and mirrored, for every consumer
+                self.frame_bus = FrameBus(PicameraSource(self.picam), rotate=1, flip=True)
+                self.frame_bus.subscribe(lambda frame: self.vision_worker.submit(frame.image))
                 
                 # Create a texture display widget
-                self.camera = Image(size_hint=(1, 1))
-                Clock.schedule_interval(self.update_picam_texture, 1.0/30.0)
+                self.show_camera_widget(Image(size_hint=(1, 1)))
             except Exception as e:
                 print(f"Failed to initialize Pi camera: {e}")
                 self.fallback_to_regular_camera()
@@ -462,7 +297,84 @@ class CatalogScreen(Screen):
 
     def fallback_to_regular_camera(self):
         self.picam = None
-        self.camera = Camera(play=True, resolution=(640, 480), index=0)
+        self.show_camera_widget(Camera(play=False, resolution=(640, 480), index=0))
+        # Frames are published from the camera texture by update_preview
+        self.frame_bus = FrameBus()
+        self.frame_bus.subscribe(lambda frame: self.vision_worker.submit(frame.image))
+
+    def show_camera_widget(self, widget):
+        if self.camera is not None:
+            self.camera_view_container.remove_widget(self.camera)
+        self.camera = widget
+        self.camera_view_container.add_widget(widget)
+
+    def start_camera(self):
+        """Start capturing, detecting and previewing. Called each time the screen is entered."""
+        if self.camera is None:
+            self.setup_camera()
+        self.vision_worker.start()
+        if self.picam:
+            try:
+                self.picam.start()
+                self.frame_bus.start()
+                self._camera_events.append(Clock.schedule_interval(self.update_picam_texture, 1.0/30.0))
+            except Exception as e:
+                print(f"Failed to start Pi camera: {e}")
+                self.picam.close()
+                self.fallback_to_regular_camera()
+        if not self.picam:
+            self.camera.play = True
+        self._camera_events.append(Clock.schedule_interval(self.update_preview, 1.0/30.0))
+
+    def stop_camera(self):
+        """Stop capturing while the screen isn't shown. The vision worker idles without frames."""
+        for event in self._camera_events:
+            event.cancel()
+        self._camera_events = []
+        if self.picam:
+            # Leave the camera open and configured, so coming back only has to start it
+            self.frame_bus.stop(close=False)
+            self.picam.stop()
+        elif self.camera is not None:
+            self.camera.play = False
+
+    def recognize_frame(self, frame: np.ndarray, corners):
+        """Recognize the card in a frame, queue it for the selected library and archive the crop.
+
+        Args:
+            frame: RGB numpy array from the frame bus
+            corners: Detected card corners in the frame, or None to scan the whole frame
+
+        Returns:
+            tuple: (card_info, confidence) from the scanner
+        """
+        scanner = self.scanner_service.scanner
+        cropped_card = None
+
+        # Use the cropped card if available, otherwise use full image
+        if corners is not None:
+            cropped_card = warp_card(frame, corners, width=PREVIEW_CARD_WIDTH)
+            card_info, confidence = scanner.detect_warped_card(cropped_card)
+        else:
+            card_info, confidence = scanner.detect_card(frame)
+
+        # Queue the card for the selected library; the outbox syncs it in the background
+        App.get_running_app().add_to_library(card_info)
+
+        # Save the cropped card image if we have one
+        if cropped_card is not None:
+            saved_path = self.save_cropped_card(cropped_card, card_info, confidence)
+            if saved_path:
+                print(f"Card image queued for {saved_path}")
+            else:
+                print("Card image dropped, archive is behind")
+        else:
+            print("No cropped card available to save")
+
+        return card_info, confidence
+
+    def scanner_ready(self) -> bool:
+        return self.scanner_service.ready and self.scanner_service.scanner is not None
 
     def submit_action(self, *args):
         """
@@ -470,50 +382,20 @@ class CatalogScreen(Screen):
         If a card contour was detected, use the cropped card for recognition and save it to disk.
         """
         try:
-            if self.picam:
-                # Capture from Pi camera
-                frame = self.picam.capture_array()
-                pil_img = PILImage.fromarray(frame)
-                pil_img = pil_img.rotate(90)
-                pil_img = PILImage.fromarray(cv2.flip(np.array(pil_img), 1))
-            else:
-                # Capture from regular camera
-                if not self.camera.texture:
-                    print("No camera texture available.")
-                    return
-                texture = self.camera.texture
-                size = texture.size
-                pixels = texture.pixels
-                pil_img = PILImage.frombytes(mode="RGBA", size=size, data=pixels)
+            # Recognize the newest frame already on the bus instead of capturing again
+            frame = self.frame_bus.latest()
+            if frame is None:
+                print("No camera frame available.")
+                return
 
-            # Use the cropped card if available, otherwise use full image
-            image_to_scan = pil_img
-            cropped_card = None
-            
-            if self.last_card_contour is not None:
-                cropped_card = self.crop_card_from_contour(pil_img.convert('RGB'), self.last_card_contour)
-                if cropped_card:
-                    image_to_scan = cropped_card
+            if not self.scanner_ready():
+                print("Card scanner is not ready yet.")
+                return
 
-            # Initialize scanner
-            scanner = CardScanner()
+            card_info, confidence = self.recognize_frame(frame.image, self.last_card_corners)
 
-            # Detect card
-            card_info, confidence = scanner.detect_card(image_to_scan)
-            
-            # Save the cropped card image if we have one
-            if cropped_card:
-                saved_path = self.save_cropped_card(cropped_card, card_info)
-                if saved_path:
-                    print(f"Card image saved successfully to {saved_path}")
-                else:
-                    print("Failed to save card image")
-            else:
-                print("No cropped card available to save")
-        
             # Switch to result screen and display card info
-            app = App.get_running_app()
-            result_screen = app.root.get_screen('card_result')
+            result_screen = App.get_running_app().root.get_screen('card_result')
             result_screen.display_card(card_info, confidence)
             self.manager.current = 'card_result'
         
@@ -522,18 +404,107 @@ class CatalogScreen(Screen):
             # Show error on current screen
             self.title_label.text = f"Error: {str(e)}"
 
+    def on_auto_toggle(self, button, state):
+        # Start from a clean slate so a card already lying in view is scanned once
+        self.auto_trigger.reset()
+        self._triggered_detection = None
+        self._auto_pending = False
+
+    def update_auto_capture(self, detection: Optional[CardDetection]):
+        """Feed each new vision worker result to the stability trigger, scanning when it fires.
+
+        A fire during a running scan is kept, and that card is scanned once the scan finishes.
+        """
+        if detection is None or detection is self._triggered_detection:
+            return
+        self._triggered_detection = detection
+
+        # Leave the trigger armed until the scanner has loaded, so a card already in place is scanned then
+        if not self.scanner_ready():
+            return
+        if self.auto_trigger.update(detection.corners):
+            self._auto_pending = True
+        elif detection.corners is None:
+            # The card was taken away before its scan could start
+            self._auto_pending = False
+        if not self._auto_pending or self._recognizing:
+            return
+
+        frame = self.frame_bus.latest()
+        if frame is None:
+            return
+        # OCR takes far longer than a frame, so keep it off the UI thread
+        self._auto_pending = False
+        self._recognizing = True
+        self.title_label.text = "Title: Scanning..."
+        threading.Thread(
+            target=self.auto_recognize, args=(frame.image, detection.corners), daemon=True).start()
+
+    def auto_recognize(self, image: np.ndarray, corners):
+        try:
+            card_info, confidence = self.recognize_frame(image, corners)
+            Clock.schedule_once(lambda dt: self.show_card_info(card_info, confidence))
+        except Exception as e:
+            print(f"Error in card detection: {e}")
+            message = f"Error: {e}"
+            Clock.schedule_once(lambda dt: setattr(self.title_label, 'text', message))
+        finally:
+            self._recognizing = False
+
+    def show_card_info(self, card_info, confidence):
+        """Show an auto-captured card in the side panel, staying on this screen for the next card."""
+        if not card_info:
+            self.title_label.text = "Title: No match"
+            self.set_label.text = "Set: "
+            self.num_label.text = "Collector Number: "
+            self.price_label.text = "Price: "
+            return
+        self.title_label.text = f"Title: {card_info['name']} ({confidence:.2f})"
+        self.set_label.text = f"Set: {card_info.get('set_name', card_info.get('set', ''))}"
+        self.num_label.text = f"Collector Number: {card_info.get('collector_number', '')}"
+        price = (card_info.get('prices') or {}).get('usd')
+        self.price_label.text = f"Price: ${price}" if price else "Price: "
+
     def go_back(self, *args):
-        if self.picam:
-            self.picam.stop()
+        # Leaving the screen stops the camera, see on_leave
         self.manager.current = "menu"
 
+    def sync_library(self, library_id):
+        try:
+            App.get_running_app().library_cache.sync(library_id)
+        except Exception as e:
+            print(f"Error syncing library {library_id}: {e}")
+
+    def check_scanner_ready(self, dt=None):
+        """Enable scanning once the shared scanner has loaded. Returns False to stop polling."""
+        if not self.scanner_service.ready:
+            self.submit_btn.text = f"Loading... {self.scanner_service.progress:.0%}"
+            return True
+        if self.scanner_service.error is not None:
+            self.submit_btn.text = "Scanner unavailable"
+            self.title_label.text = f"Error: {self.scanner_service.error}"
+        else:
+            self.submit_btn.text = "Submit"
+            self.submit_btn.disabled = False
+            self.auto_btn.disabled = False
+        return False
+
     def on_enter(self):
         """Called when screen is entered"""
+        self.start_camera()
+        if self.check_scanner_ready():
+            Clock.schedule_interval(self.check_scanner_ready, 0.25)
         app = App.get_running_app()
         if app.selected_library:
             try:
                 library = app.selected_library
                 self.library_label.text = f"Library: {library.name}"
+                # Refresh the local mirror of the library without blocking the UI
+                threading.Thread(target=self.sync_library, args=(library.id,), daemon=True).start()
             except Exception as e:
                 print(f"Error fetching library details: {e}")
-                self.library_label.text = "Library: Error loading details"
\ No newline at end of file
+                self.library_label.text = "Library: Error loading details"
+
+    def on_leave(self):
+        """Called when the screen is left, for the menu or a result screen"""
+        self.stop_camera()
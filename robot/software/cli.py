@@ -1,33 +1,54 @@
 # !/usr/bin/env python3
 import time
+import os
 import sys
 import argparse
-from PIL import Image
-import numpy as np
-from scanner.scanner import CardScanner
-from picamera2 import Picamera2
-
-
-def setup_camera(resolution=(1640, 1232)):
-    """Initialize and configure the Pi camera."""
-    picam = Picamera2()
-    config = picam.create_still_configuration(
-        main={"size": resolution, "format": "RGB888"},
-        lores={"size": (640, 480)},  # Lower resolution stream for preview
-        display="lores"
-    )
-    picam.configure(config)
-    picam.start()
-    # Give camera time to warm up
-    time.sleep(2)
-    return picam
-
-
-def capture_image(picam):
-    """Capture an image from the Pi camera."""
-    # Capture array and convert to PIL Image
-    array = picam.capture_array()
-    return Image.fromarray(array)
+from concurrent import futures
+from arm import ArmController, ArmError
+from scanner.service import shared_service
+from scryfall.localdb import DEFAULT_DB_PATH, load_prices
+from sorter import SortPipeline
+from sorter.camera import CardCamera, open_capture, recognize_capture
+from sorter.rules import default_rules, load_rules
+
+
+def recognize_card(scanner, captured):
+    """Recognize a capture from CardCamera and print the result."""
+    card, confidence = recognize_capture(scanner, captured)
+    print_card_info(card, confidence)
+    return card, confidence
+
+
+def card_placed(routing, job):
+    """Pipeline callback: count the sorted card and report where it went."""
+    routing.record_sorted(job.card)
+    print(f"Card placed on {job.stack.name.lower()} stack ({job.latency:.1f}s after capture started)")
+
+
+def sort_card(arm, routing, card):
+    """Queue the move for a scanned card; the arm works through the queue while scanning continues.
+
+    Returns:
+        Future for the move, or None if the arm's queue was full
+    """
+    stack = routing.route(card)
+    try:
+        future = arm.move_to_stack(stack)
+    except ArmError as e:
+        print(f"Arm busy, card not sorted: {e}", file=sys.stderr)
+        return None
+
+    def report(done):
+        if done.cancelled():
+            return
+        error = done.exception()
+        if error is not None:
+            print(f"Arm failed moving card to {stack.name.lower()}: {error}", file=sys.stderr)
+        else:
+            routing.record_sorted(card)
+            print(f"Card placed on {stack.name.lower()} stack ({done.result():.1f}s)")
+    future.add_done_callback(report)
+    return future
 
 
 def print_card_info(card, confidence):
@@ -54,57 +75,112 @@ def print_card_info(card, confidence):
     print("===========================\n")
 
 
+def run_sort_pipeline(pipeline):
+    """Run a SortPipeline until it fails or is interrupted, then print throughput and stage utilization."""
+    pipeline.start()
+    try:
+        pipeline.wait()
+    finally:
+        pipeline.stop()
+        stats = pipeline.stats()
+        print(f"Sorted {stats['cards']} cards, {stats['cards_per_hour']:.0f} cards/hour")
+        for name, stage in stats['stages'].items():
+            print(f"  {name:<10} {100 * stage['utilization']:5.1f}% busy")
+    if pipeline.error is not None:
+        raise pipeline.error
+
+
 def main():
     parser = argparse.ArgumentParser(description='Magic: The Gathering card scanner for Raspberry Pi')
     parser.add_argument('--continuous', '-c', action='store_true',
-                        help='Run in continuous mode, scanning every few seconds')
+                        help='Run in continuous mode, scanning each card once it is held still')
+    parser.add_argument('--stable-frames', type=int, default=8,
+                        help='Frames the card must be still before it is scanned (0 to scan on a fixed delay)')
     parser.add_argument('--delay', '-d', type=float, default=2.0,
-                        help='Delay between scans in continuous mode (seconds)')
+                        help='Delay between scans in continuous mode when --stable-frames is 0 (seconds)')
     parser.add_argument('--save', '-s', action='store_true',
                         help='Save captured images (debug mode)')
+    parser.add_argument('--arm', metavar='PORT',
+                        help='Serial port of the sorting arm; each scanned card is moved to its stack')
+    parser.add_argument('--record', metavar='DIR', help='Record the camera session for replaying later')
+    parser.add_argument('--replay', metavar='DIR', help='Replay a recorded session instead of using the camera')
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help='Replay speed relative to the recording (0 for as fast as possible)')
+    parser.add_argument('--rules', metavar='PATH',
+                        help='JSON sorting rules file (see sorter.rules); defaults to routing by rarity')
+    parser.add_argument('--prices', metavar='PATH', default=os.getenv('CARDSORTER_CARD_DB', DEFAULT_DB_PATH),
+                        help='cardsync database to take prices from for rules on price')
     args = parser.parse_args()
 
+    # Load the card database and start OCR while the camera warms up
+    scanner_service = shared_service()
+
+    capture = arm = routing = None
     try:
         print("Initializing camera...")
-        picam = setup_camera()
-        scanner = CardScanner()
+        capture = open_capture(args.replay, speed=args.replay_speed, record=args.record)
+        camera = CardCamera(capture, stable_frames=args.stable_frames, save=args.save)
+        scanner = scanner_service.wait()
+        if args.arm:
+            rules = load_rules(args.rules) if args.rules else default_rules()
+            prices = load_prices(args.prices) if rules.uses_prices else None
+            # Owned counts need a library; the CLI sorts as if none are owned yet
+            routing = rules.compile(scanner.cards_db.values(), prices=prices)
+            print("Connecting to arm...")
+            arm = ArmController(args.arm)
+            arm.open()
 
         if args.continuous:
             print("Starting continuous scan mode. Press Ctrl+C to exit.")
             print("Place a card in view of the camera...")
 
             try:
-                while True:
-                    image = capture_image(picam)
-
-                    if args.save:
-                        image.save('captured.jpg')
-
-                    card, confidence = scanner.detect_card(image)
-                    print_card_info(card, confidence)
-
-                    time.sleep(args.delay)
-                    print("\nReady for next card...")
+                if arm and args.stable_frames > 0:
+                    # Recognize the next card while the arm is still placing the previous one
+                    pipeline = SortPipeline(
+                        # Stop waiting for a card once another stage has failed
+                        capture=lambda: camera.wait_for_card(lambda: pipeline.stopping),
+                        recognize=lambda captured: recognize_card(scanner, captured),
+                        route=routing.route,
+                        move=arm.move_to_stack,
+                        on_sorted=lambda job: card_placed(routing, job),
+                    )
+                    run_sort_pipeline(pipeline)
+                else:
+                    while True:
+                        if args.stable_frames > 0:
+                            captured = camera.wait_for_card()
+                            if captured is None:
+                                print("\nReplay finished.")
+                                break
+                            recognize_card(scanner, captured)
+                            print("\nRemove the card and place the next one...")
+                        else:
+                            card, _ = recognize_card(scanner, camera.capture_card())
+                            if arm:
+                                sort_card(arm, routing, card)
+                            time.sleep(args.delay)
+                            print("\nReady for next card...")
 
             except KeyboardInterrupt:
                 print("\nStopping continuous scan mode.")
 
         else:
             print("Capturing single image...")
-            image = capture_image(picam)
-
-            if args.save:
-                image.save('captured.jpg')
-
-            card, confidence = scanner.detect_card(image)
-            print_card_info(card, confidence)
+            card, _ = recognize_card(scanner, camera.capture_card())
+            future = sort_card(arm, routing, card) if arm else None
+            if future is not None:
+                # Nothing else to do, so wait for the move to finish before closing the port
+                futures.wait([future])
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
     finally:
-        if 'picam' in locals():
-            picam.close()
+        if capture is not None:
+            capture.close()
+        if arm is not None:
+            arm.close()
 
     return 0
 
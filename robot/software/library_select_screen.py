@@ -49,7 +49,7 @@ class LibrarySelectScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.libraries = []
-        self.magic_client = App.get_running_app().magic_client
+        self.async_client = App.get_running_app().async_client
 
         self.layout = BoxLayout(orientation='vertical', padding=20, spacing=10)
 
@@ -100,10 +100,28 @@ class LibrarySelectScreen(Screen):
         self.load_libraries()
 
     def load_libraries(self):
-        """Load and display libraries from the backend"""
+        """Start loading libraries from the backend without blocking the UI"""
+        self.libraries_layout.clear_widgets()
+        self.libraries_layout.add_widget(Label(
+            text="Loading libraries...",
+            size_hint=(1, None),
+            height=40
+        ))
+        App.get_running_app().bridge.submit(
+            self.async_client.get_libraries(),
+            on_success=self.show_libraries,
+            on_error=self.on_load_error,
+        )
+
+    def on_load_error(self, error):
+        self.libraries_layout.clear_widgets()
+        self.error_label.text = f"Error loading libraries: {str(error)}"
+
+    def show_libraries(self, libraries):
+        """Display the libraries fetched from the backend"""
         try:
             self.libraries_layout.clear_widgets()
-            self.libraries = self.magic_client.get_libraries()
+            self.libraries = libraries
 
             if not self.libraries:
                 self.libraries_layout.add_widget(Label(
@@ -132,14 +150,20 @@ class LibrarySelectScreen(Screen):
         popup.open()
 
     def create_library(self, name):
-        try:
-            library_id = self.magic_client.create_library(name)
-            # Store the library ID in the app
-            App.get_running_app().selected_library_id = library_id
-            # Navigate to catalog screen
-            self.manager.current = "catalog"
-        except Exception as e: # TODO: narrow this down to the right type
-            self.error_label.text = f"Error creating library: {str(e)}"
+        App.get_running_app().bridge.submit(
+            self.async_client.create_library(name),
+            on_success=self.on_library_created,
+            on_error=self.on_create_error,
+        )
+
+    def on_library_created(self, library_id):
+        # Store the library ID in the app
+        App.get_running_app().selected_library_id = library_id
+        # Navigate to catalog screen
+        self.manager.current = "catalog"
+
+    def on_create_error(self, error):
+        self.error_label.text = f"Error creating library: {str(error)}"
 
     def select_library(self, button):
         # Store the selected library ID in the app
@@ -9,7 +9,7 @@ from kivy.core.window import Window
 class LoginScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.magic_client = App.get_running_app().magic_client
+        self.async_client = App.get_running_app().async_client
 
         # Main layout
         layout = BoxLayout(orientation='vertical', padding=20, spacing=10)
@@ -57,11 +57,11 @@ class LoginScreen(Screen):
         bottom_section.add_widget(self.error_label)
 
         # Buttons
-        login_btn = Button(
+        self.login_btn = Button(
             text="Login",
             size_hint=(1, 0.2)
         )
-        login_btn.bind(on_press=self.login)
+        self.login_btn.bind(on_press=self.login)
 
         back_btn = Button(
             text="Back",
@@ -69,7 +69,7 @@ class LoginScreen(Screen):
         )
         back_btn.bind(on_press=self.back_to_menu)
 
-        bottom_section.add_widget(login_btn)
+        bottom_section.add_widget(self.login_btn)
         bottom_section.add_widget(back_btn)
 
         # Add bottom section to main layout
@@ -81,15 +81,26 @@ class LoginScreen(Screen):
         email = self.email_input.text.strip()
         password = self.password_input.text.strip()
         
-        try:
-            token = self.magic_client.login(email, password)
-            app = App.get_running_app()
-            app.auth_token = token
-            app.token_manager.save_token(token)
-            self.error_label.text = ""
-            self.manager.current = "library_select"
-        except Exception as e:
-            self.error_label.text = f"Login failed: {str(e)}"
+        # Run the RPC in the background so the UI stays responsive
+        self.login_btn.disabled = True
+        self.error_label.text = ""
+        App.get_running_app().bridge.submit(
+            self.async_client.login(email, password),
+            on_success=self.on_login_success,
+            on_error=self.on_login_error,
+        )
+
+    def on_login_success(self, token):
+        self.login_btn.disabled = False
+        app = App.get_running_app()
+        app.set_auth_token(token)
+        app.token_manager.save_token(token)
+        self.error_label.text = ""
+        self.manager.current = "library_select"
+
+    def on_login_error(self, error):
+        self.login_btn.disabled = False
+        self.error_label.text = f"Login failed: {str(error)}"
 
     def back_to_menu(self, *args):
         self.manager.current = "menu"
\ No newline at end of file
@@ -1,4 +1,5 @@
 import grpc
+from .channel import CHANNEL_OPTIONS, LatencyInterceptor, RpcMetrics
 from . import user_pb2
 from . import user_pb2_grpc
 from . import library_pb2
@@ -15,12 +16,22 @@ class MagicClient:
             host (str): The server host. Defaults to localhost.
             port (int): The server port. Defaults to 50051.
         """
-        self.channel = grpc.insecure_channel(f"{host}:{port}")
+        self._raw_channel = grpc.insecure_channel(f"{host}:{port}", options=CHANNEL_OPTIONS)
+        self.metrics = RpcMetrics()
+        self.channel = grpc.intercept_channel(self._raw_channel, LatencyInterceptor(self.metrics))
         self.user_stub = user_pb2_grpc.UserServiceStub(self.channel)
         self.library_stub = library_pb2_grpc.LibraryServiceStub(self.channel)
         self.cards_stub = cards_pb2_grpc.CardServiceStub(self.channel)
         self._auth_token = None
 
+    def warm_up(self):
+        """Start connecting in the background so the first RPC doesn't pay for connection setup.
+
+        Returns:
+            grpc.Future: Resolves once the channel is ready. Call `.result(timeout)` to wait on it.
+        """
+        return grpc.channel_ready_future(self._raw_channel)
+
     def _get_auth_metadata(self):
         """Create metadata with authentication token."""
         return [('authorization', f'{self._auth_token}')] if self._auth_token else []
@@ -43,14 +54,14 @@ class MagicClient:
         self._auth_token = response.token
         return response.token
 
-    def create_library(self, name: str) -> str:
+    def create_library(self, name: str) -> int:
         """Create a new card library.
 
         Args:
             name (str): Name of the library
 
         Returns:
-            str: ID of the created library
+            int: ID of the created library
 
         Raises:
             grpc.RpcError: If creation fails
@@ -58,7 +69,7 @@ class MagicClient:
         metadata = self._get_auth_metadata()
         request = library_pb2.CreateLibraryRequest(name=name)
         response = self.library_stub.CreateLibrary(request, metadata=metadata)
-        return response.library_id
+        return response.id
 
     def get_libraries(self):
         """Get all libraries for the authenticated user.
@@ -93,49 +104,63 @@ class MagicClient:
         response = self.cards_stub.ScanCard(request, metadata=metadata)
         return response.card
 
-    def add_card_to_library(self, library_id: str, card_id: str, quantity: int = 1):
-        """Add a card to a library.
+    def create_card(self, library_id: int, name: str, set_name: str, collector_number: str,
+                    foil: bool = False, language: str = "EN", usd_price: int = 0):
+        """Add one copy of a printing to a library.
+
+        The backend keeps one row per printing, foil and language; creating a
+        printing the library already holds bumps that row's quantity by one.
 
         Args:
-            library_id (str): ID of the library
-            card_id (str): ID of the card
-            quantity (int): Number of copies to add. Defaults to 1.
+            library_id (int): ID of the library
+            name (str): Card name
+            set_name (str): Set code, e.g. 'fin'
+            collector_number (str): Collector number, e.g. '210'
+            foil (bool): Whether the copy is foil. Defaults to False.
+            language (str): Language code, e.g. 'EN'. Defaults to 'EN'.
+            usd_price (int): Price in USD cents when added. Defaults to 0.
+
+        Returns:
+            The library's card row after the add
 
         Raises:
             grpc.RpcError: If operation fails
         """
         metadata = self._get_auth_metadata()
-        request = library_pb2.AddCardRequest(
+        request = cards_pb2.CreateCardRequest(
             library_id=library_id,
-            card_id=card_id,
-            quantity=quantity
+            name=name,
+            set_name=set_name,
+            collector_number=collector_number,
+            foil=foil,
+            language=language,
+            usd_price=usd_price,
         )
-        self.library_stub.AddCard(request, metadata=metadata)
+        response = self.cards_stub.CreateCard(request, metadata=metadata)
+        return response.card
 
-    def remove_card_from_library(self, library_id: str, card_id: str, quantity: int = 1):
-        """Remove a card from a library.
+    def get_library(self, library_id: int):
+        """Get a single library, including its card count and total value.
 
         Args:
-            library_id (str): ID of the library
-            card_id (str): ID of the card
-            quantity (int): Number of copies to remove. Defaults to 1.
+            library_id (int): ID of the library
+
+        Returns:
+            The library
 
         Raises:
-            grpc.RpcError: If operation fails
+            grpc.RpcError: If request fails
         """
         metadata = self._get_auth_metadata()
-        request = library_pb2.RemoveCardRequest(
-            library_id=library_id,
-            card_id=card_id,
-            quantity=quantity
-        )
-        self.library_stub.RemoveCard(request, metadata=metadata)
+        request = library_pb2.GetLibraryRequest(library_id=library_id)
+        response = self.library_stub.GetLibrary(request, metadata=metadata)
+        return response.library
 
-    def get_library_cards(self, library_id: str):
+    def get_library_cards(self, library_id: int):
         """Get all cards in a library.
 
         Args:
-            library_id (str): ID of the library
+            library_id (int): ID of the library
 
         Returns:
             List of cards with quantities
@@ -145,8 +170,8 @@ class MagicClient:
         """
         metadata = self._get_auth_metadata()
 
-        request = library_pb2.GetLibraryCardsRequest(library_id=library_id)
-        response = self.library_stub.GetLibraryCards(request, metadata=metadata)
+        request = cards_pb2.GetCardsRequest(library_id=library_id)
+        response = self.cards_stub.GetCards(request, metadata=metadata)
         return response.cards
 
     def close(self):
@@ -0,0 +1,162 @@
+import asyncio
+
+import grpc
+from .channel import CHANNEL_OPTIONS, AsyncLatencyInterceptor, RpcMetrics
+from . import user_pb2
+from . import user_pb2_grpc
+from . import library_pb2
+from . import library_pb2_grpc
+from . import cards_pb2
+from . import cards_pb2_grpc
+
+
+class AsyncMagicClient:
+    """Non-blocking counterpart to MagicClient, built on grpc.aio.
+
+    All methods are coroutines and must be awaited on a single event loop,
+    normally the one owned by an AsyncBridge. The channel is created lazily
+    on first use so that it binds to that loop rather than the caller's thread.
+    """
+
+    def __init__(self, host="localhost", port=50051):
+        """Initialize the async Magic client.
+
+        Args:
+            host (str): The server host. Defaults to localhost.
+            port (int): The server port. Defaults to 50051.
+        """
+        self.target = f"{host}:{port}"
+        self.channel = None
+        self.user_stub = None
+        self.library_stub = None
+        self.cards_stub = None
+        self._auth_token = None
+        self.metrics = RpcMetrics()
+
+    def _ensure_channel(self):
+        """Open the channel and stubs on the running event loop if needed."""
+        if self.channel is None:
+            self.channel = grpc.aio.insecure_channel(
+                self.target, options=CHANNEL_OPTIONS,
+                interceptors=[AsyncLatencyInterceptor(self.metrics)])
+            self.user_stub = user_pb2_grpc.UserServiceStub(self.channel)
+            self.library_stub = library_pb2_grpc.LibraryServiceStub(self.channel)
+            self.cards_stub = cards_pb2_grpc.CardServiceStub(self.channel)
+
+    async def warm_up(self, timeout: float = 10.0):
+        """Connect the channel ahead of the first RPC.
+
+        Raises:
+            asyncio.TimeoutError: If the backend isn't reachable within `timeout` seconds
+        """
+        self._ensure_channel()
+        await asyncio.wait_for(self.channel.channel_ready(), timeout)
+
+    def _get_auth_metadata(self):
+        """Create metadata with authentication token."""
+        return [('authorization', f'{self._auth_token}')] if self._auth_token else []
+
+    async def login(self, email: str, password: str) -> str:
+        """Login with email and password.
+
+        Args:
+            email (str): User's email
+            password (str): User's password
+
+        Returns:
+            str: Authentication token
+
+        Raises:
+            grpc.RpcError: If login fails
+        """
+        self._ensure_channel()
+        request = user_pb2.LoginRequest(email=email, password=password)
+        response = await self.user_stub.Login(request)
+        self._auth_token = response.token
+        return response.token
+
+    async def create_library(self, name: str) -> int:
+        """Create a new card library.
+
+        Args:
+            name (str): Name of the library
+
+        Returns:
+            int: ID of the created library
+
+        Raises:
+            grpc.RpcError: If creation fails
+        """
+        self._ensure_channel()
+        request = library_pb2.CreateLibraryRequest(name=name)
+        response = await self.library_stub.CreateLibrary(request, metadata=self._get_auth_metadata())
+        return response.id
+
+    async def get_libraries(self):
+        """Get all libraries for the authenticated user.
+
+        Returns:
+            List of libraries
+
+        Raises:
+            grpc.RpcError: If request fails
+        """
+        self._ensure_channel()
+        request = library_pb2.GetLibrariesRequest()
+        response = await self.library_stub.GetLibraries(request, metadata=self._get_auth_metadata())
+        return response.libraries
+
+    async def get_library_cards(self, library_id: int):
+        """Get all cards in a library.
+
+        Args:
+            library_id (int): ID of the library
+
+        Returns:
+            List of cards with quantities
+
+        Raises:
+            grpc.RpcError: If request fails
+        """
+        self._ensure_channel()
+        request = cards_pb2.GetCardsRequest(library_id=library_id)
+        response = await self.cards_stub.GetCards(request, metadata=self._get_auth_metadata())
+        return response.cards
+
+    async def create_card(self, library_id: int, name: str, set_name: str, collector_number: str,
+                          foil: bool = False, language: str = "EN", usd_price: int = 0):
+        """Add one copy of a printing to a library.
+
+        Args:
+            library_id (int): ID of the library
+            name (str): Card name
+            set_name (str): Set code, e.g. 'fin'
+            collector_number (str): Collector number, e.g. '210'
+            foil (bool): Whether the copy is foil. Defaults to False.
+            language (str): Language code, e.g. 'EN'. Defaults to 'EN'.
+            usd_price (int): Price in USD cents when added. Defaults to 0.
+
+        Returns:
+            The library's card row after the add
+
+        Raises:
+            grpc.RpcError: If operation fails
+        """
+        self._ensure_channel()
+        request = cards_pb2.CreateCardRequest(
+            library_id=library_id,
+            name=name,
+            set_name=set_name,
+            collector_number=collector_number,
+            foil=foil,
+            language=language,
+            usd_price=usd_price,
+        )
+        response = await self.cards_stub.CreateCard(request, metadata=self._get_auth_metadata())
+        return response.card
+
+    async def close(self):
+        """Close the gRPC channel."""
+        if self.channel is not None:
+            await self.channel.close()
+            self.channel = None
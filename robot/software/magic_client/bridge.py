@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def kivy_dispatch(callback: Callable[[], None]):
+    """Run a callback on the Kivy main thread at the next frame."""
+    from kivy.clock import Clock
+    Clock.schedule_once(lambda dt: callback())
+
+
+class AsyncBridge:
+    """Runs coroutines on a background event loop and hands results back to the UI.
+
+    Screens submit a coroutine (usually an AsyncMagicClient call) together with
+    success and error callbacks. The coroutine runs on the bridge's own thread,
+    and the callbacks are delivered through `dispatch`, which defaults to the
+    Kivy Clock so widgets can be updated safely from them.
+    """
+
+    def __init__(self, dispatch: Callable[[Callable[[], None]], None] = kivy_dispatch):
+        self._dispatch = dispatch
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="aio-bridge", daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def start(self):
+        """Start the background event loop."""
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def submit(self, coro: Awaitable[Any],
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None) -> Future:
+        """Schedule a coroutine on the background loop.
+
+        Args:
+            coro: The coroutine to run
+            on_success: Called with the result via `dispatch` if the coroutine returns
+            on_error: Called with the exception via `dispatch` if the coroutine raises
+
+        Returns:
+            concurrent.futures.Future: Resolves to the coroutine's result
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(lambda f: self._deliver(f, on_success, on_error))
+        return future
+
+    def _deliver(self, future: Future, on_success, on_error):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error is not None:
+                self._dispatch(lambda: on_error(error))
+            else:
+                logger.error(f"Unhandled error in background call: {error}")
+        elif on_success is not None:
+            result = future.result()
+            self._dispatch(lambda: on_success(result))
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the background loop and wait for its thread to exit."""
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
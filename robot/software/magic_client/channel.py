@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+from collections import deque
+
+import grpc
+
+# Transient failures are retried by the gRPC runtime itself. Only UNAVAILABLE is
+# retried, since it means the request never reached the backend.
+RETRY_SERVICE_CONFIG = json.dumps({
+    "methodConfig": [{
+        "name": [
+            {"service": "user.v1.UserService"},
+            {"service": "library.v1.LibraryService"},
+            {"service": "card.v1.CardService"},
+        ],
+        "retryPolicy": {
+            "maxAttempts": 4,
+            "initialBackoff": "0.2s",
+            "maxBackoff": "2s",
+            "backoffMultiplier": 2,
+            "retryableStatusCodes": ["UNAVAILABLE"],
+        },
+    }]
+})
+
+MAX_MESSAGE_BYTES = 32 * 1024 * 1024
+
+# The Go backend runs with grpc-go's default keepalive enforcement: clients may
+# ping at most every 5 minutes, and not at all without an active call. A client
+# that pings more often is sent GOAWAY "too_many_pings" and disconnected.
+KEEPALIVE_TIME_MS = 6 * 60 * 1000
+
+# Calls are sent uncompressed. The Go backend registers no gzip codec, so it
+# rejects compressed requests with UNIMPLEMENTED.
+CHANNEL_OPTIONS = [
+    # Notice a connection that died during a call, within what the server permits
+    ("grpc.keepalive_time_ms", KEEPALIVE_TIME_MS),
+    ("grpc.keepalive_timeout_ms", 20000),
+    ("grpc.keepalive_permit_without_calls", 0),
+    ("grpc.enable_retries", 1),
+    ("grpc.service_config", RETRY_SERVICE_CONFIG),
+    # Large libraries come back in a single GetCards response
+    ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+    ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+]
+
+
+def _method_name(method) -> str:
+    return method.decode() if isinstance(method, bytes) else method
+
+
+class RpcMetrics:
+    """Per-method call counts and latencies for a client's RPCs."""
+
+    def __init__(self, window: int = 256):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+        self._errors = {}
+
+    def record(self, method: str, seconds: float, ok: bool):
+        with self._lock:
+            if method not in self._samples:
+                self._samples[method] = deque(maxlen=self.window)
+                self._counts[method] = 0
+                self._errors[method] = 0
+            self._samples[method].append(seconds)
+            self._counts[method] += 1
+            if not ok:
+                self._errors[method] += 1
+
+    def summary(self) -> dict:
+        """Return latency statistics in milliseconds over the most recent calls, per method."""
+        with self._lock:
+            result = {}
+            for method, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[method] = {
+                    'count': self._counts[method],
+                    'errors': self._errors[method],
+                    'mean_ms': 1000 * sum(ordered) / len(ordered),
+                    'p50_ms': 1000 * ordered[len(ordered) // 2],
+                    'p95_ms': 1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                    'max_ms': 1000 * ordered[-1],
+                }
+            return result
+
+
+class LatencyInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Records the latency of every unary call on a blocking channel."""
+
+    def __init__(self, metrics: RpcMetrics):
+        self.metrics = metrics
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = _method_name(client_call_details.method)
+        start = time.perf_counter()
+        outcome = continuation(client_call_details, request)
+        outcome.add_done_callback(
+            lambda f: self.metrics.record(method, time.perf_counter() - start, f.exception() is None))
+        return outcome
+
+
+class AsyncLatencyInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """Records the latency of every unary call on a grpc.aio channel."""
+
+    def __init__(self, metrics: RpcMetrics):
+        self.metrics = metrics
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = _method_name(client_call_details.method)
+        start = time.perf_counter()
+        call = await continuation(client_call_details, request)
+        ok = False
+        try:
+            await call
+            ok = True
+        finally:
+            self.metrics.record(method, time.perf_counter() - start, ok)
+        return call
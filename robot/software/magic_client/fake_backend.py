@@ -0,0 +1,165 @@
+import threading
+import time
+from concurrent import futures
+
+import grpc
+from google.protobuf import empty_pb2
+from google.protobuf.timestamp_pb2 import Timestamp
+
+from . import user_pb2
+from . import user_pb2_grpc
+from . import library_pb2
+from . import library_pb2_grpc
+from . import cards_pb2
+from . import cards_pb2_grpc
+
+
+class FakeBackend:
+    """In-process stand-in for the cardsorter backend.
+
+    Serves the User, Library and Card services from memory on a local port so
+    that clients can be exercised without the Go backend or a database.
+    Every call sleeps for `latency` seconds first, to imitate a remote server.
+
+    Example:
+        backend = FakeBackend()
+        port = backend.start()
+        client = MagicClient(host="localhost", port=port)
+    """
+
+    def __init__(self, email="robot@example.com", password="password", latency: float = 0.0):
+        self.email = email
+        self.password = password
+        self.token = "fake-token"
+        self.latency = latency
+        self.libraries = {}
+        self.cards = {}
+        self.calls = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self, port: int = 0) -> int:
+        """Start serving and return the bound port."""
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        user_pb2_grpc.add_UserServiceServicer_to_server(_UserServicer(self), self._server)
+        library_pb2_grpc.add_LibraryServiceServicer_to_server(_LibraryServicer(self), self._server)
+        cards_pb2_grpc.add_CardServiceServicer_to_server(_CardServicer(self), self._server)
+        port = self._server.add_insecure_port(f"localhost:{port}")
+        self._server.start()
+        return port
+
+    def stop(self):
+        if self._server is not None:
+            self._server.stop(grace=None)
+            self._server = None
+
+    def _new_id(self) -> int:
+        with self._lock:
+            new_id = self._next_id
+            self._next_id += 1
+            return new_id
+
+    def _handle(self, method: str, context):
+        """Common per-call bookkeeping: count the call, apply latency, check auth."""
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        if method != "Login":
+            metadata = dict(context.invocation_metadata())
+            if metadata.get("authorization") != self.token:
+                context.abort(grpc.StatusCode.UNAUTHENTICATED, "missing or invalid token")
+
+    def _library(self, library_id: int, context) -> library_pb2.Library:
+        library = self.libraries.get(library_id)
+        if library is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"library {library_id} not found")
+        cards = [c for c in self.cards.values() if c.library_id == library_id]
+        library.card_count = len(cards)
+        library.total_value = sum(c.usd_price * c.qty for c in cards)
+        return library
+
+
+class _UserServicer(user_pb2_grpc.UserServiceServicer):
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+
+    def Login(self, request, context):
+        self.backend._handle("Login", context)
+        if request.email != self.backend.email or request.password != self.backend.password:
+            context.abort(grpc.StatusCode.UNAUTHENTICATED, "invalid credentials")
+        return user_pb2.LoginResponse(user_id=1, token=self.backend.token)
+
+
+class _LibraryServicer(library_pb2_grpc.LibraryServiceServicer):
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+
+    def CreateLibrary(self, request, context):
+        self.backend._handle("CreateLibrary", context)
+        library_id = self.backend._new_id()
+        self.backend.libraries[library_id] = library_pb2.Library(id=library_id, name=request.name, user_id=1)
+        return library_pb2.CreateLibraryResponse(id=library_id)
+
+    def GetLibraries(self, request, context):
+        self.backend._handle("GetLibraries", context)
+        libraries = [self.backend._library(library_id, context) for library_id in sorted(self.backend.libraries)]
+        return library_pb2.GetLibrariesResponse(libraries=libraries)
+
+    def GetLibrary(self, request, context):
+        self.backend._handle("GetLibrary", context)
+        return library_pb2.GetLibraryResponse(library=self.backend._library(request.library_id, context))
+
+    def DeleteLibrary(self, request, context):
+        self.backend._handle("DeleteLibrary", context)
+        self.backend._library(request.library_id, context)
+        del self.backend.libraries[request.library_id]
+        return empty_pb2.Empty()
+
+
+class _CardServicer(cards_pb2_grpc.CardServiceServicer):
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+
+    def CreateCard(self, request, context):
+        self.backend._handle("CreateCard", context)
+        self.backend._library(request.library_id, context)
+        # Mirrors the backend's ON DUPLICATE KEY UPDATE qty = qty + 1
+        for card in self.backend.cards.values():
+            if (card.library_id, card.set_id, card.collector_number, card.foil, card.language) == \
+                    (request.library_id, request.set_name, request.collector_number, request.foil, request.language):
+                card.qty += 1
+                card.comment = request.comment
+                return cards_pb2.CreateCardResponse(card=card)
+        created_at = Timestamp()
+        created_at.GetCurrentTime()
+        card = cards_pb2.Card(
+            id=self.backend._new_id(), library_id=request.library_id, name=request.name,
+            set_id=request.set_name, condition=request.condition, foil=request.foil,
+            collector_number=request.collector_number, usd_price=request.usd_price, qty=1,
+            comment=request.comment, created_at=created_at, language=request.language or "EN",
+        )
+        self.backend.cards[card.id] = card
+        return cards_pb2.CreateCardResponse(card=card)
+
+    def GetCards(self, request, context):
+        self.backend._handle("GetCards", context)
+        self.backend._library(request.library_id, context)
+        cards = [c for c in self.backend.cards.values() if c.library_id == request.library_id]
+        return cards_pb2.GetCardsResponse(cards=cards)
+
+    def GetCard(self, request, context):
+        self.backend._handle("GetCard", context)
+        card = self.backend.cards.get(request.card_id)
+        if card is None or card.library_id != request.library_id:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"card {request.card_id} not found")
+        return cards_pb2.GetCardResponse(card=card)
+
+    def DeleteCard(self, request, context):
+        self.backend._handle("DeleteCard", context)
+        card = self.backend.cards.get(request.card_id)
+        if card is None or card.library_id != request.library_id:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"card {request.card_id} not found")
+        del self.backend.cards[request.card_id]
+        return empty_pb2.Empty()
@@ -0,0 +1,164 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def printing_key(set_code: str, collector_number: str):
+    """Normalize a printing so OCR results and backend rows compare equal."""
+    return set_code.lower(), collector_number.lstrip('0') or '0'
+
+
+class LibraryCache:
+    """Local mirror of the cards in each library.
+
+    The mirror is persisted in SQLite and also held in memory, so questions like
+    "do I already own this printing?" are answered with a dict lookup and no
+    network access.
+
+    The backend can't return only the rows changed since a given time, so each
+    library instead stores a cheap version cursor: the card count and total
+    value reported by GetLibrary. `sync` re-downloads the card list only when
+    that cursor changes or the mirror is older than `max_age` seconds.
+
+    The cursor can't see every change. The card count counts distinct
+    printings, so another copy of a printing the library already holds only
+    moves the total value, and not even that for a card with no price. Such
+    changes made elsewhere show up once the mirror reaches `max_age`, so
+    `max_age` is the longest the mirror can be stale by.
+
+    Cards queued locally can be recorded with `record_added` so the mirror
+    stays current between syncs. Given the outbox they were queued in, `sync`
+    counts the copies it hasn't sent yet on top of the downloaded list, so a
+    sync doesn't forget them.
+    """
+
+    def __init__(self, client, db_path: str = None, max_age: float = 300.0, outbox=None):
+        """Initialize the cache.
+
+        Args:
+            client: A MagicClient used to fetch library contents
+            db_path (str): SQLite file for the mirror. Defaults to ~/.cardsorter/library_cache.sqlite3
+            max_age (float): Seconds after which a full refresh is forced even if the cursor is unchanged
+            outbox: LibraryOutbox whose unsent cards are counted as owned after a sync
+        """
+        if db_path is None:
+            db_path = str(Path.home() / '.cardsorter' / 'library_cache.sqlite3')
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+        self.client = client
+        self.max_age = max_age
+        self.outbox = outbox
+        self._lock = threading.Lock()
+        # (library_id, set_code, collector_number, foil) -> quantity
+        self._owned = {}
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript('''
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS library_cards
+            (
+                library_id       INTEGER NOT NULL,
+                card_id          INTEGER NOT NULL,
+                name             TEXT,
+                set_code         TEXT    NOT NULL,
+                collector_number TEXT    NOT NULL,
+                foil             INTEGER NOT NULL,
+                language         TEXT,
+                qty              INTEGER NOT NULL,
+                PRIMARY KEY (library_id, card_id)
+            );
+            CREATE TABLE IF NOT EXISTS sync_state
+            (
+                library_id  INTEGER PRIMARY KEY,
+                card_count  INTEGER NOT NULL,
+                total_value INTEGER NOT NULL,
+                synced_at   REAL    NOT NULL
+            );
+            ''')
+        for library_id, set_code, collector_number, foil, qty in self.conn.execute(
+                "SELECT library_id, set_code, collector_number, foil, qty FROM library_cards"):
+            key = (library_id,) + printing_key(set_code, collector_number) + (bool(foil),)
+            self._owned[key] = self._owned.get(key, 0) + qty
+
+    def sync(self, library_id: int, force: bool = False) -> bool:
+        """Bring the mirror of one library up to date with the backend.
+
+        Args:
+            library_id (int): ID of the library
+            force (bool): Download the card list even if the cursor is unchanged
+
+        Returns:
+            bool: True if the card list was downloaded, False if the mirror was already current
+
+        Raises:
+            grpc.RpcError: If a request fails
+        """
+        library = self.client.get_library(library_id)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT card_count, total_value, synced_at FROM sync_state WHERE library_id = ?",
+                (library_id,)).fetchone()
+        if not force and row is not None:
+            card_count, total_value, synced_at = row
+            fresh = time.time() - synced_at < self.max_age
+            if fresh and (card_count, total_value) == (library.card_count, library.total_value):
+                logger.debug(f"Library {library_id} unchanged since last sync")
+                return False
+
+        cards = self.client.get_library_cards(library_id)
+        rows = [(library_id, c.id, c.name, c.set_id, c.collector_number, int(c.foil), c.language, c.qty)
+                for c in cards]
+        # Read after the download: a card sent in between is missed until the next sync, never counted twice
+        unsent = self.outbox.pending() if self.outbox is not None else []
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM library_cards WHERE library_id = ?", (library_id,))
+                self.conn.executemany('''
+                    INSERT INTO library_cards
+                        (library_id, card_id, name, set_code, collector_number, foil, language, qty)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', rows)
+                self.conn.execute('''
+                    INSERT OR REPLACE INTO sync_state (library_id, card_count, total_value, synced_at)
+                    VALUES (?, ?, ?, ?)''', (library_id, library.card_count, library.total_value, time.time()))
+
+            owned = {key: qty for key, qty in self._owned.items() if key[0] != library_id}
+            for _, _, _, set_code, collector_number, foil, _, qty in rows:
+                key = (library_id,) + printing_key(set_code, collector_number) + (bool(foil),)
+                owned[key] = owned.get(key, 0) + qty
+            for pending_library, set_code, collector_number, foil, quantity in unsent:
+                if pending_library == library_id:
+                    key = (library_id,) + printing_key(set_code, collector_number) + (foil,)
+                    owned[key] = owned.get(key, 0) + quantity
+            self._owned = owned
+        logger.info(f"Synced {len(rows)} cards for library {library_id}")
+        return True
+
+    def owned_quantity(self, library_id: int, set_code: str, collector_number: str, foil: bool = None) -> int:
+        """Return how many copies of a printing the library holds.
+
+        Args:
+            library_id (int): ID of the library
+            set_code (str): Set code, e.g. 'fin'
+            collector_number (str): Collector number, e.g. '0210' or '210'
+            foil (bool): Count only foil or non-foil copies. None counts both.
+        """
+        key = (library_id,) + printing_key(set_code, collector_number)
+        if foil is None:
+            return self._owned.get(key + (False,), 0) + self._owned.get(key + (True,), 0)
+        return self._owned.get(key + (foil,), 0)
+
+    def record_added(self, library_id: int, set_code: str, collector_number: str,
+                     foil: bool = False, quantity: int = 1):
+        """Count locally queued copies before the backend reflects them."""
+        key = (library_id,) + printing_key(set_code, collector_number) + (foil,)
+        with self._lock:
+            self._owned[key] = self._owned.get(key, 0) + quantity
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,249 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import tracing
+from scryfall.prices import price_to_cents
+
+logger = logging.getLogger(__name__)
+
+
+class LibraryOutbox:
+    """Durable write-behind queue for cards being added to libraries.
+
+    Cards are committed to a local SQLite file before `add` returns, so a
+    crash never loses a card. Each row holds everything CreateCard needs and
+    is keyed by (library, printing, foil, language): adding the same printing
+    repeatedly just bumps its quantity. A background thread sends each row as
+    one CreateCard call per copy, since the backend adds one copy per call.
+    Failed rows are retried with capped exponential backoff.
+
+    The backend has no RPC to take away a single copy, so the outbox only adds.
+    """
+
+    def __init__(self, client, db_path: str = None, batch_size: int = 50,
+                 flush_interval: float = 1.0, retry_base: float = 1.0, retry_max: float = 60.0):
+        """Initialize the outbox.
+
+        Args:
+            client: A MagicClient used to send operations to the backend
+            db_path (str): SQLite file to persist pending operations in.
+                Defaults to ~/.cardsorter/outbox.sqlite3
+            batch_size (int): Maximum number of rows sent per flush
+            flush_interval (float): Seconds between background flushes
+            retry_base (float): Initial retry delay for a failed row, in seconds
+            retry_max (float): Upper bound on the retry delay, in seconds
+        """
+        if db_path is None:
+            db_path = str(Path.home() / '.cardsorter' / 'outbox.sqlite3')
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.sent_ops = 0
+        self.failed_ops = 0
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        # FULL so an enqueued card survives power loss, not just a process crash
+        self.conn.execute("PRAGMA synchronous = FULL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS pending_cards
+            (
+                library_id       INTEGER NOT NULL,
+                set_code         TEXT    NOT NULL,
+                collector_number TEXT    NOT NULL,
+                foil             INTEGER NOT NULL,
+                language         TEXT    NOT NULL,
+                name             TEXT    NOT NULL,
+                usd_price        INTEGER NOT NULL,
+                quantity         INTEGER NOT NULL,
+                attempts         INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at  REAL    NOT NULL DEFAULT 0,
+                queued_at        REAL    NOT NULL,
+                trace_card       INTEGER,
+                PRIMARY KEY (library_id, set_code, collector_number, foil, language)
+            )''')
+        self._migrate_db()
+        self._warn_about_legacy_rows()
+
+    def _migrate_db(self):
+        # Outboxes created before tracing have no trace_card column
+        columns = [column[1] for column in self.conn.execute("PRAGMA table_info(pending_cards)")]
+        if 'trace_card' not in columns:
+            self.conn.execute("ALTER TABLE pending_cards ADD COLUMN trace_card INTEGER")
+
+    def _warn_about_legacy_rows(self):
+        # Earlier versions queued only the Scryfall id, which CreateCard can't use
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'pending_ops'").fetchone():
+            count = self.conn.execute("SELECT COUNT(*) FROM pending_ops").fetchone()[0]
+            if count:
+                logger.warning(f"{count} queued card changes in the old pending_ops table can't be sent; "
+                               f"they are kept there for reference")
+
+    def add(self, library_id, card: dict, quantity: int = 1, foil: bool = False):
+        """Queue copies of a card to be added to a library.
+
+        The card being traced on this thread (tracing.current_card(), e.g. the
+        pipeline index) is kept with the row, so the RPCs that later send it
+        are traced as part of that card.
+
+        Args:
+            library_id: ID of the library
+            card (dict): Scryfall card, e.g. from CardScanner.cards_db
+            quantity (int): Number of copies
+            foil (bool): Whether the copies are foil
+        """
+        prices = card.get('prices') or {}
+        usd_price = price_to_cents(prices.get('usd_foil') if foil else prices.get('usd'))
+        if usd_price is None and foil:
+            usd_price = price_to_cents(prices.get('usd'))
+        row = (library_id, card['set'], card['collector_number'], int(foil), (card.get('lang') or 'en').upper(),
+               card['name'], usd_price or 0, quantity, time.time(), tracing.current_card())
+
+        with tracing.span("outbox.enqueue", scryfall_id=card.get('id')), self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute('''
+                INSERT INTO pending_cards
+                    (library_id, set_code, collector_number, foil, language, name, usd_price, quantity, queued_at,
+                     trace_card)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (library_id, set_code, collector_number, foil, language)
+                DO UPDATE SET quantity = quantity + excluded.quantity, trace_card = excluded.trace_card''', row)
+            self.conn.execute("COMMIT")
+            pending = self._pending_count()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def _pending_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM pending_cards").fetchone()[0]
+
+    def pending(self) -> List[Tuple[int, str, str, bool, int]]:
+        """Return the queued (library_id, set_code, collector_number, foil, quantity) rows, oldest first."""
+        with self._lock:
+            return [(library_id, set_code, collector_number, bool(foil), quantity)
+                    for library_id, set_code, collector_number, foil, quantity in self.conn.execute('''
+                        SELECT library_id, set_code, collector_number, foil, quantity FROM pending_cards
+                        ORDER BY queued_at''')]
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = self._pending_count()
+        return {
+            'pending': pending,
+            'sent': self.sent_ops,
+            'failed': self.failed_ops,
+            'last_error': self.last_error,
+        }
+
+    def flush(self) -> int:
+        """Send one batch of due rows to the backend.
+
+        Returns:
+            int: Number of rows sent completely
+        """
+        with self._lock:
+            batch = self.conn.execute('''
+                SELECT library_id, set_code, collector_number, foil, language, name, usd_price, quantity, attempts,
+                    trace_card
+                FROM pending_cards
+                WHERE next_attempt_at <= ?
+                ORDER BY queued_at
+                LIMIT ?''', (time.time(), self.batch_size)).fetchall()
+
+        sent = 0
+        for (library_id, set_code, collector_number, foil, language, name, usd_price, quantity, attempts,
+             trace_card) in batch:
+            key = (library_id, set_code, collector_number, foil, language)
+            copies = 0
+            try:
+                # Several queued copies share a row; it is traced as the card queued last
+                with tracing.card(trace_card), tracing.span("backend.rpc", printing=f"{set_code}-{collector_number}",
+                                                            quantity=quantity):
+                    while copies < quantity:
+                        self.client.create_card(library_id, name, set_code, collector_number,
+                                                foil=bool(foil), language=language, usd_price=usd_price)
+                        copies += 1
+            except Exception as e:
+                if copies:
+                    self._record_success(key, copies, complete=False)
+                self._record_failure(key, attempts, e)
+                continue
+            self._record_success(key, copies)
+            sent += 1
+        return sent
+
+    def _record_success(self, key: tuple, quantity: int, complete: bool = True):
+        # Subtract only what was sent: more copies may have been queued meanwhile.
+        # A row that failed partway keeps its attempt count, so its backoff still grows.
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute('''
+                UPDATE pending_cards SET quantity = quantity - ?,
+                    attempts = CASE WHEN ? THEN 0 ELSE attempts END,
+                    next_attempt_at = CASE WHEN ? THEN 0 ELSE next_attempt_at END
+                WHERE library_id = ? AND set_code = ? AND collector_number = ? AND foil = ? AND language = ?''',
+                (quantity, complete, complete) + key)
+            self.conn.execute('''
+                DELETE FROM pending_cards
+                WHERE library_id = ? AND set_code = ? AND collector_number = ? AND foil = ? AND language = ?
+                    AND quantity <= 0''', key)
+            self.conn.execute("COMMIT")
+            self.sent_ops += quantity
+
+    def _record_failure(self, key: tuple, attempts: int, error: Exception):
+        library_id, set_code, collector_number = key[:3]
+        delay = min(self.retry_base * (2 ** attempts), self.retry_max)
+        logger.warning(f"Failed to sync card {set_code} #{collector_number} to library {library_id} "
+                       f"(attempt {attempts + 1}), retrying in {delay:.1f}s: {error}")
+        with self._lock:
+            self.conn.execute('''
+                UPDATE pending_cards SET attempts = attempts + 1, next_attempt_at = ?
+                WHERE library_id = ? AND set_code = ? AND collector_number = ? AND foil = ? AND language = ?''',
+                (time.time() + delay,) + key)
+            self.failed_ops += 1
+            self.last_error = str(error)
+
+    def start(self):
+        """Start flushing in the background."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="library-outbox", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                # Keep going while full batches are being sent successfully
+                while self.flush() >= self.batch_size and not self._stopping.is_set():
+                    pass
+            except Exception as e:
+                logger.error(f"Outbox flush failed: {e}")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread. Unsent operations stay on disk for the next run."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self.conn.close()
@@ -1,3 +1,12 @@
+import startup
+
+# CARDSORTER_PROFILE_STARTUP=1 times every import from here on
+startup.profile_from_env()
+
+# Start reading the card catalogue and starting OCR before Kivy and the screens load
+from scanner.service import shared_service
+shared_service()
+
 from app import CardSorterApp
 
 # This is in a separate file so that the AI helper stops
@@ -1,15 +1,28 @@
 import cv2
 import numpy as np
-from PIL import Image
 import pytesseract
 import json
 import os
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Sequence, Tuple
+import tracing
+from vision.detection import CardDetector
+from vision.geometry import warp_card
 from .util import card_key
 
 class CardScanner:
-    def __init__(self, cards_path: str = None):
-        """Initialize the card scanner with a path to the cards database."""
+    def __init__(self, cards_path: str = None, detection_scales: Sequence[float] = (0.25, 0.5),
+                 min_detection_width: int = 320):
+        """Initialize the card scanner with a path to the cards database.
+
+        Args:
+            cards_path: Path to cards.json. Defaults to the one next to this module.
+            detection_scales: Downscale factors to search for the card at, coarsest first.
+                Corners found at a reduced scale are refined on the full-resolution image.
+            min_detection_width: Scales that would shrink the image below this width are skipped
+        """
+        # Reuses its buffers between calls, so detect_card should not be called from two threads at once
+        self.detector = CardDetector(scales=detection_scales, min_detection_width=min_detection_width)
+
         if cards_path is None:
             current_dir = os.path.dirname(os.path.abspath(__file__))
             cards_path = os.path.join(current_dir, 'cards.json')
@@ -29,130 +42,70 @@ class CardScanner:
         custom_config = r'--oem 3 --psm 6'
         pytesseract.pytesseract.config = custom_config
 
+    def warm_up(self):
+        """Run OCR and card detection once on blank images.
+
+        The first Tesseract run pays for loading the binary and its language
+        data from disk; doing it here keeps that off the first real card.
+
+        Raises:
+            pytesseract.TesseractNotFoundError: If Tesseract is not installed
+        """
+        blank = np.full((64, 320), 255, dtype=np.uint8)
+        pytesseract.image_to_string(blank, config=r'--oem 3 --psm 6')
+        self.detector.find_corners(np.zeros((480, 640), dtype=np.uint8))
+
     def find_card_contour(self, image_array: np.ndarray) -> Optional[np.ndarray]:
         """Find the contour of the card in the image.
+
+        Detection runs coarse-to-fine; see vision.detection.CardDetector.
         
         Args:
-            image_array: numpy array of the image
+            image_array: numpy array of the image, RGB or grayscale
             
         Returns:
-            numpy array of contour points or None if no card found
+            numpy array of the four ordered corner points or None if no card found
         """
-        # Convert to grayscale if needed
-        if len(image_array.shape) == 3:
-            gray = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = image_array
-
-        # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-        # Apply adaptive thresholding
-        thresh = cv2.adaptiveThreshold(
-            blurred, 255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY_INV,
-            11, 2
-        )
-
-        # Find contours
-        contours, _ = cv2.findContours(
-            thresh,
-            cv2.RETR_EXTERNAL,
-            cv2.CHAIN_APPROX_SIMPLE
-        )
-
-        if not contours:
-            return None
-
-        # Find the largest contour by area
-        largest_contour = max(contours, key=cv2.contourArea)
-        
-        # Check if the contour is large enough (at least 10% of image area)
-        image_area = gray.shape[0] * gray.shape[1]
-        contour_area = cv2.contourArea(largest_contour)
-        if contour_area < (image_area * 0.1):
-            return None
-
-        # Approximate the contour to a polygon
-        epsilon = 0.02 * cv2.arcLength(largest_contour, True)
-        approx = cv2.approxPolyDP(largest_contour, epsilon, True)
-
-        # Check if the polygon has 4 points (rectangle)
-        if len(approx) == 4:
-            return approx
-        return None
-
-    def order_points(self, points: np.ndarray) -> np.ndarray:
-        """Order points in clockwise order starting from top-left."""
-        rect = np.zeros((4, 2), dtype=np.float32)
-
-        # Find top-left and bottom-right
-        s = points.sum(axis=1)
-        rect[0] = points[np.argmin(s)]  # Top-left
-        rect[2] = points[np.argmax(s)]  # Bottom-right
-
-        # Find top-right and bottom-left
-        diff = np.diff(points, axis=1)
-        rect[1] = points[np.argmin(diff)]  # Top-right
-        rect[3] = points[np.argmax(diff)]  # Bottom-left
-
-        return rect
-
-    def four_point_transform(self, image: np.ndarray, pts: np.ndarray) -> np.ndarray:
-        """Apply perspective transform to obtain a top-down view of the card."""
-        rect = self.order_points(pts.reshape(4, 2))
-        
-        # Magic card dimensions (63mm x 88mm)
-        width = 640  # Scaled dimensions while maintaining aspect ratio
-        height = int(width * (88/63))
-        
-        dst = np.array([
-            [0, 0],
-            [width - 1, 0],
-            [width - 1, height - 1],
-            [0, height - 1]
-        ], dtype=np.float32)
-
-        # Calculate perspective transform matrix
-        M = cv2.getPerspectiveTransform(rect, dst)
-        
-        # Apply perspective transformation
-        warped = cv2.warpPerspective(image, M, (width, height))
-        
-        return warped
+        return self.detector.find_corners(self.detector.gray(image_array))
 
-    def preprocess_image(self, image: Image.Image) -> Image.Image:
+    def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Preprocess the image for better OCR results.
         
         Args:
-            image: PIL Image to preprocess
+            image: RGB numpy array to preprocess. PIL Images are accepted too.
             
         Returns:
-            Preprocessed PIL Image
+            Preprocessed grayscale numpy array
         """
-        # Convert PIL Image to OpenCV format
-        cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        # The only colour conversion; everything after works on grayscale
+        gray = self.detector.gray(np.asarray(image))
         
-        # Rotate image 90 degrees clockwise
-        cv_image = cv2.rotate(cv_image, cv2.ROTATE_90_CLOCKWISE)
+        # Find card corners in the camera's orientation
+        with tracing.span("scanner.detect"):
+            corners = self.detector.find_corners(gray)
         
-        # Find card contour
-        contour = self.find_card_contour(cv_image)
-        
-        if contour is not None:
-            # Apply perspective transform to get straight card
-            warped = self.four_point_transform(cv_image, contour)
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(warped, cv2.COLOR_BGR2GRAY)
+        if corners is not None:
+            # Warp the card straight and upright, turning it 90 degrees clockwise in the same step
+            with tracing.span("scanner.warp"):
+                warped = warp_card(gray, corners, rotate=3)
             
             # Save the full card detection result
             cv2.imwrite('card_detected.jpg', warped)
         else:
-            # If no contour found, just convert rotated image to grayscale
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+            # If no card found, just rotate the whole frame 90 degrees clockwise
+            warped = cv2.rotate(gray, cv2.ROTATE_90_CLOCKWISE)
 
+        return self.collector_region(warped)
+
+    def collector_region(self, gray: np.ndarray) -> np.ndarray:
+        """Crop and enhance the collector info in the bottom-left corner of an upright card.
+
+        Args:
+            gray: Grayscale image of the card, upright
+
+        Returns:
+            Preprocessed grayscale numpy array ready for OCR
+        """
         cv2.imwrite('grayscale.jpg', gray)
         # Get dimensions for bottom-left crop
         height, width = gray.shape
@@ -165,27 +118,40 @@ class CardScanner:
         # Save the cropped corner for debugging
         cv2.imwrite('cropped_bottom_left.jpg', cropped)
         
-        # Convert back to PIL Image
-        image = Image.fromarray(cropped)
-        
-        # Increase contrast
-        from PIL import ImageEnhance
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(2.0)
+        # Double the contrast around the mean, as PIL's ImageEnhance.Contrast(2.0) did
+        factor = 2.0
+        mean = int(cv2.mean(cropped)[0] + 0.5)
+        image = cv2.addWeighted(cropped, factor, cropped, 0, mean * (1 - factor))
         
         # Save final preprocessed result
-        image.save('preprocessed.jpg')
+        cv2.imwrite('preprocessed.jpg', image)
 
         return image
 
-    def detect_card(self, image: Image.Image) -> Tuple[Optional[Dict[str, Any]], float]:
-        """Detect a Magic: The Gathering card in the image."""
+    def detect_card(self, image: np.ndarray) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Detect a Magic: The Gathering card in the image.
+
+        Args:
+            image: RGB numpy array of the camera frame. PIL Images are accepted too.
+        """
         # Preprocess the image
-        processed = self.preprocess_image(image)
-        
+        return self.identify(self.preprocess_image(image))
+
+    def detect_warped_card(self, card: np.ndarray) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Detect a card that has already been located and warped upright, e.g. by vision.geometry.warp_card.
+
+        Args:
+            card: Upright card image as an RGB or grayscale numpy array
+        """
+        gray = cv2.cvtColor(card, cv2.COLOR_RGB2GRAY) if card.ndim == 3 else card
+        return self.identify(self.collector_region(gray))
+
+    def identify(self, processed: np.ndarray) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Read the set code and collector number from a preprocessed image and look the card up."""
         # Extract text using OCR with specific configuration for numbers
         config = r'--oem 3 --psm 6'  # Remove character whitelist to see what it detects
-        text = pytesseract.image_to_string(processed, config=config)
+        with tracing.span("scanner.ocr"):
+            text = pytesseract.image_to_string(processed, config=config)
         
         # Clean up the extracted text
         lines = [line.strip() for line in text.split('\n') if line.strip()]
@@ -234,7 +200,8 @@ class CardScanner:
         if set_code and collector_number:
             # Try to find the card in the database
             key = f"{set_code.lower()}-{collector_number}"
-            card_info = self.cards_db.get(key)
+            with tracing.span("scanner.lookup", key=key):
+                card_info = self.cards_db.get(key)
 
             if card_info:
                 confidence = 1.0
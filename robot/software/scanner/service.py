@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from .scanner import CardScanner
+
+logger = logging.getLogger(__name__)
+
+# Stage -> (description, fraction of the load done once the stage finishes)
+LOAD_STAGES = {
+    "libraries": ("Loading OpenCV and Tesseract", 0.2),
+    "catalogue": ("Reading the card catalogue", 0.8),
+    "ocr": ("Starting the OCR engine", 1.0),
+}
+
+
+class ScannerService:
+    """Owns the app's single CardScanner and loads it in the background.
+
+    Building a CardScanner parses the whole cards database and configures
+    Tesseract, so it is done once, on a worker thread, while the operator is
+    still on the login or menu screens. Loading then runs one throwaway OCR
+    and detection pass, so the first real card doesn't pay for starting
+    Tesseract and faulting in its language data.
+
+    Screens check `ready` and use `scanner` once it is; while loading, `stage`,
+    `description` and `progress` say how far it has got.
+
+    Args:
+        cards_path: Path to cards.json. Defaults to the scanner's bundled one.
+        warm_up: Run the throwaway OCR and detection pass after loading
+    """
+
+    def __init__(self, cards_path: str = None, warm_up: bool = True):
+        self.cards_path = cards_path
+        self.warm_up = warm_up
+        self.scanner: Optional["CardScanner"] = None
+        self.error: Optional[Exception] = None
+        self.stage: Optional[str] = None
+        self.description = "Waiting to load"
+        self.progress = 0.0
+        # Stage -> seconds it took
+        self.stage_times: Dict[str, float] = {}
+        self._ready = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start loading the scanner. Calling it again is a no-op."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="scanner-loader", daemon=True)
+                self._thread.start()
+
+    @contextmanager
+    def _stage(self, stage: str):
+        self.stage = stage
+        self.description, done = LOAD_STAGES[stage]
+        start = time.perf_counter()
+        yield
+        self.stage_times[stage] = time.perf_counter() - start
+        self.progress = done
+
+    def _load(self):
+        try:
+            with self._stage("libraries"):
+                # Imported here so that importing the service doesn't pull in OpenCV and Tesseract
+                from .scanner import CardScanner
+            with self._stage("catalogue"):
+                self.scanner = CardScanner(self.cards_path)
+            with self._stage("ocr"):
+                if self.warm_up:
+                    try:
+                        self.scanner.warm_up()
+                    except Exception as e:
+                        # The catalogue is usable; OCR will report the problem when a card is scanned
+                        logger.warning(f"OCR warm-up failed: {e}")
+            self.description = "Ready"
+            logger.info(f"Card scanner ready with {len(self.scanner.cards_db)} cards "
+                        f"({', '.join(f'{s} {t:.2f}s' for s, t in self.stage_times.items())})")
+        except Exception as e:
+            logger.error(f"Failed to load card scanner during {self.stage}: {e}")
+            self.error = e
+            self.description = f"Failed: {e}"
+        finally:
+            self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        """True once loading has finished, successfully or not."""
+        return self._ready.is_set()
+
+    def wait(self, timeout: float = None) -> "CardScanner":
+        """Block until the scanner is loaded and return it.
+
+        Raises:
+            TimeoutError: If loading hasn't finished within `timeout` seconds
+            Exception: The error loading failed with, if any
+        """
+        self.start()
+        if not self._ready.wait(timeout):
+            raise TimeoutError("Card scanner is still loading")
+        if self.error is not None:
+            raise self.error
+        return self.scanner
+
+
+_shared: Optional[ScannerService] = None
+_shared_lock = threading.Lock()
+
+
+def shared_service() -> ScannerService:
+    """The process-wide ScannerService, started on first use.
+
+    Calling this first thing at process start gets the catalogue loading
+    before anything else is imported.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ScannerService()
+            _shared.start()
+        return _shared
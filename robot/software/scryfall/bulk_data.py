@@ -51,6 +51,7 @@ class Card:
         self.name: str = kwargs.get("name", "")
         self.image_uris: Dict[str, str] = kwargs.get("image_uris", {})
         self.faces: List[Face] = kwargs.get("card_faces", [])
+        self.prices: Dict[str, str] = kwargs.get("prices") or {}
 
         # Initialize a default Face if none are given. That means it's a single-faced card.
         if not self.faces:
@@ -1,6 +1,14 @@
 from .bulk_data import Card, Face
+from .prices import PriceIndex, price_to_cents, PRICE_CURRENCIES
 import os
 import sqlite3
+from typing import Optional
+
+# Where cardsync.py builds the database by default
+DEFAULT_DB_PATH = '~/.cardsorter/scryfall/cards.sqlite3'
+
+# Minimum query length the trigram tokenizer can match against.
+TRIGRAM_MIN_LENGTH = 3
 
 class LocalDB:
     def __init__(self, db_path: str):
@@ -10,6 +18,8 @@ class LocalDB:
         self._batch_size = 1000
         self._pending_cards = []
         self._pending_faces = []
+        self._pending_prices = []
+        self._name_tokenizer = None
 
     def open(self):
         if not os.path.exists(self.db_path):
@@ -26,6 +36,11 @@ class LocalDB:
         self.cursor.execute("PRAGMA cache_size = 10000")
         self.cursor.execute("PRAGMA temp_store = MEMORY")
 
+        if self._ensure_name_index():
+            # Databases built before the name index existed get it filled on first open
+            self.rebuild_name_index()
+        self._ensure_prices_table()
+
     def _migrate_db(self):
         """Check if lang column exists and add it if not"""
         try:
@@ -41,6 +56,42 @@ class LocalDB:
         except sqlite3.Error as e:
             print(f"Error during database migration: {e}")
 
+    def _ensure_prices_table(self):
+        """Create the prices table if it doesn't exist yet. Prices are stored in integer cents."""
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS prices
+            (
+                scryfall_id TEXT PRIMARY KEY,
+                usd         INTEGER,
+                usd_foil    INTEGER,
+                eur         INTEGER
+            ) WITHOUT ROWID''')
+        self.conn.commit()
+
+    def _ensure_name_index(self) -> bool:
+        """Create the full-text name index if it doesn't exist yet.
+
+        Prefers the trigram tokenizer, which supports substring and fuzzy matching.
+        Older SQLite builds without it fall back to unicode61 with prefix indexes.
+
+        Returns:
+            True if the index was just created and is still empty
+        """
+        self.cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'card_names'")
+        row = self.cursor.fetchone()
+        if row:
+            self._name_tokenizer = 'trigram' if 'trigram' in row[0] else 'unicode61'
+            return False
+
+        try:
+            self.cursor.execute("CREATE VIRTUAL TABLE card_names USING fts5(name, tokenize='trigram')")
+            self._name_tokenizer = 'trigram'
+        except sqlite3.OperationalError:
+            self.cursor.execute("CREATE VIRTUAL TABLE card_names USING fts5(name, prefix='2 3 4')")
+            self._name_tokenizer = 'unicode61'
+        self.conn.commit()
+        return True
+
     def create_db(self):
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
@@ -100,6 +151,14 @@ class LocalDB:
         if len(self._pending_faces) >= self._batch_size:
             self._flush_faces()
 
+    def add_prices(self, card: Card):
+        self._pending_prices.append((card.id,) + tuple(
+            price_to_cents(card.prices.get(currency)) for currency in PRICE_CURRENCIES
+        ))
+
+        if len(self._pending_prices) >= self._batch_size:
+            self._flush_prices()
+
     def _flush_cards(self):
         if not self._pending_cards:
             return
@@ -118,10 +177,25 @@ class LocalDB:
             VALUES (?, ?, ?, ?, ?)''', self._pending_faces)
         self._pending_faces.clear()
 
+    def _flush_prices(self):
+        if not self._pending_prices:
+            return
+
+        # Only rewrite rows whose prices actually changed since the last bulk update
+        self.cursor.executemany('''
+            INSERT INTO prices (scryfall_id, usd, usd_foil, eur)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (scryfall_id) DO UPDATE SET
+                usd = excluded.usd, usd_foil = excluded.usd_foil, eur = excluded.eur
+            WHERE usd IS NOT excluded.usd OR usd_foil IS NOT excluded.usd_foil OR eur IS NOT excluded.eur''',
+            self._pending_prices)
+        self._pending_prices.clear()
+
     def flush_batches(self):
         """Manually flush all pending batches and commit"""
         self._flush_cards()
         self._flush_faces()
+        self._flush_prices()
         if self.conn:
             self.conn.commit()
 
@@ -179,4 +253,125 @@ class LocalDB:
         self.flush_batches()
         query = '''SELECT id, name, scryfall_id, setid, collector_num, lang FROM cards WHERE lang = ?'''
         self.cursor.execute(query, (lang,))
-        return self.cursor.fetchall()
\ No newline at end of file
+        return self.cursor.fetchall()
+
+    def get_cards_by_name(self, name: str):
+        """Get all printings of a card by its exact name"""
+        self.flush_batches()
+        query = '''SELECT id, name, scryfall_id, setid, collector_num, lang FROM cards WHERE name = ?'''
+        self.cursor.execute(query, (name,))
+        return self.cursor.fetchall()
+
+    def load_price_index(self) -> PriceIndex:
+        """Load every known price into an in-memory PriceIndex for routing"""
+        self.flush_batches()
+        self.cursor.execute('''SELECT scryfall_id, usd, usd_foil, eur FROM prices''')
+        return PriceIndex.from_rows(self.cursor.fetchall())
+
+    def rebuild_name_index(self):
+        """Repopulate the full-text name index from the cards table.
+
+        The index holds one row per distinct name, so it stays small no matter
+        how many printings a card has.
+        """
+        self.flush_batches()
+        self.cursor.execute("DELETE FROM card_names")
+        self.cursor.execute("INSERT INTO card_names (name) SELECT DISTINCT name FROM cards WHERE name IS NOT NULL")
+        self.cursor.execute("INSERT INTO card_names (card_names) VALUES ('optimize')")
+        self.conn.commit()
+
+    def search_cards(self, query: str, limit: int = 10) -> list[str]:
+        """Search card names for the manual-identification fallback.
+
+        Substring matches are returned first, names starting with the query
+        ranked highest. If there are fewer than `limit` of those, the rest is
+        filled with fuzzy matches ranked by how many trigrams they share with
+        the query, so small typos still find the card.
+
+        Args:
+            query: Partial card name as typed by the operator
+            limit: Maximum number of names to return
+
+        Returns:
+            Matching card names, best match first
+        """
+        query = ' '.join(query.split())
+        if not query or limit <= 0:
+            return []
+
+        if self._name_tokenizer != 'trigram' or len(query) < TRIGRAM_MIN_LENGTH:
+            return self._search_names_by_prefix(query, limit)
+
+        self.cursor.execute('''
+            SELECT name FROM card_names
+            WHERE card_names MATCH ?
+            ORDER BY name LIKE ? ESCAPE '\\' DESC, rank, length(name)
+            LIMIT ?''', (_fts_phrase(query), f"{_escape_like(query)}%", limit))
+        names = [row[0] for row in self.cursor.fetchall()]
+        if len(names) >= limit:
+            return names
+
+        trigrams = {query.lower()[i:i + TRIGRAM_MIN_LENGTH] for i in range(len(query) - TRIGRAM_MIN_LENGTH + 1)}
+        if len(trigrams) < 2:
+            return names
+        self.cursor.execute('''
+            SELECT name FROM card_names
+            WHERE card_names MATCH ?
+            ORDER BY rank, length(name)
+            LIMIT ?''', (' OR '.join(_fts_phrase(t) for t in sorted(trigrams)), limit + len(names)))
+        seen = set(names)
+        for (name,) in self.cursor.fetchall():
+            if name not in seen:
+                names.append(name)
+                seen.add(name)
+                if len(names) >= limit:
+                    break
+        return names
+
+    def _search_names_by_prefix(self, query: str, limit: int) -> list[str]:
+        """Prefix search for queries too short for the trigram index."""
+        if self._name_tokenizer == 'trigram':
+            self.cursor.execute('''
+                SELECT name FROM card_names WHERE name LIKE ? ESCAPE '\\'
+                ORDER BY length(name), name LIMIT ?''', (f"{_escape_like(query)}%", limit))
+        else:
+            terms = ' '.join(f"{_fts_phrase(term)}*" for term in query.split())
+            self.cursor.execute('''
+                SELECT name FROM card_names WHERE card_names MATCH ?
+                ORDER BY rank, length(name) LIMIT ?''', (terms, limit))
+        return [row[0] for row in self.cursor.fetchall()]
+
+
+def load_prices(db_path: str = None) -> Optional[PriceIndex]:
+    """Read the price table of a cardsync database into a PriceIndex.
+
+    The database is opened read-only and closed again, so this is safe to
+    call while cardsync is updating it.
+
+    Args:
+        db_path: Path to the database. Defaults to DEFAULT_DB_PATH.
+
+    Returns:
+        PriceIndex, or None if the database or its price table hasn't been built
+    """
+    path = os.path.expanduser(db_path or DEFAULT_DB_PATH)
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT scryfall_id, usd, usd_foil, eur FROM prices").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return PriceIndex.from_rows(rows)
+
+
+def _fts_phrase(text: str) -> str:
+    """Quote text as an FTS5 phrase so punctuation in card names isn't parsed as syntax."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards in user input."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
\ No newline at end of file
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+# Sentinel stored in the price arrays for cards Scryfall has no price for.
+MISSING_PRICE = -1
+
+PRICE_CURRENCIES = ("usd", "usd_foil", "eur")
+
+
+def price_to_cents(value) -> Optional[int]:
+    """Convert a Scryfall price string such as '0.25' to integer cents."""
+    if value is None or value == "":
+        return None
+    try:
+        return int(round(float(value) * 100))
+    except (TypeError, ValueError):
+        return None
+
+
+class PriceIndex:
+    """In-memory price lookup for routing decisions.
+
+    Prices are held in parallel int32 arrays of cents, one slot per card.
+    Resolving a card's slot is a single dict lookup, after which every price
+    is a plain array index; no database, JSON, or network access is needed.
+    """
+
+    def __init__(self, slots: Dict[str, int], usd: np.ndarray, usd_foil: np.ndarray, eur: np.ndarray):
+        self.slots = slots
+        self.usd = usd
+        self.usd_foil = usd_foil
+        self.eur = eur
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, Optional[int], Optional[int], Optional[int]]]) -> "PriceIndex":
+        """Build the index from (scryfall_id, usd, usd_foil, eur) rows of cents."""
+        rows = list(rows)
+        slots = {}
+        prices = np.full((3, len(rows)), MISSING_PRICE, dtype=np.int32)
+        for slot, (scryfall_id, usd, usd_foil, eur) in enumerate(rows):
+            slots[scryfall_id] = slot
+            if usd is not None:
+                prices[0, slot] = usd
+            if usd_foil is not None:
+                prices[1, slot] = usd_foil
+            if eur is not None:
+                prices[2, slot] = eur
+        return cls(slots, prices[0], prices[1], prices[2])
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, scryfall_id: str):
+        return scryfall_id in self.slots
+
+    def slot(self, scryfall_id: str) -> int:
+        """Return the array slot for a card, or -1 if it has no prices."""
+        return self.slots.get(scryfall_id, -1)
+
+    def usd_cents(self, scryfall_id: str, foil: bool = False) -> Optional[int]:
+        """Return the USD price of a card in cents, or None if unknown.
+
+        Foil lookups fall back to the non-foil price when Scryfall has no foil price.
+        """
+        slot = self.slots.get(scryfall_id)
+        if slot is None:
+            return None
+        if foil:
+            price = int(self.usd_foil[slot])
+            if price != MISSING_PRICE:
+                return price
+        price = int(self.usd[slot])
+        return None if price == MISSING_PRICE else price
+
+    def eur_cents(self, scryfall_id: str) -> Optional[int]:
+        """Return the EUR price of a card in cents, or None if unknown."""
+        slot = self.slots.get(scryfall_id)
+        if slot is None:
+            return None
+        price = int(self.eur[slot])
+        return None if price == MISSING_PRICE else price
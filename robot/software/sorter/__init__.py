@@ -0,0 +1,4 @@
+from .pipeline import CardJob, SortPipeline
+from .rules import RoutingTable, Rule, RuleSet, default_rules, load_rules
+
+__all__ = ["CardJob", "SortPipeline", "RoutingTable", "Rule", "RuleSet", "default_rules", "load_rules"]
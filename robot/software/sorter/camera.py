@@ -0,0 +1,130 @@
+from typing import Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+import tracing
+from vision.autocapture import StableCardTrigger
+from vision.detection import CardDetector
+from vision.geometry import scale_quad, warp_card
+from vision.tracking import CornerTracker
+
+
+def open_picamera(resolution=(1640, 1232), lores_size=(640, 480), warm_up: float = 2.0):
+    """Start the Pi camera with a full-resolution main stream and a lores stream for detection."""
+    import time
+    from picamera2 import Picamera2
+
+    picam = Picamera2()
+    config = picam.create_still_configuration(
+        main={"size": resolution, "format": "RGB888"},
+        # Lower resolution stream for preview and card detection. Its luma plane is the grayscale image.
+        lores={"size": lores_size, "format": "YUV420"},
+        display="lores"
+    )
+    picam.configure(config)
+    picam.start()
+    # Give camera time to warm up
+    time.sleep(warm_up)
+    return picam
+
+
+def open_capture(replay: Optional[str] = None, speed: float = 1.0, record: Optional[str] = None):
+    """Open the card camera's frame source.
+
+    Args:
+        replay: Session directory to replay instead of opening the Pi camera
+        speed: Replay speed relative to the recording, 0 for as fast as possible
+        record: Session directory to record the frames to, for replaying later
+
+    Returns:
+        DualStreamCapture, SessionReplay or SessionRecorder; close() it when done
+    """
+    if replay:
+        from vision.session import SessionReplay
+        capture = SessionReplay(replay, speed=speed)
+    else:
+        from vision.frames import DualStreamCapture
+        capture = DualStreamCapture(open_picamera())
+    if record:
+        from vision.session import SessionRecorder
+        capture = SessionRecorder(capture, record)
+    return capture
+
+
+def recognize_capture(scanner, captured: Tuple[np.ndarray, bool]):
+    """Run a CardCamera capture through the scanner. Returns (card_info, confidence)."""
+    image, warped = captured
+    if warped:
+        return scanner.detect_warped_card(image)
+    return scanner.detect_card(image)
+
+
+class CardCamera:
+    """Waits for a card to settle under the camera and captures it at full resolution.
+
+    The card is tracked on the lores stream; a still is only taken once the
+    stability trigger fires, and the trigger re-arms when the card is removed
+    (or the arm lifts it). Only the card region is warped out of the main
+    stream, so detection stays cheap and OCR sees full-resolution pixels.
+
+    Uses its own CardDetector, so it can run on a capture thread alongside
+    recognition.
+
+    Args:
+        capture: DualStreamCapture, or anything with the same read_lores_gray,
+            capture_pair, lores_size and main_size, such as a SessionReplay
+        stable_frames: Frames the card must be still before it is captured
+        rotate: Quarter turns counter-clockwise that make the card upright.
+            The camera is mounted sideways, so the default turns it clockwise.
+        save: Also write each capture to captured.jpg (debug mode)
+    """
+
+    def __init__(self, capture, stable_frames: int = 8, rotate: int = 3, save: bool = False):
+        self.capture = capture
+        self.rotate = rotate
+        self.save = save
+        self.detector = CardDetector()
+        # Full contour searches only seed the tracker or recover a lost track
+        self.tracker = CornerTracker(self.detector.find_corners)
+        self.trigger = StableCardTrigger(stable_frames=stable_frames)
+
+    def capture_card(self, corners: Optional[np.ndarray] = None) -> Tuple[np.ndarray, bool]:
+        """Take a full-resolution still and warp the card out of it.
+
+        Args:
+            corners: Card corners from an earlier lores frame, used if the still's lores frame has none
+
+        Returns:
+            tuple: (image, warped) - the upright card, or the whole still if no card was located
+        """
+        with tracing.span("camera.capture_pair"):
+            lores, main = self.capture.capture_pair()
+        with tracing.span("camera.detect"):
+            found = self.detector.find_corners(lores)
+        if found is not None:
+            corners = found
+
+        if corners is None:
+            # Nothing located; the scanner will search the whole still
+            image = main
+        else:
+            with tracing.span("camera.warp"):
+                image = warp_card(main, scale_quad(corners, self.capture.lores_size, self.capture.main_size),
+                                  rotate=self.rotate)
+        if self.save:
+            cv2.imwrite('captured.jpg', cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+        return image, corners is not None
+
+    def wait_for_card(self, stop: Optional[Callable[[], bool]] = None) -> Optional[Tuple[np.ndarray, bool]]:
+        """Block until a card has settled, then capture it. Returns None once `stop()` returns True."""
+        while stop is None or not stop():
+            lores = self.capture.read_lores_gray()
+            if lores is None:
+                # A replayed session has run out of frames
+                return None
+            with tracing.span("camera.track"):
+                corners = self.tracker.update(lores)
+            if self.trigger.update(corners):
+                return self.capture_card(corners)
+        return None
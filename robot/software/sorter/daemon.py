@@ -0,0 +1,381 @@
+"""Headless sorting daemon: camera, recognition, routing, arm and backend sync without the Kivy UI.
+
+Progress is written to stdout as one JSON object per line. While running, it
+is controlled through a Unix socket that accepts one command per line
+(pause, resume, stats, stop, trace-start, trace-stop) and answers with a
+JSON line, or with signals: SIGTERM/SIGINT stop, SIGUSR1 prints stats,
+SIGUSR2 toggles pause. trace-stop writes the per-card spans recorded since
+trace-start to the --trace file as Chrome trace JSON.
+
+Run from robot/software:
+    python -m sorter.daemon --arm /dev/ttyUSB0 --library 3
+    python -m sorter.daemon --simulate-arm --replay sessions/monday --replay-speed 0
+    echo stats | socat - UNIX-CONNECT:$HOME/.cardsorter/sorter.sock
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import tracing
+from arm import ArmController
+from scanner.service import ScannerService, shared_service
+from scryfall.localdb import DEFAULT_DB_PATH, load_prices
+from scryfall.prices import PriceIndex
+
+from .camera import CardCamera, open_capture, recognize_capture
+from .pipeline import CardJob, SortPipeline
+from .rules import RoutingTable, RuleSet, default_rules, load_rules
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = str(Path.home() / '.cardsorter' / 'sorter.sock')
+DEFAULT_TRACE = str(Path.home() / '.cardsorter' / 'sorter-trace.json')
+
+
+def emit(event: str, **fields):
+    """Write one structured progress record to stdout."""
+    record = {"ts": round(time.time(), 3), "event": event}
+    record.update(fields)
+    print(json.dumps(record, default=str), flush=True)
+
+
+class ControlServer:
+    """Accepts line commands on a Unix socket and answers each with a JSON line.
+
+    Args:
+        path: Socket path. A stale socket file from an earlier run is replaced.
+        handlers: Command name -> callable returning a JSON-serializable dict
+    """
+
+    def __init__(self, path: str, handlers: Dict[str, Callable[[], dict]]):
+        self.path = path
+        self.handlers = handlers
+        self._socket = None
+        self._thread = None
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self._socket.listen(4)
+        self._thread = threading.Thread(target=self._serve, name="sorter-control", daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return  # socket closed by stop()
+            with connection, connection.makefile('rw', encoding='utf-8') as stream:
+                for line in stream:
+                    command = line.strip().lower()
+                    if not command:
+                        continue
+                    handler = self.handlers.get(command)
+                    if handler is None:
+                        reply = {"error": f"unknown command {command!r}", "commands": sorted(self.handlers)}
+                    else:
+                        try:
+                            reply = handler()
+                        except Exception as e:
+                            reply = {"error": str(e)}
+                    stream.write(json.dumps(reply, default=str) + "\n")
+                    stream.flush()
+
+    def stop(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class SortDaemon:
+    """Runs the sort pipeline unattended until stopped.
+
+    Args:
+        camera: CardCamera the cards are captured from
+        scanner_service: ScannerService; may still be loading when run() starts
+        arm: Opened ArmController
+        rules: Sorting rules; compiled into a routing table once the card database
+            has loaded. Defaults to default_rules().
+        owned: Returns the copies of a card already in the library, for rules on owned count
+        prices: PriceIndex for rules on price; without one they use the prices in cards.json
+        outbox: Optional LibraryOutbox that recognized cards are added through
+        library_id: Library the outbox adds cards to
+        stats_interval: Seconds between periodic stats records, 0 to disable
+        events: Called as events(event, **fields) for each progress record.
+            Defaults to writing JSON lines to stdout.
+    """
+
+    def __init__(self, camera: CardCamera, scanner_service: ScannerService, arm: ArmController,
+                 rules: Optional[RuleSet] = None, owned: Optional[Callable[[dict], int]] = None,
+                 prices: Optional[PriceIndex] = None, outbox=None, library_id: Optional[int] = None,
+                 stats_interval: float = 60.0, events: Callable[..., None] = emit):
+        self.camera = camera
+        self.scanner_service = scanner_service
+        self.arm = arm
+        self.rules = rules or default_rules()
+        self.owned = owned
+        self.prices = prices
+        self.routing: Optional[RoutingTable] = None
+        self.outbox = outbox
+        self.library_id = library_id
+        self.stats_interval = stats_interval
+        self.events = events
+        self.pipeline: Optional[SortPipeline] = None
+        self._stop = threading.Event()
+        # Pause requests that arrive before the pipeline exists
+        self._paused = False
+
+    def run(self) -> int:
+        """Sort until stopped or a stage fails. Returns a process exit code."""
+        self.events("loading", stage="scanner")
+        scanner = self._wait_for_scanner()
+        if scanner is None:
+            self.events("stopped", **self.stats())
+            return 0
+        self.routing = self.rules.compile(scanner.cards_db.values(), self.owned, self.prices)
+        self.events("ready", cards=len(scanner.cards_db), routes=len(self.routing))
+
+        self.pipeline = SortPipeline(
+            capture=lambda: self.camera.wait_for_card(self._capture_stopped),
+            recognize=lambda captured: recognize_capture(scanner, captured),
+            route=self.routing.route,
+            move=self.arm.move_to_stack,
+            on_sorted=self.on_sorted,
+        )
+        if self._paused:
+            self.pipeline.pause()
+        self.pipeline.start()
+
+        next_stats = time.monotonic() + self.stats_interval
+        while not self._stop.is_set() and self.pipeline.running and self.pipeline.error is None:
+            self._stop.wait(0.5)
+            if self.stats_interval > 0 and time.monotonic() >= next_stats:
+                self.events("stats", **self.stats())
+                next_stats += self.stats_interval
+
+        self.pipeline.stop()
+        if self.pipeline.error is not None:
+            self.events("error", error=str(self.pipeline.error))
+            self.events("stopped", **self.stats())
+            return 1
+        self.events("stopped", **self.stats())
+        return 0
+
+    def _capture_stopped(self) -> bool:
+        """Whether capture should stop waiting for a card: the daemon is stopping or a stage failed."""
+        return self._stop.is_set() or self.pipeline.stopping
+
+    def _wait_for_scanner(self):
+        """Wait for the card database in short slices, so a stop request isn't held up by loading.
+
+        Returns:
+            The loaded CardScanner, or None if the daemon was stopped first
+        """
+        while not self._stop.is_set():
+            try:
+                return self.scanner_service.wait(0.5)
+            except TimeoutError:
+                pass
+        return None
+
+    def on_sorted(self, job: CardJob):
+        self.routing.record_sorted(job.card)
+        card = job.card or {}
+        self.events("sorted", index=job.index, card_id=card.get('id'), name=card.get('name'),
+             set=card.get('set'), collector_number=card.get('collector_number'),
+             confidence=job.confidence, stack=job.stack.name.lower(), latency=round(job.latency, 3),
+             stages={name: round(end - start, 3) for name, (start, end) in job.timings.items()})
+        if job.card and self.outbox is not None and self.library_id is not None:
+            self.outbox.add(self.library_id, job.card)
+
+    def pause(self) -> dict:
+        self._paused = True
+        if self.pipeline is not None:
+            self.pipeline.pause()
+        self.events("paused")
+        return {"paused": True}
+
+    def resume(self) -> dict:
+        self._paused = False
+        if self.pipeline is not None:
+            self.pipeline.resume()
+        self.events("resumed")
+        return {"paused": False}
+
+    def toggle_pause(self) -> dict:
+        if self._paused:
+            return self.resume()
+        return self.pause()
+
+    def stop(self) -> dict:
+        self._stop.set()
+        return {"stopping": True}
+
+    def stats(self) -> dict:
+        stats = self.pipeline.stats() if self.pipeline is not None else {"cards": 0}
+        stats["arm"] = self.arm.stats()
+        if self.outbox is not None:
+            stats["outbox"] = self.outbox.stats()
+        return stats
+
+
+def trace_start() -> dict:
+    tracing.start()
+    return {"tracing": True}
+
+
+def trace_stop(path: str) -> dict:
+    """Stop tracing and write what was recorded."""
+    tracing.stop()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return {"tracing": False, "trace": path, "events": tracing.save(path)}
+
+
+def open_backend():
+    """Connect to the backend with the token the app saved at login."""
+    from dotenv import load_dotenv
+    from magic_client import MagicClient
+    from token_manager import TokenManager
+
+    load_dotenv()
+    host = os.getenv('CARDSORTER_BACKEND_HOST', 'localhost')
+    port = int(os.getenv('CARDSORTER_BACKEND_PORT', '9090'))
+    client = MagicClient(host=host, port=port)
+    token = TokenManager().load_token()
+    if not token:
+        raise Exception("No saved login; log in once from the app before syncing a library")
+    client._auth_token = token
+    return client
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Headless card sorting daemon')
+    arm_group = parser.add_mutually_exclusive_group(required=True)
+    arm_group.add_argument('--arm', metavar='PORT', help='Serial port of the sorting arm')
+    arm_group.add_argument('--simulate-arm', action='store_true',
+                           help='Drive a simulated arm instead, for dry runs')
+    parser.add_argument('--library', type=int, help='Add recognized cards to this library')
+    parser.add_argument('--rules', metavar='PATH',
+                        help='JSON sorting rules file (see sorter.rules); defaults to routing by rarity')
+    parser.add_argument('--prices', metavar='PATH', default=os.getenv('CARDSORTER_CARD_DB', DEFAULT_DB_PATH),
+                        help='cardsync database to take prices from for rules on price')
+    parser.add_argument('--record', metavar='DIR', help='Record the camera session for replaying later')
+    parser.add_argument('--replay', metavar='DIR', help='Replay a recorded session instead of using the camera')
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help='Replay speed relative to the recording (0 for as fast as possible)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='Control socket path')
+    parser.add_argument('--stable-frames', type=int, default=8,
+                        help='Frames a card must be still before it is captured')
+    parser.add_argument('--stats-interval', type=float, default=60.0,
+                        help='Seconds between stats records (0 to disable)')
+    parser.add_argument('--trace', metavar='PATH', nargs='?', const=DEFAULT_TRACE,
+                        default=os.getenv('CARDSORTER_TRACE'),
+                        help='Trace every card from startup and write a Chrome trace here on exit. '
+                             'Tracing can also be switched on and off over the control socket.')
+    args = parser.parse_args(argv)
+    trace_path = args.trace or DEFAULT_TRACE
+    if args.trace:
+        tracing.start()
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    # Parse the card database and start OCR while the camera and arm start up
+    scanner_service = shared_service()
+
+    simulator = arm = capture = client = outbox = library_cache = control = None
+    try:
+        rules = load_rules(args.rules) if args.rules else default_rules()
+        port = args.arm
+        if args.simulate_arm:
+            from arm.simulator import FirmwareSimulator
+            simulator = FirmwareSimulator(move_time=2.0)
+            port = simulator.start()
+        emit("loading", stage="arm", port=port)
+        arm = ArmController(port)
+        arm.open()
+
+        emit("loading", stage="camera", replay=args.replay, record=args.record)
+        capture = open_capture(args.replay, speed=args.replay_speed, record=args.record)
+        camera = CardCamera(capture, stable_frames=args.stable_frames)
+
+        if args.library is not None:
+            emit("loading", stage="sync", library=args.library)
+            from magic_client.outbox import LibraryOutbox
+            client = open_backend()
+            outbox = LibraryOutbox(client)
+            outbox.start()
+
+        owned = None
+        if rules.uses_owned:
+            if args.library is None:
+                raise Exception("The rules use owned counts; pass --library to count against")
+            from magic_client.library_cache import LibraryCache
+            library_cache = LibraryCache(client, outbox=outbox)
+            try:
+                library_cache.sync(args.library)
+            except Exception as e:
+                logger.warning(f"Library sync failed, using the cached copy: {e}")
+            owned = lambda card: library_cache.owned_quantity(args.library, card['set'], card['collector_number'])
+
+        prices = None
+        if rules.uses_prices:
+            prices = load_prices(args.prices)
+            if prices is None:
+                logger.warning(f"No price table in {args.prices}; pricing cards from cards.json")
+
+        daemon = SortDaemon(camera, scanner_service, arm, rules=rules, owned=owned, prices=prices, outbox=outbox,
+                            library_id=args.library, stats_interval=args.stats_interval)
+
+        control = ControlServer(args.socket, {
+            "pause": daemon.pause,
+            "resume": daemon.resume,
+            "stats": daemon.stats,
+            "stop": daemon.stop,
+            "trace-start": trace_start,
+            "trace-stop": lambda: trace_stop(trace_path),
+        })
+        control.start()
+        signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+        signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+        signal.signal(signal.SIGUSR1, lambda *_: emit("stats", **daemon.stats()))
+        signal.signal(signal.SIGUSR2, lambda *_: daemon.toggle_pause())
+
+        return daemon.run()
+    except Exception as e:
+        emit("error", error=str(e))
+        return 1
+    finally:
+        if control is not None:
+            control.stop()
+        if tracing.enabled():
+            emit("trace", **trace_stop(trace_path))
+        if arm is not None:
+            arm.close()
+        if simulator is not None:
+            simulator.stop()
+        if capture is not None:
+            capture.close()
+        if outbox is not None:
+            outbox.close()
+        if library_cache is not None:
+            library_cache.close()
+        if client is not None:
+            client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the card stream on a stage queue
+_DONE = object()
+
+
+class CardJob:
+    """One card's trip through the sort pipeline."""
+
+    def __init__(self, index: int, capture: Any):
+        self.index = index
+        self.capture = capture
+        self.card: Optional[dict] = None
+        self.confidence = 0.0
+        self.stack = None
+        self.move_time = 0.0
+        # Stage name -> (start, end) in time.monotonic() seconds
+        self.timings: Dict[str, tuple] = {}
+
+    @property
+    def latency(self) -> float:
+        """Seconds from the start of capture to the end of the arm move."""
+        starts = [start for start, _ in self.timings.values()]
+        ends = [end for _, end in self.timings.values()]
+        return max(ends) - min(starts) if starts else 0.0
+
+
+class StageStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_time = 0.0
+
+    def summary(self, elapsed: float, queue_depth: int) -> dict:
+        return {
+            "items": self.items,
+            "busy_time": self.busy_time,
+            "utilization": self.busy_time / elapsed if elapsed > 0 else 0.0,
+            "queue_depth": queue_depth,
+        }
+
+
+class SortPipeline:
+    """Overlaps capture, recognition and arm motion for consecutive cards.
+
+    Each stage runs on its own thread and hands cards to the next through a
+    bounded queue, so while the arm places card N, card N+1 is already being
+    captured and recognized. When a downstream stage falls behind, the queues
+    fill and the upstream stages wait instead of piling up cards.
+
+    If any stage raises, the pipeline stops: every stage finishes the call it
+    is in, queued cards are abandoned, and `error` holds the exception. A
+    capture that returns None ends the run cleanly once queued cards are sorted.
+
+    Args:
+        capture: Blocks until the next card is ready and returns it (e.g. a warped
+            card image), or returns None when there are no more cards
+        recognize: Returns (card_info, confidence) for a capture
+        route: Returns the output stack for card_info (None if unrecognized)
+        move: Moves the current card to a stack. May return a Future (e.g.
+            ArmController.move_to_stack), which the arm stage waits on.
+        on_sorted: Called with each CardJob after its move completes
+        queue_size: Cards allowed to wait between two stages
+    """
+
+    STAGES = ("capture", "recognize", "move")
+
+    def __init__(self, capture: Callable[[], Any], recognize: Callable[[Any], tuple],
+                 route: Callable[[Optional[dict]], Any], move: Callable[[Any], Any],
+                 on_sorted: Optional[Callable[[CardJob], None]] = None, queue_size: int = 1):
+        self._capture = capture
+        self._recognize = recognize
+        self._route = route
+        self._move = move
+        self.on_sorted = on_sorted
+        self._recognize_queue = queue.Queue(maxsize=queue_size)
+        self._move_queue = queue.Queue(maxsize=queue_size)
+        self._stopping = threading.Event()
+        self._paused = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.stages = {name: StageStats(name) for name in self.STAGES}
+        self.cards_sorted = 0
+        self.error: Optional[BaseException] = None
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+        for name, target in (("capture", self._capture_loop),
+                             ("recognize", self._recognize_loop),
+                             ("move", self._move_loop)):
+            thread = threading.Thread(target=self._guard, args=(name, target), name=f"sort-{name}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _guard(self, name: str, target: Callable[[], None]):
+        try:
+            target()
+        except Exception as e:
+            logger.error(f"Sort {name} stage failed: {e}")
+            if self.error is None:
+                self.error = e
+            self._stopping.set()
+        finally:
+            if name == "move":
+                self.finished_at = time.monotonic()
+
+    def _timed(self, job: CardJob, name: str, fn: Callable, *args):
+        start = time.monotonic()
+        try:
+            # Spans opened inside the stage are tagged with the card's pipeline index
+            with tracing.card(job.index), tracing.span(f"pipeline.{name}"):
+                return fn(*args)
+        finally:
+            end = time.monotonic()
+            job.timings[name] = (start, end)
+            stats = self.stages[name]
+            stats.items += 1
+            stats.busy_time += end - start
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Hand an item downstream, waiting for space. Returns False if the pipeline is stopping."""
+        while not self._stopping.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        while not self._stopping.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _capture_loop(self):
+        index = 0
+        while not self._stopping.is_set():
+            if self._paused.is_set():
+                time.sleep(0.05)
+                continue
+            job = CardJob(index, None)
+            job.capture = self._timed(job, "capture", self._capture)
+            if job.capture is None:
+                self._put(self._recognize_queue, _DONE)
+                return
+            index += 1
+            if not self._put(self._recognize_queue, job):
+                return
+
+    def _recognize_loop(self):
+        while True:
+            job = self._get(self._recognize_queue)
+            if job is _DONE:
+                self._put(self._move_queue, _DONE)
+                return
+            job.card, job.confidence = self._timed(job, "recognize", self._recognize, job.capture)
+            with tracing.card(job.index), tracing.span("pipeline.route") as span:
+                job.stack = self._route(job.card)
+                span.set(card_id=(job.card or {}).get('id'), stack=getattr(job.stack, 'name', str(job.stack)))
+            if not self._put(self._move_queue, job):
+                return
+
+    def _move_loop(self):
+        while True:
+            job = self._get(self._move_queue)
+            if job is _DONE:
+                return
+            self._timed(job, "move", self._wait_move, job.stack)
+            job.move_time = job.timings["move"][1] - job.timings["move"][0]
+            self.cards_sorted += 1
+            if self.on_sorted is not None:
+                with tracing.card(job.index):
+                    self.on_sorted(job)
+
+    def _wait_move(self, stack):
+        result = self._move(stack)
+        # ArmController returns a Future; wait for the arm here, not in the vision stages
+        if hasattr(result, "result"):
+            result.result()
+
+    def pause(self):
+        """Stop capturing new cards; cards already in the pipeline are still sorted."""
+        self._paused.set()
+
+    def resume(self):
+        self._paused.clear()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused.is_set()
+
+    @property
+    def stopping(self) -> bool:
+        """Whether the run is ending, because of stop() or a failed stage."""
+        return self._stopping.is_set()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the run to end. Returns False if it is still running after `timeout`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        return not self.running
+
+    def stop(self, timeout: float = 5.0):
+        """Stop all stages after the calls they are in. Queued cards are abandoned."""
+        self._stopping.set()
+        self.wait(timeout)
+
+    def stats(self) -> dict:
+        """Throughput and per-stage utilization so far."""
+        end = self.finished_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at is not None else 0.0
+        depths = {"capture": 0, "recognize": self._recognize_queue.qsize(), "move": self._move_queue.qsize()}
+        return {
+            "cards": self.cards_sorted,
+            "elapsed": elapsed,
+            "cards_per_hour": 3600 * self.cards_sorted / elapsed if elapsed > 0 else 0.0,
+            "paused": self.paused,
+            "error": repr(self.error) if self.error is not None else None,
+            "stages": {name: stats.summary(elapsed, depths[name]) for name, stats in self.stages.items()},
+        }
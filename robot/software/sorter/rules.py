@@ -0,0 +1,256 @@
+import json
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from arm import Stack
+from scryfall.prices import PriceIndex, price_to_cents
+
+logger = logging.getLogger(__name__)
+
+# Condition keys a rule may use, besides "stack"
+CONDITIONS = ("rarity", "set", "type_line", "min_usd", "max_usd", "min_owned", "max_owned")
+
+
+def parse_stack(value) -> Stack:
+    """Accept a stack by name ("rares", "basic_lands") or by firmware number (1-4)."""
+    if isinstance(value, int):
+        return Stack(value)
+    try:
+        return Stack[str(value).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown stack {value!r}; expected one of "
+                         f"{', '.join(stack.name.lower() for stack in Stack)}")
+
+
+def card_usd_cents(card: dict) -> Optional[int]:
+    """Non-foil USD price of a card in cents, from its own Scryfall JSON."""
+    return price_to_cents((card.get('prices') or {}).get('usd'))
+
+
+def price_lookup(prices: Optional[PriceIndex] = None) -> Callable[[dict], Optional[int]]:
+    """Price cards from a PriceIndex, falling back to their JSON for cards it has no USD price for.
+
+    The index is refreshed by every cardsync --update, so it is usually newer
+    than the prices in the scanner's cards.json.
+    """
+    if prices is None:
+        return card_usd_cents
+
+    def usd_cents(card: dict) -> Optional[int]:
+        cents = prices.usd_cents(card.get('id'))
+        return cents if cents is not None else card_usd_cents(card)
+    return usd_cents
+
+
+def _lower_set(value) -> frozenset:
+    values = [value] if isinstance(value, str) else value
+    return frozenset(str(v).lower() for v in values)
+
+
+class Rule:
+    """One rule of a rules file: a stack and the conditions a card must meet to go there.
+
+    Every condition given must hold. List-valued conditions match if any entry
+    matches; type_line entries match as case-insensitive substrings. Prices
+    are non-foil USD in dollars, taken from the PriceIndex the rules are
+    compiled with or else the card's JSON, and a card with no USD price fails
+    both price bounds. Owned counts are copies already in the library.
+    """
+
+    def __init__(self, stack, rarity=None, set=None, type_line=None, min_usd=None, max_usd=None,
+                 min_owned=None, max_owned=None):
+        self.stack = parse_stack(stack)
+        self.rarity = _lower_set(rarity) if rarity is not None else None
+        self.sets = _lower_set(set) if set is not None else None
+        self.type_line = tuple(_lower_set(type_line)) if type_line is not None else None
+        self.min_cents = price_to_cents(min_usd)
+        self.max_cents = price_to_cents(max_usd)
+        if (min_usd is not None and self.min_cents is None) or (max_usd is not None and self.max_cents is None):
+            raise ValueError("price bounds must be numbers of dollars")
+        self.min_owned = min_owned
+        self.max_owned = max_owned
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Rule":
+        if "stack" not in data:
+            raise ValueError("rule has no stack")
+        unknown = set(data) - set(CONDITIONS) - {"stack"}
+        if unknown:
+            raise ValueError(f"unknown condition(s) {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @property
+    def uses_owned(self) -> bool:
+        return self.min_owned is not None or self.max_owned is not None
+
+    @property
+    def uses_prices(self) -> bool:
+        return self.min_cents is not None or self.max_cents is not None
+
+    def matches(self, card: dict, owned: Callable[[dict], int],
+                usd_cents: Callable[[dict], Optional[int]] = card_usd_cents) -> bool:
+        if self.rarity is not None and (card.get('rarity') or '').lower() not in self.rarity:
+            return False
+        if self.sets is not None and (card.get('set') or '').lower() not in self.sets:
+            return False
+        if self.type_line is not None:
+            type_line = (card.get('type_line') or '').lower()
+            if not any(part in type_line for part in self.type_line):
+                return False
+        if self.min_cents is not None or self.max_cents is not None:
+            cents = usd_cents(card)
+            if cents is None:
+                return False
+            if self.min_cents is not None and cents < self.min_cents:
+                return False
+            if self.max_cents is not None and cents > self.max_cents:
+                return False
+        if self.uses_owned:
+            count = owned(card)
+            if self.min_owned is not None and count < self.min_owned:
+                return False
+            if self.max_owned is not None and count > self.max_owned:
+                return False
+        return True
+
+
+class RuleSet:
+    """An ordered list of rules; the first rule a card matches picks its stack.
+
+    Rules files are JSON:
+
+        {
+          "default": "bulk",
+          "unidentified": "unidentified",
+          "rules": [
+            {"stack": "basic_lands", "type_line": "Basic Land"},
+            {"stack": "unidentified", "type_line": "Token"},
+            {"stack": "rares", "min_usd": 2.00},
+            {"stack": "rares", "rarity": ["rare", "mythic"], "max_owned": 3}
+          ]
+        }
+
+    Args:
+        rules: Rules in priority order
+        default: Stack for recognized cards no rule matches
+        unidentified: Stack for cards that were not recognized
+    """
+
+    def __init__(self, rules: List[Rule], default: Stack = Stack.BULK, unidentified: Stack = Stack.UNIDENTIFIED):
+        self.rules = rules
+        self.default = default
+        self.unidentified = unidentified
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RuleSet":
+        rules = []
+        for index, rule in enumerate(data.get("rules", [])):
+            try:
+                rules.append(Rule.from_dict(rule))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Rule {index + 1}: {e}") from None
+        return cls(rules,
+                   default=parse_stack(data.get("default", "bulk")),
+                   unidentified=parse_stack(data.get("unidentified", "unidentified")))
+
+    @property
+    def uses_owned(self) -> bool:
+        return any(rule.uses_owned for rule in self.rules)
+
+    @property
+    def uses_prices(self) -> bool:
+        return any(rule.uses_prices for rule in self.rules)
+
+    def evaluate(self, card: Optional[dict], owned: Callable[[dict], int] = None,
+                 usd_cents: Callable[[dict], Optional[int]] = card_usd_cents) -> Stack:
+        """Walk the rules for one card. Use a compiled RoutingTable on the hot path instead."""
+        if not card:
+            return self.unidentified
+        owned = owned or (lambda _: 0)
+        for rule in self.rules:
+            if rule.matches(card, owned, usd_cents):
+                return rule.stack
+        return self.default
+
+    def compile(self, cards: Iterable[dict], owned: Callable[[dict], int] = None,
+                prices: Optional[PriceIndex] = None) -> "RoutingTable":
+        """Evaluate every rule for every card up front.
+
+        Args:
+            cards: Card dicts the scanner can recognize, e.g. CardScanner.cards_db.values()
+            owned: Returns the copies of a card already owned; rules on owned count
+                see 0 if not given
+            prices: Current prices, e.g. from scryfall.localdb.load_prices. Rules
+                on price use the prices in the card dicts if not given.
+        """
+        table = RoutingTable(self, owned, prices)
+        for card in cards:
+            card_id = card.get('id')
+            if card_id:
+                table.table[card_id] = self.evaluate(card, table.owned, table.usd_cents)
+        logger.info(f"Compiled routing for {len(table.table)} cards from {len(self.rules)} rules")
+        return table
+
+
+class RoutingTable:
+    """Card ID -> Stack, precomputed from a RuleSet so routing a card is one dict lookup.
+
+    Cards missing from the table (e.g. added to the database after compiling)
+    are evaluated on first sight and cached. Since sorting a card changes how
+    many copies are owned, call `record_sorted` for each sorted card; when the
+    rules depend on owned counts, that card's entry is recomputed.
+    """
+
+    def __init__(self, rules: RuleSet, owned: Callable[[dict], int] = None, prices: Optional[PriceIndex] = None):
+        self.rules = rules
+        self._owned = owned or (lambda _: 0)
+        self.usd_cents = price_lookup(prices)
+        # Cards sorted since compiling, which `owned` does not know about yet
+        self._sorted: Dict[str, int] = {}
+        self.table: Dict[str, Stack] = {}
+
+    def owned(self, card: dict) -> int:
+        return self._owned(card) + self._sorted.get(card.get('id'), 0)
+
+    def route(self, card: Optional[dict]) -> Stack:
+        """Return the output stack for a recognized card, or the unidentified stack for None."""
+        if not card:
+            return self.rules.unidentified
+        stack = self.table.get(card.get('id'))
+        if stack is None:
+            stack = self.rules.evaluate(card, self.owned, self.usd_cents)
+            if card.get('id'):
+                self.table[card['id']] = stack
+        return stack
+
+    __call__ = route
+
+    def record_sorted(self, card: Optional[dict]):
+        """Count a card that has just been sorted into the collection."""
+        if not card or not card.get('id'):
+            return
+        self._sorted[card['id']] = self._sorted.get(card['id'], 0) + 1
+        if self.rules.uses_owned:
+            self.table[card['id']] = self.rules.evaluate(card, self.owned, self.usd_cents)
+
+    def __len__(self):
+        return len(self.table)
+
+
+def load_rules(path: str) -> RuleSet:
+    """Read a JSON rules file.
+
+    Raises:
+        ValueError: If a rule names an unknown stack or condition
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return RuleSet.from_dict(json.load(f))
+
+
+def default_rules() -> RuleSet:
+    """Rules that route like arm.default_stack, for when no rules file is given."""
+    return RuleSet([
+        Rule(Stack.BASIC_LANDS, type_line="Basic Land"),
+        Rule(Stack.UNIDENTIFIED, type_line="Token"),
+        Rule(Stack.RARES, rarity=["rare", "mythic"]),
+    ])
@@ -0,0 +1,178 @@
+"""Startup profiling and on-demand loading for the Kivy app.
+
+Set CARDSORTER_PROFILE_STARTUP=1 to time every module imported while the app
+starts, along with named initialization phases, and print a report once the
+first frame is on screen. CARDSORTER_STARTUP_BUDGET (seconds, default 3.0)
+sets the time to first frame that the report flags as over budget.
+
+The profiler times imports by wrapping builtins.__import__, so it only sees
+modules imported for the first time with an import statement; modules loaded
+through importlib directly are counted in their importer's time.
+"""
+import builtins
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 3.0
+
+
+class StartupProfiler:
+    """Records per-module import times and named initialization phases.
+
+    Args:
+        budget: Seconds to first frame the report flags as over budget
+    """
+
+    def __init__(self, budget: float = DEFAULT_BUDGET):
+        self.budget = budget
+        self.started_at = time.perf_counter()
+        # module -> (cumulative seconds, self seconds excluding nested imports)
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        # (name, start offset, seconds)
+        self.phases: List[Tuple[str, float, float]] = []
+        self.first_frame_at: Optional[float] = None
+        self._original_import = None
+        self._local = threading.local()
+
+    def install(self):
+        """Start timing imports."""
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level:
+            package = (globals or {}).get('__package__')
+            if not package:
+                return original(name, globals, locals, fromlist, level)
+            try:
+                module_name = importlib.util.resolve_name('.' * level + name, package)
+            except (ImportError, ValueError):
+                return original(name, globals, locals, fromlist, level)
+        else:
+            module_name = name
+        if module_name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        # Nested imports add their time to the importer's child total
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            if module_name not in self.imports:
+                self.imports[module_name] = (elapsed, elapsed - children)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time an initialization step, e.g. building the backend clients."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.started_at, time.perf_counter() - start))
+
+    def mark_first_frame(self):
+        if self.first_frame_at is None:
+            self.first_frame_at = time.perf_counter() - self.started_at
+
+    def report(self, top: int = 15) -> str:
+        lines = []
+        if self.first_frame_at is not None:
+            verdict = "over budget" if self.first_frame_at > self.budget else "within budget"
+            lines.append(f"First frame after {self.first_frame_at:.2f}s ({verdict} of {self.budget:.1f}s)")
+        lines.append("Slowest imports (self / cumulative seconds):")
+        by_self = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        for module, (cumulative, own) in by_self[:top]:
+            lines.append(f"  {own:7.3f} {cumulative:7.3f}  {module}")
+        if self.phases:
+            lines.append("Initialization phases (start, seconds):")
+            for name, start, seconds in self.phases:
+                lines.append(f"  {start:7.3f} {seconds:7.3f}  {name}")
+        return "\n".join(lines)
+
+
+class _NullProfiler:
+    """Stands in for StartupProfiler when profiling is off."""
+
+    @contextmanager
+    def phase(self, name: str):
+        yield
+
+    def mark_first_frame(self):
+        pass
+
+
+_profiler = _NullProfiler()
+
+
+def profile_from_env():
+    """Install the startup profiler if CARDSORTER_PROFILE_STARTUP is set. Call it before importing the app."""
+    global _profiler
+    if os.getenv('CARDSORTER_PROFILE_STARTUP') and isinstance(_profiler, _NullProfiler):
+        try:
+            budget = float(os.getenv('CARDSORTER_STARTUP_BUDGET', DEFAULT_BUDGET))
+        except ValueError:
+            budget = DEFAULT_BUDGET
+        _profiler = StartupProfiler(budget)
+        _profiler.install()
+    return _profiler
+
+
+def profiler():
+    """The active profiler, or a no-op stand-in."""
+    return _profiler
+
+
+def first_frame_shown():
+    """Record time to first frame and print the startup report, if profiling."""
+    if isinstance(_profiler, StartupProfiler) and _profiler.first_frame_at is None:
+        _profiler.mark_first_frame()
+        _profiler.uninstall()
+        print(_profiler.report())
+
+
+def lazy_class(module: str, name: str) -> Callable:
+    """A factory that imports `module` on first call and instantiates its class `name`."""
+    def create(*args, **kwargs):
+        return getattr(importlib.import_module(module), name)(*args, **kwargs)
+    return create
+
+
+def preload(modules: Iterable[str], on_done: Callable[[], None] = None) -> threading.Thread:
+    """Import modules on a background thread, so a later on-demand import finds them ready."""
+    def run():
+        for module in modules:
+            try:
+                with _profiler.phase(f"preload {module}"):
+                    importlib.import_module(module)
+            except Exception as e:
+                logger.error(f"Preloading {module} failed: {e}")
+        if on_done is not None:
+            on_done()
+
+    thread = threading.Thread(target=run, name="module-preload", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,10 @@
+import os
+import sys
+
+SOFTWARE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules import each other from robot/software, and the generated gRPC stubs
+# import their messages as top-level modules from magic_client
+for path in (SOFTWARE_DIR, os.path.join(SOFTWARE_DIR, 'magic_client')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,81 @@
+"""AsyncMagicClient against the in-process FakeBackend.
+
+Run from robot/software:
+    python -m pytest tests
+"""
+import asyncio
+import socket
+
+import grpc
+import pytest
+
+from magic_client.aio import AsyncMagicClient
+from magic_client.fake_backend import FakeBackend
+
+
+@pytest.fixture
+def backend():
+    backend = FakeBackend()
+    backend.port = backend.start()
+    yield backend
+    backend.stop()
+
+
+def run_with_client(port: int, calls):
+    """Run `calls(client)` on a fresh event loop, closing the client afterwards."""
+    async def session():
+        client = AsyncMagicClient(port=port)
+        try:
+            return await calls(client)
+        finally:
+            await client.close()
+    return asyncio.run(session())
+
+
+def test_login_and_create_card(backend):
+    async def calls(client):
+        token = await client.login(backend.email, backend.password)
+        library_id = await client.create_library("Binder")
+        await client.create_card(library_id, "Cloud, Ex-SOLDIER", "fin", "1", usd_price=250)
+        card = await client.create_card(library_id, "Cloud, Ex-SOLDIER", "fin", "1", usd_price=250)
+        return token, library_id, card, await client.get_library_cards(library_id)
+
+    token, library_id, card, cards = run_with_client(backend.port, calls)
+
+    assert token == backend.token
+    assert card.library_id == library_id
+    assert (card.set_id, card.collector_number, card.qty, card.usd_price) == ("fin", "1", 2, 250)
+    assert [c.id for c in cards] == [card.id]
+    assert backend.calls["CreateCard"] == 2
+
+
+def test_login_with_wrong_password_is_rejected(backend):
+    async def calls(client):
+        await client.login(backend.email, "wrong")
+
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        run_with_client(backend.port, calls)
+    assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+
+def test_calls_without_login_are_rejected(backend):
+    async def calls(client):
+        await client.create_library("Binder")
+
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        run_with_client(backend.port, calls)
+    assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+    assert backend.libraries == {}
+
+
+def test_warm_up_times_out_without_a_backend():
+    # A port that was just free has nothing listening on it
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        port = sock.getsockname()[1]
+
+    async def calls(client):
+        await client.warm_up(timeout=0.5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        run_with_client(port, calls)
@@ -0,0 +1,217 @@
+"""Per-card span tracing, exported as Chrome trace JSON (chrome://tracing, ui.perfetto.dev).
+
+Tracing is off by default and every entry point checks one module flag
+before doing anything else, so instrumented code costs a function call and
+a branch per span when it is off. Turn it on with `start()` (or by setting
+CARDSORTER_TRACE to an output path before the process starts) and write
+what was recorded with `save()`.
+
+Spans are tagged with the card they belong to. A stage that works on one
+card wraps its work in `card(card_id)`, and every span opened on that thread
+inside it is tagged with the ID. Work handed to another thread carries the
+ID along by reading `current_card()` when it is queued.
+
+Timestamps come from the system-wide monotonic clock and events carry the
+process ID, so traces written by several processes can be combined with
+`merge()` and line up on one timeline.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Iterable, Optional
+
+_enabled = False
+_events = deque(maxlen=1_000_000)
+_thread_names = {}
+_local = threading.local()
+
+
+def start(max_events: int = 1_000_000):
+    """Start recording, discarding anything recorded earlier."""
+    global _enabled, _events
+    _events = deque(maxlen=max_events)
+    _thread_names.clear()
+    _enabled = True
+
+
+def stop():
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def current_card():
+    """The card ID this thread is working on, or None."""
+    return getattr(_local, 'card', None)
+
+
+def _now_us() -> float:
+    return time.monotonic_ns() / 1000.0
+
+
+def _record(name: str, start: float, end: Optional[float], card_id, args: dict):
+    thread = threading.current_thread()
+    _thread_names.setdefault(thread.ident, thread.name)
+    if card_id is None:
+        card_id = getattr(_local, 'card', None)
+    if card_id is not None:
+        args['card'] = card_id
+    event = {"name": name, "cat": name.split('.')[0], "ts": start,
+             "pid": os.getpid(), "tid": thread.ident, "args": args}
+    if end is None:
+        event.update(ph="i", s="t")
+    else:
+        event.update(ph="X", dur=end - start)
+    _events.append(event)
+
+
+class _Span:
+    __slots__ = ("name", "card", "args", "start")
+
+    def __init__(self, name: str, card_id, args: dict):
+        self.name = name
+        self.card = card_id
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        _record(self.name, self.start, _now_us(), self.card, self.args)
+        return False
+
+    def set(self, **args):
+        """Attach arguments learned inside the span, e.g. the recognized card."""
+        self.args.update(args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _CardScope:
+    __slots__ = ("card", "previous")
+
+    def __init__(self, card_id):
+        self.card = card_id
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = getattr(_local, 'card', None)
+        _local.card = self.card
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.card = self.previous
+        return False
+
+
+def card(card_id):
+    """Tag spans opened on this thread with `card_id` until the block exits."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _CardScope(card_id)
+
+
+def span(name: str, card_id=None, **args):
+    """Time a block as one span.
+
+    Args:
+        name: Span name; the part before the first '.' is its category
+        card_id: Card the span belongs to. Defaults to the thread's current card.
+        **args: Shown with the span in the trace viewer
+
+    Usage:
+        with tracing.span("scanner.ocr") as s:
+            text = ...
+            s.set(chars=len(text))
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, card_id, args)
+
+
+def traced(name: str):
+    """Decorator form of `span` for whole functions."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name, None, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def instant(name: str, card_id=None, **args):
+    """Record a point event, such as a dropped frame."""
+    if not _enabled:
+        return
+    _record(name, _now_us(), None, card_id, args)
+
+
+def events() -> list:
+    """Recorded events plus thread-name metadata, in Chrome trace format."""
+    pid = os.getpid()
+    metadata = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in list(_thread_names.items())]
+    return metadata + list(_events)
+
+
+def save(path: str) -> int:
+    """Write the recorded spans as Chrome trace JSON. Returns the number of events written."""
+    trace = events()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+    os.replace(tmp_path, path)
+    return len(trace)
+
+
+def merge(paths: Iterable[str], output: str):
+    """Combine traces written by several processes into one file."""
+    merged = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            merged.extend(json.load(f)["traceEvents"])
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({"traceEvents": merged, "displayTimeUnit": "ms"}, f)
+
+
+def start_from_env() -> Optional[str]:
+    """Start tracing if CARDSORTER_TRACE names an output file. Returns that path."""
+    path = os.getenv('CARDSORTER_TRACE')
+    if path:
+        start()
+    return path or None
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 3:
+        print("Usage: python tracing.py OUTPUT TRACE [TRACE ...]")
+        sys.exit(1)
+    merge(sys.argv[2:], sys.argv[1])
@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Format name -> (file extension, cv2 quality flag, default quality)
+ARCHIVE_FORMATS = {
+    "png": (".png", cv2.IMWRITE_PNG_COMPRESSION, 3),
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY, 92),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY, 90),
+}
+
+
+def card_filename(card_info: Optional[Dict[str, Any]], captured_at: datetime) -> str:
+    """File name stem for an archived card: capture time plus the card name, if recognized."""
+    # Milliseconds keep two cards captured within the same second apart
+    timestamp = captured_at.strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    if card_info and 'name' in card_info:
+        # Clean up card name for filename (remove invalid characters)
+        card_name = str(card_info['name']).replace('/', '_').replace('\\', '_').replace(':', '_')
+        card_name = ''.join(c for c in card_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        return f"{timestamp}_{card_name}"
+    return f"{timestamp}_unknown_card"
+
+
+class CardArchiver:
+    """Encodes and writes cropped card images on a background thread.
+
+    `submit` never blocks the caller for longer than `block_timeout`: images
+    wait in a bounded queue, and when the disk falls behind and the queue is
+    full the new image is dropped and counted instead. A UI thread should keep
+    the default of 0; a headless loop that would rather slow down than lose
+    images can pass a longer timeout to get back-pressure instead.
+
+    Args:
+        directory: Where images are written. Created if missing.
+        image_format: "png", "jpeg" or "webp"
+        quality: PNG compression level 0-9, or JPEG/WebP quality 0-100 (WebP above 100
+            is lossless). Defaults to a fast, reasonable setting for the format.
+        sidecar: Write a JSON file next to each image with the recognition result
+        max_queue: Images allowed to wait for the writer
+        block_timeout: Seconds `submit` may wait for space in a full queue
+    """
+
+    def __init__(self, directory: str, image_format: str = "png", quality: Optional[int] = None,
+                 sidecar: bool = True, max_queue: int = 16, block_timeout: float = 0.0):
+        if image_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format {image_format!r}, expected one of {sorted(ARCHIVE_FORMATS)}")
+        self.directory = directory
+        self.extension, flag, default_quality = ARCHIVE_FORMATS[image_format]
+        self.params = [flag, default_quality if quality is None else quality]
+        self.sidecar = sidecar
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_write_time = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="card-archiver", daemon=True)
+            self._thread.start()
+
+    def submit(self, image: np.ndarray, card_info: Optional[Dict[str, Any]] = None,
+               confidence: Optional[float] = None, metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Queue an RGB card image to be written.
+
+        The image is written as-is later, so it must not be modified after submitting.
+
+        Args:
+            image: RGB numpy array of the cropped card
+            card_info: Recognition result, used for the file name and sidecar
+            confidence: Recognition confidence, for the sidecar
+            metadata: Extra JSON-serializable fields for the sidecar
+
+        Returns:
+            str: Path the image will be written to, or None if it was dropped
+        """
+        captured_at = datetime.now()
+        path = os.path.join(self.directory, card_filename(card_info, captured_at) + self.extension)
+        item = (path, image, card_info, confidence, metadata, captured_at)
+        try:
+            if self.block_timeout > 0:
+                self._queue.put(item, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Archive queue full, dropped {path}")
+            return None
+        return path
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                start = time.perf_counter()
+                self._write(*item)
+                self.last_write_time = time.perf_counter() - start
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error archiving card image: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path, image, card_info, confidence, metadata, captured_at):
+        ok, encoded = cv2.imencode(self.extension, cv2.cvtColor(image, cv2.COLOR_RGB2BGR), self.params)
+        if not ok:
+            raise Exception(f"Could not encode {path}")
+        self._write_atomic(path, encoded.tobytes())
+
+        if self.sidecar:
+            record = {
+                "image": os.path.basename(path),
+                "captured_at": captured_at.isoformat(),
+                "confidence": confidence,
+                "card": {key: card_info.get(key) for key in ("id", "name", "set", "collector_number")}
+                if card_info else None,
+            }
+            if metadata:
+                record.update(metadata)
+            stem = os.path.splitext(path)[0]
+            self._write_atomic(stem + ".json", json.dumps(record, indent=2).encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        # Readers never see a half-written file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def stop(self, timeout: float = 5.0):
+        """Write everything already queued, then stop the writer thread."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"Archive writer still busy, abandoning {self.pending()} queued images")
+            return
+        self._thread.join(timeout)
+        self._thread = None
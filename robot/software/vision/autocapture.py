@@ -0,0 +1,68 @@
+from typing import Optional
+
+import numpy as np
+
+
+class StableCardTrigger:
+    """Decides when to recognize a card without a button press.
+
+    Fed the card's corners once per processed frame, it fires exactly once
+    after the corners have drifted less than `max_drift` pixels for
+    `stable_frames` consecutive frames, i.e. the card has been placed and the
+    hand has left. It re-arms only after no card has been seen for
+    `empty_frames` frames, so a card that stays in view is recognized once.
+    """
+
+    def __init__(self, stable_frames: int = 8, max_drift: float = 4.0, empty_frames: int = 5):
+        self.stable_frames = stable_frames
+        self.max_drift = max_drift
+        self.empty_frames = empty_frames
+        self.armed = True
+        self._previous = None
+        self._stable_count = 0
+        self._empty_count = 0
+
+    def update(self, corners: Optional[np.ndarray]) -> bool:
+        """Feed the corners detected in the newest frame.
+
+        Args:
+            corners: 4x2 array of ordered card corners, or None if no card was detected
+
+        Returns:
+            bool: True on the single frame where recognition should run
+        """
+        if corners is None:
+            self._previous = None
+            self._stable_count = 0
+            self._empty_count += 1
+            if not self.armed and self._empty_count >= self.empty_frames:
+                self.armed = True
+            return False
+
+        self._empty_count = 0
+        if not self.armed:
+            return False
+
+        if self._previous is not None and self.drift(self._previous, corners) <= self.max_drift:
+            self._stable_count += 1
+        else:
+            self._stable_count = 1
+        self._previous = corners
+
+        if self._stable_count >= self.stable_frames:
+            self.armed = False
+            self._stable_count = 0
+            return True
+        return False
+
+    @staticmethod
+    def drift(previous: np.ndarray, current: np.ndarray) -> float:
+        """Largest distance any corner moved between two frames, in pixels."""
+        return float(np.max(np.linalg.norm(current - previous, axis=1)))
+
+    def reset(self):
+        """Re-arm immediately, e.g. when auto-capture is switched on."""
+        self.armed = True
+        self._previous = None
+        self._stable_count = 0
+        self._empty_count = 0
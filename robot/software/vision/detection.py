@@ -0,0 +1,133 @@
+from typing import Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .geometry import card_corners, order_points
+
+
+class CardDetector:
+    """Finds cards in ndarray frames, reusing its working buffers from frame to frame.
+
+    Frames go through exactly one colour conversion (`gray`); everything after
+    that works on the grayscale buffer or warps straight out of the original
+    frame. Blur, threshold and downscale buffers are allocated once per frame
+    size and reused, so steady-state detection does not allocate full frames.
+
+    Thresholding and contour extraction run at the first of `scales` that keeps
+    the frame at least `min_detection_width` wide, coarsest first. Corners found
+    at a reduced scale are refined with sub-pixel accuracy on the full-resolution
+    grayscale frame, looking only at a small window around each one.
+
+    A detector is not thread-safe; give each thread its own. The grayscale frame
+    returned by `gray` is overwritten by the next call, so anything that keeps
+    frames across calls, like CornerTracker's reference, must copy what it keeps.
+
+    Args:
+        min_area: Smallest card area, as a fraction of the frame area
+        vertices: (min, max) corners the approximated card outline may have
+        aspect_range: (min, max) bounding box width/height, or None to accept any
+        scales: Downscale factors to search at, coarsest first
+        min_detection_width: Scales that would shrink the frame below this width are skipped
+    """
+
+    def __init__(self, min_area: float = 0.1, vertices: Tuple[int, int] = (4, 4),
+                 aspect_range: Optional[Tuple[float, float]] = None,
+                 scales: Sequence[float] = (0.25, 0.5), min_detection_width: int = 320):
+        self.min_area = min_area
+        self.vertices = vertices
+        self.aspect_range = aspect_range
+        self.scales = tuple(scales)
+        self.min_detection_width = min_detection_width
+        self._buffers = {}
+
+    def _buffer(self, name: str, shape) -> np.ndarray:
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape):
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[name] = buffer
+        return buffer
+
+    def gray(self, image: np.ndarray) -> np.ndarray:
+        """Convert an RGB frame to grayscale into a reused buffer. Grayscale frames pass through."""
+        if image.ndim == 2:
+            return image
+        gray = self._buffer("gray", image.shape[:2])
+        cv2.cvtColor(image, cv2.COLOR_RGB2GRAY, dst=gray)
+        return gray
+
+    def find_contour(self, gray: np.ndarray):
+        """Search a grayscale frame for the largest contour that could be a card.
+
+        Returns:
+            tuple: (contour, approx) if a card was found, (None, None) otherwise
+        """
+        blurred = self._buffer(f"blurred{gray.shape}", gray.shape)
+        cv2.GaussianBlur(gray, (5, 5), 0, dst=blurred)
+
+        thresh = self._buffer(f"thresh{gray.shape}", gray.shape)
+        cv2.adaptiveThreshold(
+            blurred, 255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY_INV,
+            11, 2,
+            dst=thresh
+        )
+
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        image_area = gray.shape[0] * gray.shape[1]
+        best, best_area = (None, None), 0.0
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if area < image_area * self.min_area or area <= best_area:
+                continue
+
+            epsilon = 0.02 * cv2.arcLength(contour, True)
+            approx = cv2.approxPolyDP(contour, epsilon, True)
+            if not self.vertices[0] <= len(approx) <= self.vertices[1]:
+                continue
+
+            if self.aspect_range is not None:
+                _, _, w, h = cv2.boundingRect(contour)
+                if not self.aspect_range[0] <= w / h <= self.aspect_range[1]:
+                    continue
+
+            best, best_area = (contour, approx), area
+        return best
+
+    def find_corners(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """Locate the card in a grayscale frame, coarse-to-fine.
+
+        Returns:
+            Ordered 4x2 float32 corners in full-resolution coordinates, or None
+        """
+        width = gray.shape[1]
+        scales = [scale for scale in self.scales if scale < 1 and width * scale >= self.min_detection_width]
+        if not scales:
+            contour, _ = self.find_contour(gray)
+            return card_corners(contour) if contour is not None else None
+
+        for scale in scales:
+            size = (int(round(gray.shape[1] * scale)), int(round(gray.shape[0] * scale)))
+            small = self._buffer(f"small{scale}", (size[1], size[0]))
+            cv2.resize(gray, size, dst=small, interpolation=cv2.INTER_AREA)
+            contour, _ = self.find_contour(small)
+            if contour is not None:
+                return self.refine_corners(gray, card_corners(contour) / scale, scale)
+        return None
+
+    @staticmethod
+    def refine_corners(gray: np.ndarray, corners: np.ndarray, scale: float) -> np.ndarray:
+        """Refine corners found on a frame downscaled by `scale` against the full-resolution frame."""
+        # The coarse corners can be off by about one downscaled pixel
+        half_window = max(5, int(round(2 / scale)) + 2)
+        criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.05)
+        corners = corners.reshape(-1, 1, 2).astype(np.float32)
+        refined = cv2.cornerSubPix(gray, corners, (half_window, half_window), (-1, -1), criteria)
+        return order_points(refined)
+
+
+def corners_to_contour(corners: np.ndarray) -> np.ndarray:
+    """Integer contour of four corners, for drawing and cv2 shape functions."""
+    return np.round(corners).reshape(-1, 1, 2).astype(np.int32)
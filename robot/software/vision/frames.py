@@ -0,0 +1,221 @@
+import logging
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Frame(NamedTuple):
+    """One captured camera frame, shared read-only by every consumer."""
+    index: int
+    timestamp: float
+    image: np.ndarray
+
+
+_ROTATIONS = {
+    1: cv2.ROTATE_90_COUNTERCLOCKWISE,
+    2: cv2.ROTATE_180,
+    3: cv2.ROTATE_90_CLOCKWISE,
+}
+
+
+def orient(image: np.ndarray, rotate: int = 0, flip: bool = False) -> np.ndarray:
+    """Rotate a frame by quarter turns counter-clockwise, then optionally mirror it horizontally.
+
+    Costs at most one full-frame copy: the rotation writes a new buffer and the
+    mirror is done in place on it. A strided numpy copy of np.rot90 is several
+    times slower than cv2.rotate on the Pi.
+    """
+    image = np.ascontiguousarray(image)
+    code = _ROTATIONS.get(rotate % 4)
+    if code is None:
+        return cv2.flip(image, 1) if flip else image
+    image = cv2.rotate(image, code)
+    if flip:
+        cv2.flip(image, 1, dst=image)
+    return image
+
+
+class FrameSource:
+    """Something that produces RGB frames as numpy arrays."""
+
+    def read(self) -> Optional[np.ndarray]:
+        """Return the next frame, blocking until it is available. None means the source is exhausted."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PicameraSource(FrameSource):
+    """Frames from a started Picamera2 instance."""
+
+    def __init__(self, picam, stream: str = "main"):
+        self.picam = picam
+        self.stream = stream
+
+    def read(self) -> Optional[np.ndarray]:
+        return self.picam.capture_array(self.stream)
+
+    def close(self):
+        self.picam.stop()
+
+
+class DualStreamCapture:
+    """Reads Picamera2's low-resolution stream for detection and its main stream for recognition.
+
+    The camera must be configured with both a main and a lores stream. Lores
+    frames in YUV420 are used without conversion: their first `height` rows
+    are the luma plane, which is already the grayscale image detection needs.
+    """
+
+    def __init__(self, picam, main_stream: str = "main", lores_stream: str = "lores"):
+        self.picam = picam
+        self.main_stream = main_stream
+        self.lores_stream = lores_stream
+        config = picam.camera_configuration()
+        self.main_size = tuple(config[main_stream]["size"])
+        self.lores_size = tuple(config[lores_stream]["size"])
+
+    def _gray(self, array: np.ndarray) -> np.ndarray:
+        if array.ndim == 3:
+            return cv2.cvtColor(array, cv2.COLOR_RGB2GRAY)
+        width, height = self.lores_size
+        return array[:height, :width]
+
+    def read_lores_gray(self) -> np.ndarray:
+        """Return the next low-resolution frame as grayscale."""
+        return self._gray(self.picam.capture_array(self.lores_stream))
+
+    def capture_pair(self):
+        """Capture both streams from the same sensor frame.
+
+        Returns:
+            tuple: (lores grayscale frame, full-resolution main frame)
+        """
+        request = self.picam.capture_request()
+        try:
+            lores = self._gray(request.make_array(self.lores_stream))
+            main = request.make_array(self.main_stream)
+        finally:
+            request.release()
+        return lores, main
+
+    def close(self):
+        self.picam.close()
+
+
+class FileReplaySource(FrameSource):
+    """Replays image files as frames, for running the pipeline without a camera.
+
+    Args:
+        paths: Image files to replay, in order
+        fps: Frames per second to pace playback at. 0 replays as fast as possible.
+        loop: Start over after the last file instead of ending
+    """
+
+    def __init__(self, paths: Sequence[str], fps: float = 30.0, loop: bool = True):
+        self.frames = []
+        for path in paths:
+            image = cv2.imread(path)
+            if image is None:
+                raise Exception(f"Could not load image {path}")
+            self.frames.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        self.fps = fps
+        self.loop = loop
+        self._position = 0
+        self._next_at = None
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._position >= len(self.frames):
+            if not self.loop or not self.frames:
+                return None
+            self._position = 0
+
+        if self.fps > 0:
+            now = time.monotonic()
+            if self._next_at is not None and now < self._next_at:
+                time.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at or now) + 1.0 / self.fps
+
+        frame = self.frames[self._position]
+        self._position += 1
+        return frame
+
+
+class FrameBus:
+    """Captures each camera frame once and fans it out to every consumer.
+
+    Orientation is applied once per frame, and the resulting buffer is marked
+    read-only and shared, so preview, detection and recognition all see the
+    same pixels without copying. Consumers either subscribe to be called with
+    every frame on the capture thread (keep those callbacks cheap, e.g. a
+    LatestFrameWorker.submit), or poll `latest()`.
+
+    With a source, `start` runs a capture thread. Without one, frames are
+    pushed in with `publish`, e.g. from a Kivy camera texture.
+    """
+
+    def __init__(self, source: Optional[FrameSource] = None, rotate: int = 0, flip: bool = False):
+        self.source = source
+        self.rotate = rotate
+        self.flip = flip
+        self._subscribers: List[Callable[[Frame], None]] = []
+        self._latest: Optional[Frame] = None
+        self._index = 0
+        self._running = False
+        self._thread = None
+
+    def subscribe(self, callback: Callable[[Frame], None]):
+        self._subscribers.append(callback)
+
+    def publish(self, image: np.ndarray) -> Frame:
+        """Orient a raw frame, make it the latest frame, and hand it to every subscriber."""
+        image = orient(image, self.rotate, self.flip)
+        image.flags.writeable = False
+        self._index += 1
+        frame = Frame(self._index, time.monotonic(), image)
+        self._latest = frame
+        for callback in self._subscribers:
+            try:
+                callback(frame)
+            except Exception as e:
+                logger.error(f"Frame subscriber failed: {e}")
+        return frame
+
+    def latest(self) -> Optional[Frame]:
+        """Return the most recent frame, or None before the first capture."""
+        return self._latest
+
+    def start(self):
+        if self.source is None or self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="frame-bus", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            try:
+                image = self.source.read()
+            except Exception as e:
+                logger.error(f"Frame capture failed: {e}")
+                time.sleep(0.1)
+                continue
+            if image is None:
+                break
+            self.publish(image)
+        self._running = False
+
+    def stop(self, timeout: float = 1.0, close: bool = True):
+        """Stop the capture thread. With `close`, close the source too; otherwise `start` can resume it."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if close and self.source is not None:
+            self.source.close()
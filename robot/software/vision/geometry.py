@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+
+
+def order_points(points: np.ndarray) -> np.ndarray:
+    """Order four points clockwise starting from top-left: top-left, top-right, bottom-right, bottom-left."""
+    points = points.reshape(4, 2)
+    rect = np.zeros((4, 2), dtype=np.float32)
+
+    # Top-left has the smallest sum, bottom-right the largest
+    s = points.sum(axis=1)
+    rect[0] = points[np.argmin(s)]
+    rect[2] = points[np.argmax(s)]
+
+    # Top-right has the smallest difference, bottom-left the largest
+    diff = np.diff(points, axis=1)
+    rect[1] = points[np.argmin(diff)]
+    rect[3] = points[np.argmax(diff)]
+
+    return rect
+
+
+def card_corners(contour: np.ndarray) -> np.ndarray:
+    """Return the four ordered corners of a card contour.
+
+    Uses the polygon approximation when it has exactly four corners, and the
+    corners of the bounding rectangle otherwise.
+    """
+    epsilon = 0.02 * cv2.arcLength(contour, True)
+    approx = cv2.approxPolyDP(contour, epsilon, True)
+    if len(approx) == 4:
+        return order_points(approx.astype(np.float32))
+    x, y, w, h = cv2.boundingRect(contour)
+    return np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.float32)
+
+
+def scale_quad(corners: np.ndarray, from_size, to_size) -> np.ndarray:
+    """Map corner points between two streams of the same scene at different resolutions.
+
+    Args:
+        corners: Nx2 array of points in the source stream
+        from_size: (width, height) of the source stream
+        to_size: (width, height) of the target stream
+
+    Returns:
+        Nx2 float32 array of points in the target stream
+    """
+    scale = np.array([to_size[0] / from_size[0], to_size[1] / from_size[1]], dtype=np.float32)
+    return corners.reshape(-1, 2).astype(np.float32) * scale
+
+
+def warp_card(image: np.ndarray, corners: np.ndarray, width: int = 640, rotate: int = 0,
+              out: np.ndarray = None) -> np.ndarray:
+    """Warp the card region of an image to an upright, top-down view.
+
+    Only the output pixels are computed, so warping a small card out of a
+    full-resolution still is much cheaper than rotating or converting the whole
+    still first.
+
+    Args:
+        image: Image containing the card
+        corners: Four corners of the card in `image` coordinates, in any order
+        width: Width of the warped card. Height follows from the 63x88mm card size.
+        rotate: Quarter turns counter-clockwise to apply, as in vision.frames.orient
+        out: Optional preallocated output buffer of the warped card's shape
+
+    Returns:
+        Warped card image
+    """
+    height = int(width * (88 / 63))
+    # Rotating the result is the same as starting the corner order at a different corner
+    src = np.roll(order_points(corners), -(rotate % 4), axis=0)
+    dst = np.array([
+        [0, 0],
+        [width - 1, 0],
+        [width - 1, height - 1],
+        [0, height - 1]
+    ], dtype=np.float32)
+    M = cv2.getPerspectiveTransform(src, dst)
+    return cv2.warpPerspective(image, M, (width, height), dst=out)
@@ -0,0 +1,41 @@
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Colours are RGB, matching the frames on the FrameBus
+BOUNDS_COLOR = (0, 255, 0)
+CONTOUR_COLOR = (255, 255, 0)
+CORNER_COLOR = (255, 0, 0)
+
+
+def draw_detection(image: np.ndarray, contour: Optional[np.ndarray], bounding_rect: Optional[tuple]) -> np.ndarray:
+    """Outline a detected card on an RGB frame.
+
+    The input frame is never modified, since it may be shared read-only. When
+    there is nothing to draw it is returned as-is, otherwise a single copy is
+    drawn on.
+
+    Args:
+        image: RGB frame
+        contour: Card contour, or None if no card was detected
+        bounding_rect: (x, y, w, h) bounding rectangle of the contour
+
+    Returns:
+        Frame with the card outlined
+    """
+    if contour is None:
+        return image
+
+    image = image.copy()
+    x, y, w, h = bounding_rect
+    cv2.rectangle(image, (x, y), (x + w, y + h), BOUNDS_COLOR, 3)
+    cv2.drawContours(image, [contour], -1, CONTOUR_COLOR, 2)
+
+    # If we can approximate to 4 corners, draw corner points
+    epsilon = 0.02 * cv2.arcLength(contour, True)
+    approx = cv2.approxPolyDP(contour, epsilon, True)
+    if len(approx) == 4:
+        for point in approx:
+            cv2.circle(image, tuple(int(v) for v in point[0]), 8, CORNER_COLOR, -1)
+    return image
@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SESSION_VERSION = 1
+METADATA_FILE = "session.json"
+LORES_FILE = "lores.u8"
+MAIN_FILE = "main.u8"
+
+
+class SessionRecorder:
+    """Records everything a DualStreamCapture returns, for replay with SessionReplay.
+
+    A session is a directory holding two raw frame stacks, one per stream, and
+    a JSON index. Lores grayscale frames go to lores.u8 in the order they were
+    read, and each full-resolution frame from `capture_pair` goes to main.u8.
+    The index holds each lores frame's timestamp and, for frames captured as a
+    pair, the slot of its main frame. Frames are written straight through as
+    raw bytes, so recording costs one buffered file write per frame and no
+    encoding. The index is written by `close`.
+
+    Wraps the capture it records, and can be used in its place; closing the
+    recorder also closes the capture.
+
+    Args:
+        capture: DualStreamCapture, or anything with the same interface
+        path: Session directory to create
+        clock: Source of frame timestamps in seconds. Synthetic sessions can
+            pass a frame counter to get a nominal frame rate.
+    """
+
+    def __init__(self, capture, path: str, clock: Callable[[], float] = time.monotonic):
+        self.capture = capture
+        self.path = path
+        self.clock = clock
+        self.main_size = capture.main_size
+        self.lores_size = capture.lores_size
+        os.makedirs(path, exist_ok=True)
+        self._lores = open(os.path.join(path, LORES_FILE), 'wb')
+        self._main = open(os.path.join(path, MAIN_FILE), 'wb')
+        # (seconds since the first frame, main frame slot or -1)
+        self.frames: List[Tuple[float, int]] = []
+        self.main_frames = 0
+        self.main_channels = None
+        self._started_at = None
+
+    def _record(self, lores: np.ndarray, main: Optional[np.ndarray] = None):
+        now = self.clock()
+        if self._started_at is None:
+            self._started_at = now
+        self._lores.write(np.ascontiguousarray(lores).data)
+        slot = -1
+        if main is not None:
+            self._main.write(np.ascontiguousarray(main).data)
+            self.main_channels = main.shape[2] if main.ndim == 3 else 1
+            slot = self.main_frames
+            self.main_frames += 1
+        self.frames.append((round(now - self._started_at, 6), slot))
+
+    def read_lores_gray(self) -> Optional[np.ndarray]:
+        lores = self.capture.read_lores_gray()
+        if lores is not None:
+            self._record(lores)
+        return lores
+
+    def capture_pair(self):
+        lores, main = self.capture.capture_pair()
+        self._record(lores, main)
+        return lores, main
+
+    def close(self):
+        """Finish the session files and write the index."""
+        if self._lores.closed:
+            return
+        if hasattr(self.capture, "close"):
+            self.capture.close()
+        self._lores.close()
+        self._main.close()
+        metadata = {
+            "version": SESSION_VERSION,
+            "lores_size": list(self.lores_size),
+            "main_size": list(self.main_size),
+            "main_channels": self.main_channels or 3,
+            "frames": self.frames,
+        }
+        with open(os.path.join(self.path, METADATA_FILE), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        logger.info(f"Recorded {len(self.frames)} frames ({self.main_frames} full resolution) to {self.path}")
+
+
+class SessionReplay:
+    """Plays a recorded session back in place of a DualStreamCapture.
+
+    Both frame stacks are memory-mapped, so opening a session is instant and
+    frames are paged in from disk only as they are replayed.
+
+    Each call to `read_lores_gray` or `capture_pair` consumes the next recorded
+    frame, whichever call recorded it. If the code under test asks for a full-
+    resolution frame where none was recorded, the nearest later full-resolution
+    frame is used (the card has settled by then), falling back to the last one.
+
+    Args:
+        path: Session directory written by SessionRecorder
+        speed: Playback speed relative to the recording. 1.0 replays in real
+            time, 0 replays as fast as frames are requested.
+        loop: Start over after the last frame instead of ending
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False):
+        with open(os.path.join(path, METADATA_FILE), 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        if metadata.get("version") != SESSION_VERSION:
+            raise Exception(f"Unsupported session version {metadata.get('version')} in {path}")
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.lores_size = tuple(metadata["lores_size"])
+        self.main_size = tuple(metadata["main_size"])
+        frames = metadata["frames"]
+        self.timestamps = np.array([t for t, _ in frames], dtype=np.float64)
+
+        lores_width, lores_height = self.lores_size
+        self.lores = np.memmap(os.path.join(path, LORES_FILE), dtype=np.uint8, mode='r',
+                               shape=(len(frames), lores_height, lores_width))
+        main_count = sum(1 for _, slot in frames if slot >= 0)
+        main_width, main_height = self.main_size
+        channels = metadata.get("main_channels", 3)
+        main_shape = (main_count, main_height, main_width) + ((channels,) if channels > 1 else ())
+        self.main = np.memmap(os.path.join(path, MAIN_FILE), dtype=np.uint8, mode='r',
+                              shape=main_shape) if main_count else None
+
+        # Main frame slot to hand out for a capture_pair on each frame
+        self._main_slot = np.full(len(frames), -1, dtype=np.int64)
+        following = -1
+        for index in range(len(frames) - 1, -1, -1):
+            if frames[index][1] >= 0:
+                following = frames[index][1]
+            self._main_slot[index] = following
+        last = main_count - 1
+        self._main_slot[self._main_slot < 0] = last
+
+        self.position = 0
+        self._started_at = None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def _next(self) -> Optional[int]:
+        if self.position >= len(self.timestamps):
+            if not self.loop or not len(self.timestamps):
+                return None
+            self.position = 0
+            self._started_at = None
+        index = self.position
+        self.position += 1
+
+        if self.speed > 0:
+            now = time.monotonic()
+            if self._started_at is None:
+                self._started_at = now - self.timestamps[index] / self.speed
+            due = self._started_at + self.timestamps[index] / self.speed
+            if due > now:
+                time.sleep(due - now)
+        return index
+
+    def read_lores_gray(self) -> Optional[np.ndarray]:
+        """Return the next recorded lores frame, or None once the session has ended."""
+        index = self._next()
+        return None if index is None else self.lores[index]
+
+    def capture_pair(self):
+        """Return the next recorded lores frame with its full-resolution frame.
+
+        At the end of the session the last frame is returned again.
+        """
+        index = self._next()
+        if index is None:
+            index = len(self.timestamps) - 1
+        if self.main is None:
+            raise Exception(f"Session {self.path} has no full-resolution frames")
+        return self.lores[index], np.asarray(self.main[self._main_slot[index]])
+
+    def rewind(self):
+        self.position = 0
+        self._started_at = None
+
+    def close(self):
+        pass
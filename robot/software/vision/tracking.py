@@ -0,0 +1,160 @@
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+
+class CornerTracker:
+    """Follows the four card corners from frame to frame instead of searching every frame.
+
+    The tracker is seeded by one full detection. On later frames the corners are
+    followed with pyramidal Lucas-Kanade optical flow, which only looks at a
+    small window around each corner. A track is rejected, and a full detection
+    run instead, when any corner is lost, fails the forward-backward check, or
+    the quad stops looking like the card it was seeded from. A full detection
+    is also forced every `redetect_interval` tracked frames so the track cannot
+    drift or outlive a card that was swapped under it. Frames whose corner
+    patches match the reference are not tracked at all, so a card lying still
+    costs a patch comparison per frame.
+
+    Args:
+        detect: Full search, called with a grayscale frame and returning ordered
+            4x2 corners or None
+        redetect_interval: Tracked frames between forced full detections
+        max_error: Largest forward-backward disagreement, in pixels, for a corner
+        min_area_ratio: Smallest allowed ratio between the tracked quad's area and the seed's
+        still_threshold: Mean absolute difference, in gray levels, below which a
+            corner patch counts as unchanged and optical flow is skipped for the frame
+        win_size: Optical flow search window around each corner. Each corner is
+            tracked within a patch twice this size, so it also bounds how far a
+            corner can move between frames.
+        levels: Optical flow pyramid levels
+    """
+
+    def __init__(self, detect: Callable[[np.ndarray], Optional[np.ndarray]],
+                 redetect_interval: int = 30, max_error: float = 1.0,
+                 min_area_ratio: float = 0.8, still_threshold: float = 4.0,
+                 win_size=(15, 15), levels: int = 1):
+        self.detect = detect
+        self.redetect_interval = redetect_interval
+        self.max_error = max_error
+        self.min_area_ratio = min_area_ratio
+        self.still_threshold = still_threshold
+        # Room for the search window at the coarsest pyramid level plus the motion it can recover
+        self.patch_radius = win_size[0] * 2
+        self.lk_params = dict(
+            winSize=win_size,
+            maxLevel=levels,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+        )
+        self.frames_tracked = 0
+        self.frames_still = 0
+        self.full_detections = 0
+        self.reset()
+
+    def reset(self):
+        """Drop the current track; the next frame gets a full detection."""
+        self._reference = None
+        self._corners = None
+        self._windows = None
+        self._offsets = None
+        self._seed_area = 0.0
+        self._since_detect = 0
+
+    def update(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """Locate the card in the next grayscale frame.
+
+        Args:
+            gray: Grayscale frame. The tracker copies what it keeps, so the
+                buffer may be reused as soon as this returns.
+
+        Returns:
+            Ordered 4x2 float32 corners, or None if there is no card
+        """
+        if self._corners is not None and self._since_detect < self.redetect_interval:
+            patches = self._patches(gray)
+            if self._still(patches):
+                # Compare later frames against the same reference, so slow drift still gets tracked.
+                # Still frames don't count towards a redetection: nothing can drift while nothing moves.
+                self.frames_still += 1
+                return self._corners
+            corners = self._track(patches)
+            if corners is not None:
+                self._since_detect += 1
+                self._set_reference(gray, corners)
+                self.frames_tracked += 1
+                return corners
+
+        corners = self.detect(gray)
+        self.full_detections += 1
+        if corners is None:
+            self.reset()
+            return None
+        corners = corners.reshape(4, 2).astype(np.float32)
+        self._seed_area = cv2.contourArea(corners)
+        self._since_detect = 0
+        self._set_reference(gray, corners)
+        return corners
+
+    def _set_reference(self, gray: np.ndarray, corners: np.ndarray):
+        """Track from these corners, cutting their patches out of the frame as the new reference."""
+        height, width = gray.shape[:2]
+        radius = self.patch_radius
+        self._windows = []
+        offsets = []
+        for x, y in corners.tolist():
+            x0 = int(min(max(x - radius, 0), max(width - 2 * radius, 0)))
+            y0 = int(min(max(y - radius, 0), max(height - 2 * radius, 0)))
+            self._windows.append((slice(y0, y0 + 2 * radius), slice(x0, x0 + 2 * radius)))
+            offsets.append((x0, y0))
+        self._corners = corners
+        # np.hstack copies, so the reference outlives the caller reusing its frame buffer
+        self._reference = self._patches(gray)
+        patch_width = self._reference.shape[1] // 4
+        # Frame coordinates minus these give coordinates in the side-by-side patches
+        self._offsets = np.array([(x0 - i * patch_width, y0) for i, (x0, y0) in enumerate(offsets)],
+                                 dtype=np.float32)
+
+    def _patches(self, gray: np.ndarray) -> np.ndarray:
+        """The four corner patches side by side, so each optical flow pass is one call."""
+        return np.hstack([gray[window] for window in self._windows])
+
+    def _still(self, patches: np.ndarray) -> bool:
+        """True if no corner patch has changed since the reference frame, beyond sensor noise."""
+        height, width = patches.shape[0], patches.shape[1] // 4
+        limit = self.still_threshold * height * width
+        for i in range(0, 4 * width, width):
+            if cv2.norm(self._reference[:, i:i + width], patches[:, i:i + width], cv2.NORM_L1) > limit:
+                return False
+        return True
+
+    def _track(self, patches: np.ndarray) -> Optional[np.ndarray]:
+        """Follow each corner within a small patch around it, checking it by tracking back.
+
+        calcOpticalFlowPyrLK builds image pyramids for everything it is given,
+        so handing it full frames costs nearly as much as a full detection.
+        Lining the patches up in one image lets all four corners share one call
+        each way instead of eight calls.
+        """
+        start = (self._corners - self._offsets).reshape(4, 1, 2)
+        points, status, _ = cv2.calcOpticalFlowPyrLK(self._reference, patches, start, None, **self.lk_params)
+        if points is None or not status.all():
+            return None
+
+        # Track back to the previous frame; corners that don't land where they started are unreliable
+        back, status, _ = cv2.calcOpticalFlowPyrLK(patches, self._reference, points, None, **self.lk_params)
+        if back is None or not status.all() or np.linalg.norm(back - start, axis=2).max() > self.max_error:
+            return None
+
+        # A corner that wandered into a neighbouring patch has been lost
+        width = patches.shape[1] // 4
+        if not np.array_equal(points[:, 0, 0] // width, np.arange(4)):
+            return None
+        corners = points.reshape(4, 2) + self._offsets
+
+        if not cv2.isContourConvex(corners):
+            return None
+        area = cv2.contourArea(corners)
+        if self._seed_area <= 0 or not self.min_area_ratio <= area / self._seed_area <= 1 / self.min_area_ratio:
+            return None
+        return corners
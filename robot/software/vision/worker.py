@@ -0,0 +1,73 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LatestFrameWorker:
+    """Runs an expensive per-frame function on a background thread.
+
+    Producers call `submit` at camera rate. Only the newest submitted frame is
+    kept: if the worker is still busy, the previous pending frame is dropped,
+    so results never lag further behind the camera than one processing pass.
+
+    Results are published by swapping a single attribute, which is atomic under
+    the GIL, so consumers on the UI thread read `latest()` without taking a lock.
+    """
+
+    def __init__(self, process: Callable[[Any], Any], name: str = "vision-worker"):
+        self._process = process
+        self._cond = threading.Condition()
+        self._pending = None
+        self._stopping = False
+        self._result = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_processed = 0
+        self.last_process_time = 0.0
+
+    def start(self):
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def submit(self, frame):
+        """Hand the newest frame to the worker, replacing any frame it hasn't started on."""
+        with self._cond:
+            if self._pending is not None:
+                self.frames_dropped += 1
+            self._pending = frame
+            self.frames_submitted += 1
+            self._cond.notify()
+
+    def latest(self) -> Optional[Any]:
+        """Return the most recent result, or None if no frame has been processed yet."""
+        return self._result
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                frame, self._pending = self._pending, None
+
+            start = time.perf_counter()
+            try:
+                result = self._process(frame)
+            except Exception as e:
+                logger.error(f"Error processing frame: {e}")
+                continue
+            self.last_process_time = time.perf_counter() - start
+            self.frames_processed += 1
+            self._result = result
+
+    def stop(self, timeout: float = 1.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread.is_alive():
+            self._thread.join(timeout)